@@ -0,0 +1,142 @@
+# this file is used to convert many workbooks in one run, when running with "--batch"
+import argparse
+import concurrent.futures
+import glob
+import logging
+import pathlib
+import sys
+import time
+
+from config import Config
+from logger import LOG_FORMATTER, add_log_handler, logger, remove_log_handler
+
+
+def find_workbooks(batch_path: str):
+    """
+    :param batch_path: directory of xlsx files, or glob pattern of xlsx files
+    :return: sorted list of the xlsx files paths (without excel lock files)
+    """
+    if pathlib.Path(batch_path).is_dir():
+        workbooks_paths = pathlib.Path(batch_path).glob('*.xlsx')
+    else:
+        workbooks_paths = (pathlib.Path(path) for path in glob.glob(batch_path, recursive=True))
+    return sorted(path for path in workbooks_paths if path.is_file() and not path.name.startswith('~$'))
+
+
+def create_output_dirs_names(workbooks_paths: list[pathlib.Path]):
+    """
+    :param workbooks_paths: the converted workbooks
+    :return: name of the output directory of each workbook, its name without the extension (with number if repeated)
+    """
+    output_dirs_names: list[str] = []
+    names_counts: dict = {}
+    for workbook_path in workbooks_paths:
+        names_counts[workbook_path.stem] = names_counts.get(workbook_path.stem, 0) + 1
+        repeat_count: int = names_counts[workbook_path.stem]
+        output_dirs_names.append(workbook_path.stem if repeat_count == 1 else f"{workbook_path.stem}_{repeat_count}")
+    return output_dirs_names
+
+
+def init_batch_worker(config_values: dict):
+    """
+    initialize a worker process once, for all the workbooks it converts
+    :param config_values: configuration values exported by "Config.export_config"
+    """
+    from main import create_sql_type_config
+
+    Config.import_config(config_values)
+    # the DBMS instance (and its reserved keywords) is created once for each process
+    Config.sql_type_config = create_sql_type_config(Config.dbms_type_str)
+
+
+def convert_workbook_job(workbook_path: pathlib.Path, output_dir_path: pathlib.Path):
+    """
+    convert one workbook into its own output directory, errors of the workbook don't stop the other workbooks
+    :param workbook_path: the xlsx file to convert
+    :param output_dir_path: directory of the workbook output files, and its log file
+    :return: dictionary of the workbook, its status, time, size of the output files and error (if failed)
+    """
+    from dependency_graph import reported_cycles
+    from diagnostics import diagnostics
+    from main import convert
+
+    start_time: float = time.perf_counter()
+    result: dict = {'workbook': str(workbook_path), 'output_dir': str(output_dir_path), 'status': 'ok',
+                    'seconds': 0.0, 'bytes_written': 0, 'error': None}
+    Config.set_input_file(workbook_path, output_dir_path)
+    Config.tables_keys = {}
+    reported_cycles.clear()
+    diagnostics.reset()
+    # the messages of the workbook are also written into its own log file
+    file_handler = logging.FileHandler(str(pathlib.Path(output_dir_path, 'xlsx.log')), mode='w')
+    file_handler.setFormatter(LOG_FORMATTER)
+    add_log_handler(file_handler)
+    try:
+        convert(argparse.Namespace(workers=1, execute=False, shards=0))
+        # the queries files may be split or compressed, all the files written next to them are counted
+        result['bytes_written'] = sum(output_file_path.stat().st_size for output_file_path in output_dir_path.glob('*')
+                                      if output_file_path.is_file() and output_file_path.name != 'xlsx.log')
+    # fatal errors are logged and then "exit()" (or "sys.exit(1)") is called
+    except (Exception, SystemExit) as error:
+        logger.error(f"Converting {workbook_path} failed: {error!r}")
+        result['status'] = 'failed'
+        result['error'] = repr(error)
+    finally:
+        # the problems of the workbook are reported in its own output directory
+        diagnostics.write_summary()
+        remove_log_handler(file_handler)
+        file_handler.close()
+    result['seconds'] = round(time.perf_counter() - start_time, 3)
+    return result
+
+
+def log_summary(results: list[dict]):
+    """
+    log a table of the results of all the workbooks
+    :param results: the results returned by "convert_workbook_job"
+    """
+    name_width: int = max([len('workbook')] + [len(result['workbook']) for result in results])
+    lines: list[str] = [f"{'workbook'.ljust(name_width)}  {'status'.ljust(6)}  {'seconds'.rjust(9)}  {'bytes'.rjust(12)}"]
+    for result in results:
+        lines.append(f"{result['workbook'].ljust(name_width)}  {result['status'].ljust(6)}  "
+                     f"{result['seconds']:9.3f}  {result['bytes_written']:12d}")
+    failed_count: int = sum(result['status'] != 'ok' for result in results)
+    lines.append(f"{len(results)} workbooks converted, {failed_count} failed, "
+                 f"{sum(result['seconds'] for result in results):.3f} seconds in total")
+    logger.info("batch summary:\n" + '\n'.join(lines))
+
+
+def convert_batch(batch_path: str, workers: int):
+    """
+    convert all the workbooks in the batch path, each one into its own directory in the output directory
+    (with the same configuration, except for "xlsx_location")
+    :param batch_path: directory of xlsx files, or glob pattern of xlsx files
+    :param workers: number of processes converting the workbooks, 1 converts them in this process
+    :return: list of the results of the workbooks (see "convert_workbook_job"), the run exits with code 1 (in "main")
+             if any of them failed
+    """
+    import json
+
+    workbooks_paths: list[pathlib.Path] = find_workbooks(batch_path)
+    if not workbooks_paths:
+        logger.error(f"No xlsx files were found in {batch_path}")
+        sys.exit(1)
+    input_file_path = Config.input_file_relative_path
+    batch_output_dir_path = Config.output_dir_path
+    output_dirs_paths: list[pathlib.Path] = [pathlib.Path(batch_output_dir_path, output_dir_name)
+                                             for output_dir_name in create_output_dirs_names(workbooks_paths)]
+
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_batch_worker,
+                                                    initargs=(Config.export_config(),)) as executor:
+            results: list[dict] = list(executor.map(convert_workbook_job, workbooks_paths, output_dirs_paths))
+    else:
+        results: list[dict] = [convert_workbook_job(workbook_path, output_dir_path)
+                               for workbook_path, output_dir_path in zip(workbooks_paths, output_dirs_paths)]
+        # the jobs changed the paths in the configuration of this process
+        Config.set_input_file(input_file_path, batch_output_dir_path)
+
+    log_summary(results)
+    with open(pathlib.Path(batch_output_dir_path, 'batch_summary.json'), 'w', encoding='utf-8') as summary_file:
+        json.dump(results, summary_file, indent=4)
+    return results
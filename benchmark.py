@@ -0,0 +1,290 @@
+# this file is used to measure the performance of the script, run "benchmark.py -h" for the options
+import argparse
+import json
+import os
+import pathlib
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# the directory of the script's modules
+SCRIPT_DIR: pathlib.Path = pathlib.Path(__file__).resolve().parent
+# modules which are slow to import, and should be imported only when needed
+HEAVY_MODULES: tuple = ('pandas', 'numpy', 'openpyxl', 'tkinter')
+
+
+def measure_startup(module_name: str = 'main', repeat: int = 5):
+    """
+    measure the import time of a module with "python -X importtime", in a new interpreter each time
+    :param module_name: the module to import
+    :param repeat: number of measurements, the fastest one is used
+    :return: dictionary with the import time in microseconds, and which heavy modules were imported by it
+    """
+    import_times_us: list[int] = []
+    imported_heavy_modules: set[str] = set()
+    # importing "main" creates the "generated" directory, so it runs in temporary directory
+    with tempfile.TemporaryDirectory() as work_dir:
+        for _ in range(repeat):
+            process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+                                     cwd=work_dir, env={**os.environ, 'PYTHONPATH': str(SCRIPT_DIR)}, capture_output=True,
+                                     text=True, check=True)
+            # each line is "import time: self [us] | cumulative | imported package"
+            for line in process.stderr.splitlines():
+                if not line.startswith('import time:') or line.endswith('imported package'):
+                    continue
+                _, cumulative_us, imported_module = line.split('|')
+                if imported_module.strip() in HEAVY_MODULES:
+                    imported_heavy_modules.add(imported_module.strip())
+                # top level modules are not indented
+                if imported_module == f' {module_name}':
+                    import_times_us.append(int(cumulative_us))
+
+    return {'module': module_name, 'import_time_us': min(import_times_us),
+            'heavy_modules_imported': sorted(imported_heavy_modules)}
+
+
+def generate_workbook(xlsx_path, sheets: int, tables_per_sheet: int, columns_per_table: int, dml_rows: int,
+                      fk_density: float, seed: int = 0):
+    """
+    generate synthetic workbook in the format of "test.xlsx": "sheets" DDL sheets with "tables_per_sheet" tables each,
+    and "sheets" DML sheets with the data ("dml_rows" rows) of the same tables
+    :param xlsx_path: path of the created xlsx file
+    :param sheets: number of DDL sheets (and DML sheets)
+    :param tables_per_sheet: number of tables in each sheet
+    :param columns_per_table: number of columns in each table, including the "ID" column
+    :param dml_rows: number of rows inserted into each table
+    :param fk_density: probability (0-1) of each non "ID" column to be a foreign key to a previous table
+    :param seed: seed of the random values, so the same workbook is generated each time
+    """
+    import openpyxl
+
+    randomizer = random.Random(seed)
+    workbook = openpyxl.Workbook(write_only=True)
+    tables: list[tuple] = []
+    for sheet_i in range(sheets):
+        worksheet = workbook.create_sheet(f"ddl_bench_{sheet_i}")
+        for table_i in range(tables_per_sheet):
+            table_name: str = f"BENCH_{sheet_i}_{table_i}"
+            worksheet.append(['###_ddl', f"benchmark table {table_name}"])
+            worksheet.append([table_name])
+            worksheet.append(['COLUMN_NAME', 'DATA_TYPE', 'NULLABLE', 'FK', 'IDENTITY', 'cache', 'constraint', 'Default',
+                              'Index', 'comments'])
+            worksheet.append(['ID', 'NUMBER', 'No', None, 'default', None, 'Primary key'])
+            # each column is (name, is foreign key)
+            columns: list[tuple] = []
+            for column_i in range(1, columns_per_table):
+                column_name: str = f"COL_{column_i}"
+                if tables and randomizer.random() < fk_density:
+                    referenced_table: str = randomizer.choice(tables)[0]
+                    worksheet.append([column_name, 'NUMBER', None, f"{referenced_table}, ID", None, None, None, None,
+                                      'yes'])
+                    columns.append((column_name, True))
+                elif column_i % 2:
+                    worksheet.append([column_name, 'VARCHAR2(100)', None, None, None, None, None, None, None,
+                                      f"column {column_i}"])
+                    columns.append((column_name, False))
+                else:
+                    worksheet.append([column_name, 'NUMBER(10)', 'No', None, None, None, None, '0'])
+                    columns.append((column_name, False))
+            worksheet.append([])
+            tables.append((table_name, columns))
+
+    for sheet_i in range(sheets):
+        worksheet = workbook.create_sheet(f"dml_bench_{sheet_i}")
+        for table_name, columns in tables[sheet_i * tables_per_sheet:(sheet_i + 1) * tables_per_sheet]:
+            worksheet.append(['###_dml'])
+            worksheet.append([table_name])
+            worksheet.append(['ID'] + [column_name for column_name, _ in columns])
+            for row_i in range(1, dml_rows + 1):
+                row: list = [row_i]
+                for column_i, (_, is_foreign_key) in enumerate(columns, start=1):
+                    if is_foreign_key:
+                        row.append(randomizer.randint(1, dml_rows))
+                    elif column_i % 2:
+                        row.append(f"value {randomizer.randint(0, 10 ** 6)}")
+                    else:
+                        row.append(randomizer.randint(0, 10 ** 6))
+                worksheet.append(row)
+            worksheet.append([])
+
+    workbook.save(xlsx_path)
+
+
+def measure_stages(xlsx_path: pathlib.Path, work_dir: pathlib.Path):
+    """
+    run the conversion of the workbook stage by stage (like "main.py" without options), measuring each stage
+    :param xlsx_path: the workbook to convert
+    :param work_dir: directory in which the "generated" directory is created
+    :return: dictionary of stage name to its seconds, throughput and peak memory (peak of the process until its end)
+    """
+    # importing the modules creates the log file in "generated", in the current directory
+    os.chdir(work_dir)
+    from config import Config
+    from oracleSQL import OracleSQL
+    from profiler import peak_rss_mb
+    import xlsx2sql
+
+    config_path = pathlib.Path(work_dir, 'benchmark_config.yaml')
+    # the rows of large tables are deleted by their keys
+    config_path.write_text(f"dbms_type: oracleSQL\nxlsx_location: {xlsx_path}\nrowdependencies: True\n"
+                           f"key_based_delete: True\n")
+    Config.yaml_config_path = config_path
+    Config.init_config()
+    Config.sql_type_config = OracleSQL()
+
+    stages: dict = {}
+
+    def record_stage(stage_name: str, start_time: float, count: int, unit: str):
+        seconds: float = time.perf_counter() - start_time
+        stages[stage_name] = {'seconds': round(seconds, 4), unit: count,
+                              f"{unit}_per_second": round(count / seconds, 1) if seconds else None,
+                              'peak_rss_mb': peak_rss_mb()}
+
+    start_time: float = time.perf_counter()
+    sheets = xlsx2sql.xlsx_to_raw_data(xlsx_path)
+    record_stage('xlsx_to_raw_data', start_time, sum(sheet.sheet_raw.size for sheet in sheets), 'cells')
+
+    start_time = time.perf_counter()
+    tables: list = []
+    for sheet in sheets:
+        if sheet.sheet_name.startswith('ddl_'):
+            tables.extend(xlsx2sql.create_sheet_ddl_tables(sheet))
+    record_stage('ddl_parsing', start_time, sum(len(table.columns) for table in tables), 'columns')
+
+    start_time = time.perf_counter()
+    ddl_queries, ddl_drops_queries, fk_queries, fk_drop_queries = xlsx2sql.create_ddl_queries(tables)
+    record_stage('ddl_rendering', start_time, len(tables), 'tables')
+
+    # the keys of the tables are needed before the DML queries are created (as in "main.py")
+    start_time = time.perf_counter()
+    Config.tables_keys = xlsx2sql.read_tables_keys(sheets)
+    record_stage('tables_keys', start_time, len(Config.tables_keys), 'tables')
+
+    # the rows are counted from the DML tables, the number of delete queries depends on the keys
+    rows_count: int = sum(block.data_end_row - block.data_start_row
+                          for sheet in sheets if sheet.sheet_name.startswith('dml_')
+                          for block in xlsx2sql.index_sheet_blocks(sheet.sheet_raw, 'dml'))
+    start_time = time.perf_counter()
+    insert_queries: list[str] = []
+    delete_queries: list[str] = []
+    for sheet in sheets:
+        if sheet.sheet_name.startswith('dml_'):
+            sheet_insert_queries, sheet_delete_queries = xlsx2sql.split_dml_queries(xlsx2sql.iter_sheet_dml_queries(sheet))
+            insert_queries.extend(sheet_insert_queries)
+            delete_queries.extend(sheet_delete_queries)
+    record_stage('dml_generation', start_time, rows_count, 'rows')
+
+    start_time = time.perf_counter()
+    xlsx2sql.generate_queries_files(ddl_queries, ddl_drops_queries, fk_queries, fk_drop_queries, insert_queries,
+                                    delete_queries)
+    written_bytes: int = Config.output_queries_file.stat().st_size + Config.output_drops_file.stat().st_size
+    record_stage('generate_queries_files', start_time, written_bytes, 'bytes')
+
+    return stages
+
+
+def measure_ddl_scaling(columns_counts: tuple = (250, 1000, 4000, 16000), repeat: int = 5):
+    """
+    measure the rendering of "create table" of a single table with increasing number of columns (without xlsx), the
+    time per column should stay about the same (linear scaling)
+    :param columns_counts: number of columns of each measured table
+    :param repeat: number of measurements of each table, the fastest one is used
+    :return: dictionary with the time per column of each table, and the ratio between the largest and smallest tables
+    """
+    from definitions import Identity, Table, TableColumn
+    from oracleSQL import OracleSQL
+
+    measurements: list[dict] = []
+    for columns_count in columns_counts:
+        table: Table = Table()
+        table.name = f"WIDE_TABLE_{columns_count}"
+        for column_i in range(columns_count):
+            column: TableColumn = TableColumn()
+            # some of the names are longer than the minimal width, so the padding is computed
+            column.name = f"STAGING_COLUMN_{column_i}" + ('_WITH_A_VERY_LONG_DESCRIPTIVE_NAME' if column_i % 50 == 0 else '')
+            column.data_type = 'VARCHAR2(4000)' if column_i % 2 else 'NUMBER(10,2)'
+            column.is_nullable = column_i % 3 != 0
+            column.comment = f"column number {column_i}" if column_i % 10 == 0 else None
+            table.columns.append(column)
+        table.columns[0].identity = Identity.ALWAYS
+
+        seconds: float = min(timed_call(OracleSQL.create_ddl_queries, table) for _ in range(repeat))
+        measurements.append({'columns': columns_count, 'seconds': round(seconds, 6),
+                             'us_per_column': round(seconds * 1e6 / columns_count, 3)})
+
+    return {'tables': measurements,
+            'per_column_ratio': round(measurements[-1]['us_per_column'] / measurements[0]['us_per_column'], 2)}
+
+
+def timed_call(function, *args):
+    """
+    :return: seconds the function call took
+    """
+    start_time: float = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start_time
+
+
+def compare_results(results: dict, baseline: dict):
+    """
+    print the change of each measurement compared to a baseline, created by a previous run (for example another commit)
+    :param results: results of this run
+    :param baseline: results loaded from the baseline json file
+    """
+    if results['parameters'] != baseline.get('parameters'):
+        print("Warning: the baseline was measured with different parameters")
+    comparisons: list[tuple] = [('startup', results['startup']['import_time_us'],
+                                 baseline['startup']['import_time_us'])]
+    for stage_name, stage in results['stages'].items():
+        if stage_name in baseline.get('stages', {}):
+            comparisons.append((stage_name, stage['seconds'], baseline['stages'][stage_name]['seconds']))
+
+    for name, value, baseline_value in comparisons:
+        change: str = f"{(value - baseline_value) / baseline_value:+.1%}" if baseline_value else 'n/a'
+        print(f"{name.ljust(25)} {str(baseline_value).rjust(12)} -> {str(value).rjust(12)}   {change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="measure the performance of xlsx2sql on a synthetic workbook")
+    parser.add_argument("--sheets", type=int, default=2, help="number of DDL sheets (and DML sheets)")
+    parser.add_argument("--tables-per-sheet", dest="tables_per_sheet", type=int, default=10)
+    parser.add_argument("--columns", type=int, default=10, help="number of columns in each table")
+    parser.add_argument("--dml-rows", dest="dml_rows", type=int, default=1000, help="number of rows in each table")
+    parser.add_argument("--fk-density", dest="fk_density", type=float, default=0.2,
+                        help="probability (0-1) of each column to be a foreign key")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", dest="output", type=str, help="json file to write the results into")
+    parser.add_argument("--compare", dest="compare", type=str, help="json file of previous results to compare with")
+    arguments = parser.parse_args()
+
+    parameters: dict = {'sheets': arguments.sheets, 'tables_per_sheet': arguments.tables_per_sheet,
+                        'columns': arguments.columns, 'dml_rows': arguments.dml_rows,
+                        'fk_density': arguments.fk_density, 'seed': arguments.seed}
+    results: dict = {'parameters': parameters, 'startup': measure_startup()}
+
+    output_path = pathlib.Path(arguments.output).resolve() if arguments.output else None
+    baseline_path = pathlib.Path(arguments.compare).resolve() if arguments.compare else None
+    with tempfile.TemporaryDirectory() as work_dir:
+        xlsx_path = pathlib.Path(work_dir, 'benchmark.xlsx')
+        start_time: float = time.perf_counter()
+        generate_workbook(xlsx_path, arguments.sheets, arguments.tables_per_sheet, arguments.columns,
+                          arguments.dml_rows, arguments.fk_density, arguments.seed)
+        results['workbook_generation_seconds'] = round(time.perf_counter() - start_time, 4)
+        results['stages'] = measure_stages(xlsx_path, pathlib.Path(work_dir))
+        results['ddl_scaling'] = measure_ddl_scaling()
+        # leave the temporary directory before it is deleted
+        os.chdir(SCRIPT_DIR)
+
+    print(json.dumps(results, indent=4))
+    if output_path:
+        with open(output_path, 'w', encoding='utf-8') as output_file:
+            json.dump(results, output_file, indent=4)
+    if baseline_path:
+        with open(baseline_path, 'r', encoding='utf-8') as baseline_file:
+            compare_results(results, json.load(baseline_file))
+
+
+if __name__ == "__main__":
+    main()
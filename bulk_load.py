@@ -0,0 +1,88 @@
+# this file is used to write large DML tables into csv data files, loaded by the DBMS bulk load instead of insert queries
+import csv
+import hashlib
+import io
+import os
+import pathlib
+import tempfile
+
+from config import Config
+from sql_dbms import unescape_quotes
+from xlsx2sql import is_numeric_column
+
+# number of rows written into the data file at a time
+WRITE_CHUNK_ROWS: int = 10000
+
+
+def bulk_load_dir_path():
+    """
+    :return: directory of the data files of the workbook in the config file
+    """
+    return pathlib.Path(Config.output_dir_path, f"bulk_{Config.input_file_relative_path.stem}")
+
+
+def to_csv_columns(columns_values: list[list]):
+    """
+    convert the table values into csv fields with the same data as the insert queries: values are written as they are
+    quoted in the queries (escaped single quotes are unescaped), and empty cell is empty field (null)
+    :param columns_values: the table columns, as returned by "read_dml_block"
+    :return: list of the table columns, each one is a list of its csv fields
+    """
+    csv_columns: list[list] = []
+    for column_values in columns_values:
+        if is_numeric_column(column_values):
+            csv_columns.append([value or '' for value in column_values])
+        else:
+            csv_columns.append(['' if value is None else unescape_quotes(value) for value in column_values])
+    return csv_columns
+
+
+def write_data_file(table_name: str, columns_values: list[list]):
+    """
+    write the table values into csv file, named by the table and the hash of its content, so the same table always
+    gets the same file (also when written by several processes)
+    :param table_name: the table of the values
+    :param columns_values: the table columns, as returned by "read_dml_block"
+    :return: name of the data file, in "bulk_load_dir_path"
+    """
+    bulk_dir_path = bulk_load_dir_path()
+    bulk_dir_path.mkdir(parents=True, exist_ok=True)
+    content_hash = hashlib.sha256()
+    temp_file_descriptor, temp_file_name = tempfile.mkstemp(suffix='.tmp', dir=bulk_dir_path)
+    temp_file_path = pathlib.Path(temp_file_name)
+    rows = zip(*to_csv_columns(columns_values))
+    with os.fdopen(temp_file_descriptor, 'w', encoding='utf-8', newline='') as data_file:
+        while True:
+            chunk = io.StringIO()
+            writer = csv.writer(chunk, lineterminator='\n')
+            rows_count: int = 0
+            for row in rows:
+                writer.writerow(row)
+                rows_count += 1
+                if rows_count == WRITE_CHUNK_ROWS:
+                    break
+            if rows_count == 0:
+                break
+            content_hash.update(chunk.getvalue().encode('utf-8'))
+            data_file.write(chunk.getvalue())
+
+    data_file_name: str = f"{table_name}_{content_hash.hexdigest()[:16]}.csv"
+    temp_file_path.replace(pathlib.Path(bulk_dir_path, data_file_name))
+    return data_file_name
+
+
+def iter_bulk_load_queries(table_name: str, columns_names: list, columns_values: list[list]):
+    """
+    write the table into data file (and the DBMS files loading it), instead of insert queries
+    :param table_name: the table to load into
+    :param columns_names: the columns names, as returned by "read_dml_block"
+    :param columns_values: the table columns, as returned by "read_dml_block"
+    :return: generator of the queries loading the data file
+    """
+    data_file_name: str = write_data_file(table_name, columns_values)
+    loader_files, load_queries = Config.sql_type_config.build_bulk_load_queries(
+        Config.bulk_load_format, table_name, columns_names, data_file_name)
+    for file_name, file_content in loader_files.items():
+        with open(pathlib.Path(bulk_load_dir_path(), file_name), 'w', encoding='utf-8') as loader_file:
+            loader_file.write(file_content)
+    yield from load_queries
@@ -16,6 +16,31 @@ class Config:
     output_dir_path: pathlib.Path = None
     output_queries_file: pathlib.Path = None
     output_drops_file: pathlib.Path = None
+    is_streaming_reader: bool = False
+    is_sparse_reader: bool = False
+    is_regeneration_cache: bool = False
+    is_workbook_snapshot: bool = False
+    insert_batch_size: int = 1
+    is_copy_insert: bool = True
+    database: str = None
+    execution_batch_size: int = 1000
+    commit_interval: int = 10000
+    is_key_based_delete: bool = False
+    delete_batch_size: int = 1000
+    bulk_load_min_rows: int = 0
+    bulk_load_format: str = 'sqlldr'
+    bulk_load_directory: str = 'XLSX2SQL_BULK_DIR'
+    split_output_bytes: int = 0
+    split_output_statements: int = 0
+    is_compressed_output: bool = False
+    is_deferred_constraints: bool = False
+    index_parallel: int = 0
+    is_index_nologging: bool = False
+    is_fk_novalidate: bool = False
+    # key of each table (from the DDL sheets), filled before the DML queries are created
+    tables_keys: dict = {}
+    included_tables: frozenset = frozenset()
+    excluded_tables: frozenset = frozenset()
 
     @staticmethod
     def parse_yaml_config_to_config():
@@ -56,6 +81,73 @@ class Config:
         else:
             Config.is_rowdependencies = False
 
+        # optional keys, default value is used if missing from the yaml file
+        Config.is_streaming_reader = yaml_configs.get("streaming_reader", False) == 1
+        Config.is_sparse_reader = yaml_configs.get("sparse_reader", False) == 1
+        if Config.is_streaming_reader and Config.is_sparse_reader:
+            logger.error("Only one of the keys 'streaming_reader' and 'sparse_reader' can be 'True'")
+            exit()
+        Config.is_regeneration_cache = yaml_configs.get("regeneration_cache", False) == 1
+        Config.is_workbook_snapshot = yaml_configs.get("workbook_snapshot", False) == 1
+        Config.insert_batch_size = yaml_configs.get("insert_batch_size", 1)
+        if not isinstance(Config.insert_batch_size, int) or Config.insert_batch_size < 1:
+            logger.error("Key 'insert_batch_size' must be a number larger than 0")
+            exit()
+        Config.is_copy_insert = yaml_configs.get("copy_insert", True) == 1
+        Config.is_key_based_delete = yaml_configs.get("key_based_delete", False) == 1
+        Config.delete_batch_size = yaml_configs.get("delete_batch_size", 1000)
+        if not isinstance(Config.delete_batch_size, int) or Config.delete_batch_size < 1:
+            logger.error("Key 'delete_batch_size' must be a number larger than 0")
+            exit()
+        Config.bulk_load_min_rows = yaml_configs.get("bulk_load_min_rows", 0)
+        if not isinstance(Config.bulk_load_min_rows, int) or Config.bulk_load_min_rows < 0:
+            logger.error("Key 'bulk_load_min_rows' must be a number, 0 to disable bulk load")
+            exit()
+        Config.bulk_load_format = str(yaml_configs.get("bulk_load_format", 'sqlldr')).lower()
+        Config.bulk_load_directory = str(yaml_configs.get("bulk_load_directory", 'XLSX2SQL_BULK_DIR')).upper()
+        split_output_mb = yaml_configs.get("split_output_mb", 0)
+        if not isinstance(split_output_mb, (int, float)) or split_output_mb < 0:
+            logger.error("Key 'split_output_mb' must be a number, 0 to disable splitting by size")
+            exit()
+        Config.split_output_bytes = int(split_output_mb * 1024 * 1024)
+        Config.split_output_statements = yaml_configs.get("split_output_statements", 0)
+        if not isinstance(Config.split_output_statements, int) or Config.split_output_statements < 0:
+            logger.error("Key 'split_output_statements' must be a number, 0 to disable splitting by statements")
+            exit()
+        Config.is_compressed_output = yaml_configs.get("compress_output", False) == 1
+        Config.is_deferred_constraints = yaml_configs.get("deferred_constraints", False) == 1
+        Config.index_parallel = yaml_configs.get("index_parallel", 0)
+        if not isinstance(Config.index_parallel, int) or Config.index_parallel < 0:
+            logger.error("Key 'index_parallel' must be a number, 0 to create the indexes without parallel")
+            exit()
+        Config.is_index_nologging = yaml_configs.get("index_nologging", False) == 1
+        Config.is_fk_novalidate = yaml_configs.get("fk_novalidate", False) == 1
+        # used only for direct execution into database ("--execute")
+        Config.database = yaml_configs.get("database")
+        Config.execution_batch_size = yaml_configs.get("execution_batch_size", 1000)
+        Config.commit_interval = yaml_configs.get("commit_interval", 10000)
+        for key in ["execution_batch_size", "commit_interval"]:
+            if not isinstance(getattr(Config, key), int) or getattr(Config, key) < 1:
+                logger.error(f"Key '{key}' must be a number larger than 0")
+                exit()
+        Config.included_tables = Config.parse_tables_names(yaml_configs, "include_tables")
+        Config.excluded_tables = Config.parse_tables_names(yaml_configs, "exclude_tables")
+
+    @staticmethod
+    def parse_tables_names(yaml_configs: dict, key: str):
+        """
+        :param yaml_configs: the loaded yaml config file
+        :param key: key of optional list of tables names (or single name)
+        :return: set of the tables names in upper case, as they are written into the queries
+        """
+        tables_names = yaml_configs.get(key, [])
+        if isinstance(tables_names, str):
+            tables_names = [tables_names]
+        if not isinstance(tables_names, list):
+            logger.error(f"Key '{key}' must be a list of tables names")
+            exit()
+        return frozenset(str(table_name).upper().strip() for table_name in tables_names)
+
     @staticmethod
     def init_config():
         """
@@ -63,11 +155,38 @@ class Config:
         """
         Config.parse_yaml_config_to_config()
         # after extracting the data from yaml into config, the following lines process more data in the Config class
-        Config.input_file_absolute_path = Config.input_file_relative_path.resolve()
         # create "generated" directory where the script is running
-        Config.output_dir_path = pathlib.Path(pathlib.Path().absolute(), "generated")
-        Config.output_queries_file = pathlib.Path(Config.output_dir_path, f"queries_{Config.input_file_relative_path.stem}.sql")
-        Config.output_drops_file = pathlib.Path(Config.output_dir_path, f"drops_{Config.input_file_relative_path.stem}.sql")
+        Config.set_input_file(Config.input_file_relative_path, pathlib.Path(pathlib.Path().absolute(), "generated"))
+
+    @staticmethod
+    def set_input_file(input_file_path: pathlib.Path, output_dir_path: pathlib.Path):
+        """
+        set the xlsx file to convert, and the paths of the output files created from it
+        :param input_file_path: path of the xlsx file
+        :param output_dir_path: directory of the output files, created if missing
+        """
+        Config.input_file_relative_path = input_file_path
+        Config.input_file_absolute_path = input_file_path.resolve()
+        Config.output_dir_path = output_dir_path
+        Config.output_queries_file = pathlib.Path(Config.output_dir_path, f"queries_{input_file_path.stem}.sql")
+        Config.output_drops_file = pathlib.Path(Config.output_dir_path, f"drops_{input_file_path.stem}.sql")
         pathlib.Path(Config.output_dir_path).mkdir(parents=True, exist_ok=True)
 
+    @staticmethod
+    def export_config():
+        """
+        :return: all the configuration values, to initialize "Config" in another process (where it is not initialized)
+        """
+        return {key: value for key, value in vars(Config).items()
+                if not key.startswith('_') and not isinstance(value, staticmethod)}
+
+    @staticmethod
+    def import_config(config_values: dict):
+        """
+        initialize configuration values from the values exported in another process
+        :param config_values: dictionary created by "export_config"
+        """
+        for key, value in config_values.items():
+            setattr(Config, key, value)
+
 
@@ -1,34 +1,89 @@
+import enum
+
+# the model classes use "__slots__" and None for empty cells, since large workbooks have many thousands of them
+
 class Sheet:
     """
     represented xlsx sheet, in memory (more efficient than reading each time from the file)
     """
+    __slots__ = ('sheet_name', 'sheet_raw', 'sheet_rows', 'sheet_blocks')
+
     def __init__(self, name):
         self.sheet_name = name
         self.sheet_raw = ''
+        # used instead of "sheet_raw" when the sheet is streamed, rows are read one by one from the file
+        self.sheet_rows = None
+        # used instead of "sheet_raw" when the sheet is sparse, list of (matrix, "Block") of each table in the sheet
+        self.sheet_blocks = None
+
+class Block:
+    """
+    represent the location of a table ("###_ddl"/"###_dml") in a sheet matrix, found by scanning the sheet once
+    """
+    __slots__ = ('block_type', 'table_name', 'marker_row', 'header_row', 'data_start_row', 'data_end_row', 'width')
+
+    def __init__(self):
+        self.block_type = ''
+        self.table_name = ''
+        self.marker_row = 0
+        self.header_row = 0
+        self.data_start_row = 0
+        # the row ending the table (empty row or next table), not part of the table
+        self.data_end_row = 0
+        # number of columns of the table, starting from column 1
+        self.width = 0
+
+class Identity(enum.Enum):
+    """
+    the way values of identity column are generated
+    """
+    ALWAYS = 'always'
+    DEFAULT = 'default'
+    DEFAULT_ON_NULL = 'default on null'
+    # by separate sequence
+    SEQUENCE = 'seq'
+
 
 class Table:
     """
     represent the table before it is parsed to be in the database
     """
+    __slots__ = ('name', 'columns', 'comment', 'multi_columns_unique')
+
     def __init__(self):
         self.name = ''
         self.columns = []
-        self.comment = ''
+        self.comment = None
         # list to hold constraints which are span on more than one column
         self.multi_columns_unique = []
 
 class TableColumn:
     """
-        represent one column in a table
+        represent one column in a table, None for empty cell
     """
+    __slots__ = ('name', 'data_type', 'is_nullable', 'identity', 'constraint', 'default_value', 'is_indexed', 'comment',
+                 'foreign_key', 'cache')
+
     def __init__(self):
         self.name = ''
-        self.data_type = ''
-        self.is_nullable = ''
-        self.identity = ''
-        self.constraint = ''
-        self.default_value = ''
-        self.is_indexed = ''
-        self.comment = ''
-        self.foreign_key = ''
-        self.cache = ''
+        self.data_type = None
+        self.is_nullable = True
+        self.identity = None
+        self.constraint = None
+        self.default_value = None
+        self.is_indexed = False
+        self.comment = None
+        self.foreign_key = None
+        self.cache = None
+
+
+class QueryType(enum.Enum):
+    """
+    type of created query, decides where the query is written in the output files
+    """
+    CREATE_TABLE = 'create_table'
+    DROP_TABLE = 'drop_table'
+    FK = 'fk'
+    FK_DROP = 'fk_drop'
+    INSERT = 'insert'
+    DELETE = 'delete'
@@ -0,0 +1,159 @@
+# this file is used to order the tables by their foreign keys, and to split them into independent groups (shards)
+import heapq
+
+from definitions import Table
+from diagnostics import diagnostics
+
+# cycles already reported, since the tables can be sorted more than once in a run
+reported_cycles: set = set()
+
+
+def referenced_tables_names(table: Table):
+    """
+    :param table: "Table" with its columns
+    :return: set of the names of the tables referenced by the foreign keys of the table (not including itself)
+    """
+    referenced_names: set = set()
+    for column in table.columns:
+        if column.foreign_key is not None:
+            # foreign key is "table name, column name[, on delete]"
+            referenced_names.add(column.foreign_key.split(',')[0].strip().upper())
+    referenced_names.discard(table.name)
+    return referenced_names
+
+
+def build_dependency_graph(tables: list[Table]):
+    """
+    :param tables: list of "Table"
+    :return: dictionary of table name to the set of tables names it references, only tables from the given list
+    """
+    tables_names: set = {table.name for table in tables}
+    return {table.name: referenced_tables_names(table) & tables_names for table in tables}
+
+
+def find_cycles(graph: dict):
+    """
+    find the strongly connected components of the graph (Tarjan's algorithm, without recursion)
+    :param graph: dependency graph created by "build_dependency_graph"
+    :return: list of cycles, each one is a list of the tables names in it (by the order of the graph)
+    """
+    indexes: dict = {}
+    low_links: dict = {}
+    stack: list = []
+    on_stack: set = set()
+    cycles: list = []
+    order: dict = {name: i for i, name in enumerate(graph)}
+    for root_name in graph:
+        if root_name in indexes:
+            continue
+        # each frame is (table name, iterator of its referenced tables)
+        frames: list = [(root_name, iter(graph[root_name]))]
+        indexes[root_name] = low_links[root_name] = len(indexes)
+        stack.append(root_name)
+        on_stack.add(root_name)
+        while frames:
+            table_name, referenced_names = frames[-1]
+            referenced_name = next(referenced_names, None)
+            if referenced_name is not None:
+                if referenced_name not in indexes:
+                    indexes[referenced_name] = low_links[referenced_name] = len(indexes)
+                    stack.append(referenced_name)
+                    on_stack.add(referenced_name)
+                    frames.append((referenced_name, iter(graph[referenced_name])))
+                elif referenced_name in on_stack:
+                    low_links[table_name] = min(low_links[table_name], indexes[referenced_name])
+                continue
+
+            frames.pop()
+            if frames:
+                parent_name: str = frames[-1][0]
+                low_links[parent_name] = min(low_links[parent_name], low_links[table_name])
+            if low_links[table_name] == indexes[table_name]:
+                component: list = []
+                while True:
+                    component_name: str = stack.pop()
+                    on_stack.discard(component_name)
+                    component.append(component_name)
+                    if component_name == table_name:
+                        break
+                if len(component) > 1:
+                    cycles.append(sorted(component, key=order.get))
+    return cycles
+
+
+def sort_tables_by_dependencies(tables: list[Table]):
+    """
+    order the tables so each table comes after the tables it references, otherwise the order of the tables is kept.
+    tables in a cycle can't be ordered, they are reported and added at the end by their original order
+    :param tables: list of "Table"
+    :return: list of the same tables, sorted
+    """
+    graph: dict = build_dependency_graph(tables)
+    order: dict = {table.name: i for i, table in enumerate(tables)}
+    referencing_tables: dict = {table.name: [] for table in tables}
+    missing_references: dict = {}
+    for table_name, referenced_names in graph.items():
+        missing_references[table_name] = len(referenced_names)
+        for referenced_name in referenced_names:
+            referencing_tables[referenced_name].append(table_name)
+
+    # the ready table with the lowest original position is taken each time, so the order changes only when needed
+    ready_tables: list = [order[name] for name, missing_count in missing_references.items() if missing_count == 0]
+    heapq.heapify(ready_tables)
+    sorted_tables: list[Table] = []
+    while ready_tables:
+        table: Table = tables[heapq.heappop(ready_tables)]
+        sorted_tables.append(table)
+        for referencing_name in referencing_tables[table.name]:
+            missing_references[referencing_name] -= 1
+            if missing_references[referencing_name] == 0:
+                heapq.heappush(ready_tables, order[referencing_name])
+
+    if len(sorted_tables) < len(tables):
+        for cycle in find_cycles(graph):
+            if tuple(cycle) not in reported_cycles:
+                reported_cycles.add(tuple(cycle))
+                diagnostics.warning('fk_cycle', f"Foreign keys cycle between the tables: {', '.join(cycle)}", cycle[0])
+        sorted_names: set = {table.name for table in sorted_tables}
+        sorted_tables.extend(table for table in tables if table.name not in sorted_names)
+    return sorted_tables
+
+
+def split_into_shards(tables: list[Table], shards_count: int):
+    """
+    split the tables into groups without foreign keys between them, so each group can be created (and loaded) in
+    separate session. connected tables are always in the same group, the groups are balanced by number of columns
+    :param tables: list of "Table"
+    :param shards_count: maximal number of groups
+    :return: list of groups, each one is a list of "Table" sorted by "sort_tables_by_dependencies"
+    """
+    graph: dict = build_dependency_graph(tables)
+    # union-find of the connected tables
+    parents: dict = {table.name: table.name for table in tables}
+
+    def find_root(table_name: str):
+        while parents[table_name] != table_name:
+            parents[table_name] = parents[parents[table_name]]
+            table_name = parents[table_name]
+        return table_name
+
+    for table_name, referenced_names in graph.items():
+        for referenced_name in referenced_names:
+            parents[find_root(table_name)] = find_root(referenced_name)
+
+    sorted_tables: list[Table] = sort_tables_by_dependencies(tables)
+    components: dict = {}
+    for table in sorted_tables:
+        components.setdefault(find_root(table.name), []).append(table)
+
+    # the largest components are placed first, each one into the smallest shard
+    shards: list = [[] for _ in range(min(shards_count, len(components)))]
+    shards_sizes: list = [(0, shard_i) for shard_i in range(len(shards))]
+    for component in sorted(components.values(), key=lambda tables_group: -sum(len(table.columns) for table in tables_group)):
+        shard_size, shard_i = heapq.heappop(shards_sizes)
+        shards[shard_i].extend(component)
+        heapq.heappush(shards_sizes, (shard_size + sum(len(table.columns) for table in component), shard_i))
+
+    # components were added by size, the tables of each shard are ordered again
+    positions: dict = {table.name: i for i, table in enumerate(sorted_tables)}
+    return [sorted(shard, key=lambda table: positions[table.name]) for shard in shards]
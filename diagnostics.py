@@ -0,0 +1,157 @@
+# this file is used to collect the problems found in the workbook while it is converted, they are reported together
+# with their counts by rule and by table, and fatal problems stop the run only after all of them were found
+import collections
+import contextlib
+import json
+import pathlib
+import sys
+
+from config import Config
+from logger import logger
+
+# messages of each rule written into the console, the following ones are written only into the log file
+CONSOLE_RULE_LIMIT: int = 10
+# severity of each problem: 'warning' and 'error' are logged, 'fatal' also stops the run before writing the output
+SEVERITY_LOG_LEVELS: dict = {'warning': 'warning', 'error': 'error', 'fatal': 'error'}
+
+
+class Diagnostics:
+    """
+    the problems found in the workbook, each one is dictionary of its severity, rule (short name of the check),
+    table, column and message
+    """
+    def __init__(self):
+        self.entries: list[dict] = []
+        self.console_counts: collections.Counter = collections.Counter()
+        self.is_muted: bool = False
+        # the summary is written once per run, also when the run stopped on fatal problems (see "exit_on_errors")
+        self.is_summary_written: bool = False
+
+    def log_entry(self, entry: dict):
+        self.console_counts[entry['rule']] += 1
+        is_console: bool = self.console_counts[entry['rule']] <= CONSOLE_RULE_LIMIT
+        getattr(logger, SEVERITY_LOG_LEVELS[entry['severity']])(entry['message'], extra={'console': is_console})
+        if self.console_counts[entry['rule']] == CONSOLE_RULE_LIMIT + 1:
+            logger.info(f"More '{entry['rule']}' messages are written only into the log file")
+
+    def report(self, severity: str, rule: str, message: str, table: str = None, column: str = None):
+        """
+        :param severity: 'warning', 'error' or 'fatal'
+        :param rule: short name of the check, the problems are counted by it
+        :param message: the logged message
+        :param table: name of the table of the problem, if known
+        :param column: name of the column of the problem, if known
+        """
+        if self.is_muted:
+            return
+        entry: dict = {'severity': severity, 'rule': rule, 'table': table, 'column': column, 'message': message}
+        self.entries.append(entry)
+        self.log_entry(entry)
+
+    def warning(self, rule: str, message: str, table: str = None, column: str = None):
+        self.report('warning', rule, message, table, column)
+
+    def error(self, rule: str, message: str, table: str = None, column: str = None):
+        self.report('error', rule, message, table, column)
+
+    def fatal(self, rule: str, message: str, table: str = None, column: str = None):
+        self.report('fatal', rule, message, table, column)
+
+    @contextlib.contextmanager
+    def muted(self):
+        """
+        ignore the problems found inside the "with" block, for tables which are parsed again later (and reported then)
+        """
+        self.is_muted = True
+        try:
+            yield
+        finally:
+            self.is_muted = False
+
+    def mark(self):
+        """
+        :return: position of the next problem, to get the problems found from this point (see "entries_since")
+        """
+        return len(self.entries)
+
+    def entries_since(self, mark: int):
+        return self.entries[mark:]
+
+    def replay(self, entries: list[dict]):
+        """
+        report again problems found in previous run, for results taken from cache
+        :param entries: the problems, as returned by "entries_since"
+        """
+        for entry in entries:
+            self.entries.append(entry)
+            self.log_entry(entry)
+
+    def extend(self, entries: list[dict]):
+        """
+        add problems found and logged in another process
+        :param entries: the problems, as returned by "pop_entries"
+        """
+        self.entries.extend(entries)
+
+    def pop_entries(self):
+        """
+        :return: the problems found so far, which are removed (used by worker processes to return them with the results)
+        """
+        entries: list[dict] = self.entries
+        self.entries = []
+        return entries
+
+    def reset(self):
+        self.entries = []
+        self.console_counts.clear()
+        self.is_summary_written = False
+
+    def create_report(self):
+        """
+        :return: dictionary of the counts by severity, by rule and by table, and all the problems
+        """
+        rules: dict = {}
+        for entry in self.entries:
+            rule_counts: dict = rules.setdefault(entry['rule'], {'severity': entry['severity'], 'count': 0, 'tables': []})
+            rule_counts['count'] += 1
+            if entry['table'] is not None and entry['table'] not in rule_counts['tables']:
+                rule_counts['tables'].append(entry['table'])
+        return {'severities': dict(collections.Counter(entry['severity'] for entry in self.entries)),
+                'rules': rules,
+                'tables': dict(collections.Counter(entry['table'] for entry in self.entries if entry['table'] is not None)),
+                'entries': self.entries}
+
+    def write_summary(self):
+        """
+        log the counts of the problems and write the report into "diagnostics.json" in the output directory,
+        only once until "reset" is called for the next run (in "--batch" and "--watch")
+        """
+        if self.is_summary_written:
+            return
+        self.is_summary_written = True
+        report_path = pathlib.Path(Config.output_dir_path, 'diagnostics.json')
+        if not self.entries:
+            # the report of a previous run is not left
+            report_path.unlink(missing_ok=True)
+            return
+        report: dict = self.create_report()
+        lines: list[str] = [f"{rule} ({rule_counts['severity']}): {rule_counts['count']}, tables: "
+                            f"{', '.join(rule_counts['tables'][:5])}{' ...' if len(rule_counts['tables']) > 5 else ''}"
+                            for rule, rule_counts in sorted(report['rules'].items(), key=lambda item: -item[1]['count'])]
+        logger.info(f"diagnostics: {', '.join(f'{count} {severity}' for severity, count in report['severities'].items())} "
+                    f"(written into {report_path})\n" + '\n'.join(lines))
+        with open(report_path, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=4)
+
+    def exit_on_errors(self):
+        """
+        stop the run if fatal problems were found, after all of them were reported (with exit code 1)
+        """
+        fatal_count: int = sum(entry['severity'] == 'fatal' for entry in self.entries)
+        if fatal_count:
+            logger.error(f"{fatal_count} fatal problems were found in the workbook, nothing was written")
+            self.write_summary()
+            sys.exit(1)
+
+
+diagnostics = Diagnostics()
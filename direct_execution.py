@@ -0,0 +1,157 @@
+# this file is used to apply the tables and data straight to a database (with "--execute"), instead of writing queries files
+import sys
+import time
+
+from config import Config
+from diagnostics import diagnostics
+from logger import logger
+from sql_dbms import unescape_quotes
+from xlsx2sql import *
+
+
+def split_statements(query: str):
+    """
+    DB-API executes one statement at a time, while some created queries contain more than one statement
+    :param query: query as created by the DBMS class
+    :return: list of statements in the query, without the ending ';'
+    """
+    statements: list[str] = []
+    for statement in query.split(';\n'):
+        statement = statement.strip().rstrip(';')
+        if statement:
+            statements.append(statement)
+    return statements
+
+
+def to_parameters(columns_values: list[list]):
+    """
+    convert the table values into DB-API parameters, the same way they are written in insert queries
+    :param columns_values: the table columns, as returned by "read_dml_block"
+    :return: list of parameters for each row: None for empty cell, int for value in numeric column, otherwise the string
+             (escaped single quotes are unescaped, see "unescape_quotes")
+    """
+    parameters_columns: list[list] = []
+    for column_values in columns_values:
+        if is_numeric_column(column_values):
+            parameters_columns.append([int(value) if value else None for value in column_values])
+        else:
+            parameters_columns.append([unescape_quotes(value) if value else None for value in column_values])
+    return list(zip(*parameters_columns))
+
+
+def stop_on_database_error(connection, error: Exception, failed_action: str, statement: str):
+    """
+    roll back the transaction, close the connection and stop the run (with exit code 1), when the database rejected
+    a statement (for example a DML table which doesn't exist in the database)
+    :param connection: DB-API connection
+    :param error: the error raised by the database driver
+    :param failed_action: description of the failed action, with the table name
+    :param statement: the failed statement
+    """
+    logger.error(f"{failed_action} failed: {error}\n{statement}")
+    connection.rollback()
+    connection.close()
+    diagnostics.write_summary()
+    sys.exit(1)
+
+
+def execute_statements(connection, cursor, queries: list):
+    """
+    :param connection: DB-API connection
+    :param cursor: cursor of the connection
+    :param queries: DDL queries as created by the DBMS class, each one may contain more than one statement
+    """
+    for query in queries:
+        for statement in split_statements(query):
+            try:
+                cursor.execute(statement)
+            except connection.Error as error:
+                stop_on_database_error(connection, error, "Executing DDL statement", statement)
+
+
+def execute_dml_table(connection, cursor, table_name: str, columns_names: list, columns_values: list[list],
+                      rows_since_commit: int):
+    """
+    insert all rows of a DML table with "executemany" batches, committing every "commit_interval" rows
+    :param connection: DB-API connection
+    :param cursor: cursor of the connection
+    :param table_name: the table to insert into
+    :param columns_names: the columns to insert into
+    :param columns_values: the table columns, as returned by "read_dml_block"
+    :param rows_since_commit: number of rows inserted since last commit, before this table
+    :return: number of rows inserted, and number of rows inserted since last commit
+    """
+    insert_query: str = Config.sql_type_config.build_parameterized_insert_query(table_name, columns_names)
+    inserted_rows: int = 0
+    batch_parameters: list[list] = []
+    for row_parameters in to_parameters(columns_values):
+        batch_parameters.append(row_parameters)
+        if len(batch_parameters) == Config.execution_batch_size:
+            cursor.executemany(insert_query, batch_parameters)
+            inserted_rows += len(batch_parameters)
+            rows_since_commit += len(batch_parameters)
+            batch_parameters = []
+            if rows_since_commit >= Config.commit_interval:
+                connection.commit()
+                rows_since_commit = 0
+
+    if batch_parameters:
+        cursor.executemany(insert_query, batch_parameters)
+        inserted_rows += len(batch_parameters)
+        rows_since_commit += len(batch_parameters)
+
+    return inserted_rows, rows_since_commit
+
+
+def execute_workbook(connection, read_sheets):
+    """
+    create the tables and insert the data of the workbook straight into the database.
+    the workbook is read twice: first the tables are created (with foreign keys), then the data is inserted
+    (with "deferred_constraints" the indexes and constraints are created after the data)
+    :param connection: DB-API connection
+    :param read_sheets: function that returns the sheets of the workbook ("xlsx_to_sheets" or "xlsx_to_streamed_sheets")
+    :return: dictionary of table name to number of inserted rows and seconds it took
+    """
+    cursor = connection.cursor()
+
+    ddl_tables: list[Table] = []
+    for sheet in read_sheets():
+        if sheet.sheet_name.startswith('ddl_'):
+            ddl_tables.extend(create_sheet_ddl_tables(sheet))
+
+    ddl_queries, _, fk_queries, _ = create_ddl_queries(ddl_tables)
+    diagnostics.exit_on_errors()
+    # in load optimized order the indexes and constraints are created after the data is inserted
+    execute_statements(connection, cursor, ddl_queries if Config.is_deferred_constraints else ddl_queries + fk_queries)
+    connection.commit()
+    logger.info(f"{len(ddl_tables)} tables have been created")
+
+    tables_statistics: dict[str, list] = {}
+    rows_since_commit: int = 0
+    for sheet in read_sheets():
+        if sheet.sheet_name.startswith('dml_'):
+            for table_name, columns_names, columns_values in iter_sheet_dml_tables(sheet):
+                start_time: float = time.perf_counter()
+                try:
+                    inserted_rows, rows_since_commit = execute_dml_table(connection, cursor, table_name, columns_names,
+                                                                         columns_values, rows_since_commit)
+                except connection.Error as error:
+                    stop_on_database_error(connection, error, f"Inserting into table {table_name}",
+                                           Config.sql_type_config.build_parameterized_insert_query(table_name,
+                                                                                                   columns_names))
+                table_statistics = tables_statistics.setdefault(table_name, [0, 0.0])
+                table_statistics[0] += inserted_rows
+                table_statistics[1] += time.perf_counter() - start_time
+    connection.commit()
+
+    if Config.is_deferred_constraints:
+        start_time: float = time.perf_counter()
+        execute_statements(connection, cursor, fk_queries)
+        connection.commit()
+        logger.info(f"indexes and constraints have been created in {time.perf_counter() - start_time:.3f} seconds")
+
+    for table_name, (inserted_rows, seconds) in tables_statistics.items():
+        rows_per_second: float = inserted_rows / seconds if seconds else 0
+        logger.info(f"{table_name}: {inserted_rows} rows inserted in {seconds:.3f} seconds ({rows_per_second:.0f} rows/sec)")
+
+    return tables_statistics
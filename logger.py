@@ -1,25 +1,117 @@
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
+import os
 import pathlib
+import queue
 import sys
 
+# format of the messages, in the console and in the log files
+LOG_FORMATTER = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+
+# writes the messages of the main process in background thread (see "start_queue_logging")
+queue_listener: logging.handlers.QueueListener = None
+
+
+class ConsoleFilter(logging.Filter):
+    """
+    messages logged with extra={'console': False} are written only into the log file (see "Diagnostics")
+    """
+    def filter(self, record: logging.LogRecord):
+        return getattr(record, 'console', True)
+
+
+def start_queue_logging(xlsx2sql_logger: logging.Logger, handlers: list):
+    """
+    the logger only puts the messages into a queue, and background thread writes them into the handlers,
+    so logging doesn't wait for the console and the file
+    """
+    global queue_listener
+    log_queue = queue.SimpleQueue()
+    xlsx2sql_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    queue_listener = logging.handlers.QueueListener(log_queue, *handlers)
+    queue_listener.start()
+    atexit.register(stop_queue_logging)
+
+
+def stop_queue_logging():
+    """
+    write the messages left in the queue, and stop the background thread
+    """
+    global queue_listener
+    if queue_listener is not None:
+        queue_listener.stop()
+        queue_listener = None
+
+
+def log_directly_in_child():
+    """
+    the background thread is not copied into forked process, so the process writes into the handlers directly
+    """
+    global queue_listener
+    if queue_listener is not None:
+        logger.handlers = list(queue_listener.handlers)
+        queue_listener = None
+
+
+def restart_queue_listener(handlers: tuple):
+    """
+    replace the handlers of the background thread, the messages already in the queue are written into the previous
+    handlers before it is stopped
+    """
+    queue_listener.stop()
+    queue_listener.handlers = handlers
+    queue_listener.start()
+
+
+def add_log_handler(handler: logging.Handler):
+    """
+    write the messages also into the handler, through the background thread when it runs (see "start_queue_logging")
+    """
+    if queue_listener is None:
+        logger.addHandler(handler)
+    else:
+        restart_queue_listener(queue_listener.handlers + (handler,))
+
+
+def remove_log_handler(handler: logging.Handler):
+    """
+    stop writing the messages into the handler added by "add_log_handler", after the messages logged before
+    """
+    if queue_listener is None:
+        logger.removeHandler(handler)
+    else:
+        restart_queue_listener(tuple(queue_handler for queue_handler in queue_listener.handlers
+                                     if queue_handler is not handler))
+
 
 def create_logger():
     xlsx2sql_logger = logging.getLogger("xlsx2sql_logger")
     xlsx2sql_logger.setLevel(logging.DEBUG)
 
-    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-
     stream_handler = logging.StreamHandler(sys.stdout)
-    stream_handler.setFormatter(formatter)
-    xlsx2sql_logger.addHandler(stream_handler)
+    stream_handler.setFormatter(LOG_FORMATTER)
+    stream_handler.addFilter(ConsoleFilter())
 
     generated_dir: pathlib = pathlib.Path("generated")
     generated_dir.mkdir(exist_ok=True)
     log_file_path = generated_dir / 'xlsx.log'  # (datetime.now().strftime("%Y-%m-%d_%H-%M-%S") + '.log')
-    file_handler = logging.FileHandler(str(log_file_path), mode='w')
-    file_handler.setFormatter(formatter)
-    xlsx2sql_logger.addHandler(file_handler)
+    # worker processes (of "-workers") append to the log file of the main process instead of overriding it
+    file_mode = 'w' if multiprocessing.parent_process() is None else 'a'
+    file_handler = logging.FileHandler(str(log_file_path), mode=file_mode)
+    file_handler.setFormatter(LOG_FORMATTER)
+
+    if multiprocessing.parent_process() is None:
+        start_queue_logging(xlsx2sql_logger, [stream_handler, file_handler])
+    else:
+        # worker processes log little, and may exit without "atexit" (which writes the messages left in the queue)
+        xlsx2sql_logger.addHandler(stream_handler)
+        xlsx2sql_logger.addHandler(file_handler)
 
     return xlsx2sql_logger
 
 logger = create_logger()
+# not available on Windows, where worker processes are spawned (and create their logger)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=log_directly_in_child)
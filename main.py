@@ -1,49 +1,206 @@
 import argparse
+import pathlib
+import sys
 
 from cmd import cmd_config
-from oracleSQL import OracleSQL
-from ui import gui_config
+from diagnostics import diagnostics
+from profiler import profiler
 from xlsx2sql import *
 
+# modules used only in some of the modes (and the DBMS classes) are imported only when needed, to keep the startup fast
+
+
+def create_sql_type_config(dbms_type_str: str):
+    """
+    :param dbms_type_str: the DBMS type from the config file (lowercase)
+    :return: instance of the "SQL_DBMS" subclass of the DBMS
+    """
+    if dbms_type_str == 'oraclesql':
+        from oracleSQL import OracleSQL
+        return OracleSQL()
+    elif dbms_type_str == 'postgresql':
+        from postgreSQL import PostgreSQL
+        return PostgreSQL()
+    elif dbms_type_str == 'sqlite':
+        from sqliteSQL import SQLiteSQL
+        return SQLiteSQL()
+    return None
+
+
 def main(parser):
     # allow the use of one and only one cmd argument
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("-gui", help="used to open GUI interface instead of command line", action="store_true")
     group.add_argument("-config_path", dest="config_path", help="yaml configuration file path", type=str)
+    parser.add_argument("--workers", dest="workers", type=int, default=1,
+                        help="number of processes used to parse the sheets and create the queries in parallel")
+    parser.add_argument("--execute", action="store_true",
+                        help="create the tables and insert the data straight into the database in the config file, "
+                             "instead of writing queries files")
+    parser.add_argument("--shards", dest="shards", type=int, default=0,
+                        help="split the queries into up to N scripts without foreign keys between them, "
+                             "to be run in parallel sessions")
+    parser.add_argument("--profile", action="store_true",
+                        help="write report of the time, counters and memory of each stage into generated/profile.json")
+    parser.add_argument("--cprofile", action="store_true",
+                        help="same as --profile, and also profile the functions with cProfile (slower run)")
+    parser.add_argument("--diff", dest="diff", type=str,
+                        help="path of previous version of the workbook (xlsx) or its schema snapshot (json), "
+                             "write only the queries altering its schema into the current one")
+    parser.add_argument("--snapshot", action="store_true",
+                        help="also save the schema of the workbook into generated/schema_[xlsx name].json, "
+                             "to be used later with --diff")
+    parser.add_argument("--batch", dest="batch", type=str,
+                        help="directory or glob pattern of xlsx files, convert each one (instead of xlsx_location) "
+                             "into generated/[xlsx name]/, using --workers processes")
+    parser.add_argument("--watch", dest="watch", type=float, nargs='?', const=1.0,
+                        help="keep running and convert the workbook again whenever it is saved, checking it every "
+                             "WATCH seconds (default 1). only the changed sheets are parsed again")
     cmd_arguments = parser.parse_args()
     # decide where to go next, use gui or cmd arguments
     if cmd_arguments.gui:
+        # imported only here since it opens a window on import (also in each worker process on some platforms)
+        from ui import gui_config
         gui_config()
     else:
         cmd_config(cmd_arguments)
 
-    # load the configuration from config file
-    Config.init_config()
-    # done here to avoid circular import
-    if Config.dbms_type_str == 'oraclesql':
-        Config.sql_type_config = OracleSQL()
+    cprofile = None
+    if cmd_arguments.cprofile:
+        import cProfile
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    with profiler.stage('config'):
+        # load the configuration from config file
+        Config.init_config()
+        # done here to avoid circular import
+        Config.sql_type_config = create_sql_type_config(Config.dbms_type_str)
+        if Config.bulk_load_min_rows and Config.bulk_load_format not in Config.sql_type_config.bulk_load_formats:
+            logger.error(f"Bulk load format '{Config.bulk_load_format}' is not supported for {Config.dbms_type_str}")
+            exit()
+
+    failed_workbooks_count: int = 0
+    if cmd_arguments.watch:
+        from watch import WorkbookWatcher
+        WorkbookWatcher().watch(cmd_arguments.watch)
+    elif cmd_arguments.batch:
+        from batch import convert_batch
+        with profiler.stage('batch'):
+            batch_results: list[dict] = convert_batch(cmd_arguments.batch, cmd_arguments.workers)
+        failed_workbooks_count = sum(result['status'] != 'ok' for result in batch_results)
+    elif cmd_arguments.diff:
+        from schema_diff import diff_schemas
+        with profiler.stage('schema_diff'):
+            diff_schemas(pathlib.Path(cmd_arguments.diff).resolve())
+    else:
+        convert(cmd_arguments)
+    # the problems found in the workbook, with their counts by rule and by table
+    diagnostics.write_summary()
+    if cmd_arguments.snapshot and not cmd_arguments.batch:
+        from schema_diff import save_schema_snapshot, read_workbook_tables, schema_snapshot_path
+        # the problems of the tables were already reported
+        with profiler.stage('schema_snapshot'), diagnostics.muted():
+            save_schema_snapshot(read_workbook_tables(Config.input_file_absolute_path), schema_snapshot_path())
+
+    if cprofile is not None:
+        cprofile.disable()
+    if cmd_arguments.profile or cmd_arguments.cprofile:
+        profiler.write_report(pathlib.Path(Config.output_dir_path, 'profile.json'), cprofile,
+                              pathlib.Path(Config.output_dir_path, 'profile.prof'))
+    # the other workbooks of the batch were converted, the failed ones are listed in the batch summary
+    if failed_workbooks_count:
+        sys.exit(1)
+
+
+def convert(cmd_arguments):
+    """
+    convert the xlsx file into queries files (or straight into database), according to the configuration
+    :param cmd_arguments: the parsed cmd arguments
+    :return: None
+    """
+    if cmd_arguments.execute:
+        from direct_execution import execute_workbook
+        if not Config.database:
+            logger.error("Key 'database' is required to execute into database")
+            exit()
+        try:
+            connection = Config.sql_type_config.connect(Config.database)
+        except NotImplementedError:
+            logger.error(f"Executing into database is not supported for {Config.dbms_type_str}")
+            exit()
+        # the workbook is read again for each pass, so streamed sheets are never held in memory
+        with profiler.stage('execute'):
+            if Config.is_streaming_reader:
+                execute_workbook(connection, lambda: xlsx_to_streamed_sheets(Config.input_file_absolute_path))
+            else:
+                sheets: list[Sheet] = xlsx_to_sheets(Config.input_file_absolute_path)
+                execute_workbook(connection, lambda: sheets)
+        connection.close()
+        return
+
+    if cmd_arguments.shards > 0:
+        from shards import convert_into_shards
+        with profiler.stage('shards'):
+            if Config.is_streaming_reader:
+                convert_into_shards(lambda: xlsx_to_streamed_sheets(Config.input_file_absolute_path),
+                                    cmd_arguments.shards)
+            else:
+                sheets: list[Sheet] = xlsx_to_sheets(Config.input_file_absolute_path)
+                convert_into_shards(lambda: sheets, cmd_arguments.shards)
+        return
+
+    # take data from xlsx and load it to memory into "sheets_raw", or read it lazily when streaming
+    # (then the reading is measured as part of the parsing stages)
+    with profiler.stage('read_xlsx'):
+        if Config.is_streaming_reader:
+            sheets_raw = xlsx_to_streamed_sheets(Config.input_file_absolute_path)
+        else:
+            sheets_raw: list[Sheet] = xlsx_to_sheets(Config.input_file_absolute_path)
+            profiler.count('sheets', len(sheets_raw))
 
-    # take data from xlsx and load it to memory into "sheets_raw"
-    sheets_raw: list[Sheet] = xlsx_to_raw_data(Config.input_file_absolute_path)
+    # the keys of the tables are needed before the DML queries are created, which can be before their DDL sheet
+    if Config.is_key_based_delete:
+        with profiler.stage('tables_keys'):
+            if Config.is_streaming_reader:
+                Config.tables_keys = read_tables_keys(xlsx_to_streamed_sheets(Config.input_file_absolute_path))
+            else:
+                Config.tables_keys = read_tables_keys(sheets_raw)
 
-    g_ddl_tables: list[Table] = []
-    dml_insert_queries: list[str] = []
-    dml_delete_queries: list[str] = []
+    # the queries are written into the output files while they are created
+    with QueriesFilesWriter() as writer:
+        if cmd_arguments.workers > 1:
+            from parallel import process_sheets_in_pool
+            with profiler.stage('parallel_processing'):
+                process_sheets_in_pool(sheets_raw, cmd_arguments.workers, writer)
+            return
 
-    # loop all the sheets, and parse it accordingly to the sheet type (ddl or dml)
-    for sheet in sheets_raw:
-        if sheet.sheet_name.startswith('ddl_'):
-            tables: list[Table] = create_sheet_ddl_tables(sheet.sheet_raw)
-            g_ddl_tables.extend(tables)
-        elif sheet.sheet_name.startswith('dml_'):
-            insert_queries, drops_queries = create_sheet_dml_queries(sheet.sheet_raw)
-            dml_insert_queries.extend(insert_queries)
-            dml_delete_queries.extend(drops_queries)
+        if Config.is_regeneration_cache:
+            from regeneration_cache import RegenerationCache
+            regeneration_cache = RegenerationCache()
+            with profiler.stage('cached_processing'):
+                for sheet in sheets_raw:
+                    writer.write_queries(regeneration_cache.iter_sheet_queries(sheet))
+                writer.write_queries(regeneration_cache.iter_ddl_queries())
+                regeneration_cache.evict_stale()
+            return
 
-    ddl_queries, ddl_drops_queries, fk_queries, fk_drop_queries = create_ddl_queries(g_ddl_tables)
+        g_ddl_tables: list[Table] = []
 
-    generate_queries_files(ddl_queries, ddl_drops_queries, fk_queries, fk_drop_queries, dml_insert_queries, dml_delete_queries)
+        # loop all the sheets, and parse it accordingly to the sheet type (ddl or dml)
+        for sheet in sheets_raw:
+            if sheet.sheet_name.startswith('ddl_'):
+                with profiler.stage('ddl_parsing'):
+                    tables: list[Table] = create_sheet_ddl_tables(sheet)
+                    g_ddl_tables.extend(tables)
+                    profiler.count('tables', len(tables))
+                    profiler.count('columns', sum(len(table.columns) for table in tables))
+            elif sheet.sheet_name.startswith('dml_'):
+                with profiler.stage('dml_generation'):
+                    writer.write_queries(iter_sheet_dml_queries(sheet))
 
+        with profiler.stage('ddl_rendering'):
+            writer.write_queries(iter_ddl_queries(g_ddl_tables))
 
 if __name__ == "__main__":
     main_parser = argparse.ArgumentParser()
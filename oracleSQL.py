@@ -3,12 +3,15 @@
 import abc
 
 from config import Config
-from definitions import Table
-from sql_dbms import SQL_DBMS
-from logger import logger
+from definitions import Identity, Table, TableColumn
+from diagnostics import diagnostics
+from sql_dbms import COLUMN_NAME_MIN_WIDTH, DATA_TYPE_MIN_WIDTH, SQL_DBMS
 
 class OracleSQL(SQL_DBMS, abc.ABC):
     is_rowdependencies: bool = None
+    bulk_load_formats: tuple = ('sqlldr', 'external_table')
+    fk_novalidate_query: str = " enable novalidate;\n" \
+                               "alter table {table_name} modify constraint {constraint_name} enable validate;\n"
     reserved_keywords: frozenset = frozenset(
         {'ACCESS', 'ADD', 'ALL', 'ALTER', 'AND', 'ANY', 'AS', 'ASC', 'AUDIT', 'BETWEEN', 'BY', 'CHAR',
          'CHECK', 'CLUSTER', 'COLUMN', 'COLUMN_VALUE', 'COMMENT', 'COMPRESS', 'CONNECT', 'CREATE', 'CURRENT',
@@ -29,17 +32,111 @@ class OracleSQL(SQL_DBMS, abc.ABC):
 
     @staticmethod
     def build_insert_query(table_name: str, columns_names: str, values: list):
-        return f"insert into {table_name} ({', '.join(columns_names)})\n\t\t values ({', '.join(values)});\n"
+        return SQL_DBMS.build_values_insert_query(table_name, columns_names, values)
 
     @staticmethod
     def build_delete_query(table_name: str, columns_names: str, values: list):
-        delete_query: str = f"delete from {table_name} where "
-        delete_conditions: list = []
-        for column_name, value in zip(columns_names, values):
-            delete_conditions.append(f"{column_name} = {value}")
+        return SQL_DBMS.build_equality_delete_query(table_name, columns_names, values)
 
-        delete_query += ' and '.join(delete_conditions) + ';\n'
-        return delete_query
+    @staticmethod
+    def build_batch_insert_query(table_name: str, columns_names: list, values_list: list[list]):
+        # OracleDB supports multi-row VALUES only since version 23c, "insert all" works in all versions
+        columns: str = ', '.join(columns_names)
+        into_clauses: str = ''.join(f"\tinto {table_name} ({columns}) values ({', '.join(values)})\n" for values in values_list)
+        return f"insert all\n{into_clauses}select 1 from dual;\n"
+
+    @staticmethod
+    def build_bulk_load_queries(bulk_load_format: str, table_name: str, columns_names: list, data_file_name: str):
+        """
+        :param bulk_load_format: 'sqlldr' or 'external_table'
+        :param table_name: the table to load into
+        :param columns_names: the columns of the data file, by their order
+        :param data_file_name: name of the csv data file, in the bulk load directory
+        :return: dictionary of file name to content of files to be written next to the data file (control file),
+                 and list of queries loading the data (comment with the SQL*Loader command, for control file)
+        """
+        columns: str = ', '.join(columns_names)
+        # the default length of the loader fields is 255, so it is set as the maximal length of the columns
+        loader_fields: str = ', '.join(f"{column_name} char(4000)" for column_name in columns_names)
+        if bulk_load_format == 'sqlldr':
+            control_file_name: str = f"{data_file_name.rsplit('.', 1)[0]}.ctl"
+            # empty field is null, the same as '' in insert query
+            control_file: str = f"options (direct=true)\nload data\ncharacterset UTF8\ninfile '{data_file_name}'\n" \
+                                f"append\ninto table {table_name}\n" \
+                                f"fields terminated by ',' optionally enclosed by '\"'\ntrailing nullcols\n({loader_fields})\n"
+            return {control_file_name: control_file}, \
+                [f"-- {table_name} is loaded by SQL*Loader, run in the bulk load directory: sqlldr control={control_file_name}\n"]
+
+        external_table_name: str = f"EXT_{table_name}"
+        columns_definitions: str = ',\n'.join(f"\t{column_name.ljust(40)} VARCHAR2(4000)" for column_name in columns_names)
+        create_query: str = f"create table {external_table_name} (\n{columns_definitions}\n) organization external (\n" \
+                            f"\ttype oracle_loader default directory {Config.bulk_load_directory}\n" \
+                            f"\taccess parameters (records delimited by newline characterset UTF8\n" \
+                            f"\t\tfields terminated by ',' optionally enclosed by '\"' missing field values are null\n" \
+                            f"\t\t({loader_fields}))\n" \
+                            f"\tlocation ('{data_file_name}')\n) reject limit 0;\n"
+        # direct path insert, the table can't be read in the same transaction until commit
+        insert_query: str = f"insert /*+ append */ into {table_name} ({columns})\n\t\tselect {columns} from {external_table_name};\n"
+        return {}, [create_query, insert_query, "commit;\n", f"drop table {external_table_name};\n"]
+
+    @staticmethod
+    def build_column_definition(table: Table, column: TableColumn, name_width: int = COLUMN_NAME_MIN_WIDTH,
+                                type_width: int = DATA_TYPE_MIN_WIDTH):
+        """
+        :param name_width: width the column name is padded to (see "build_padding_widths")
+        :param type_width: width the data type is padded to
+        :return: definition of the column, as written in "create table" (or "alter table add")
+        """
+        definition_parts: list[str] = [column.name.ljust(name_width), ' ', (column.data_type or '').ljust(type_width), ' ']
+        if column.default_value is not None:
+            definition_parts.append(f"default {column.default_value} ")
+
+        # identity by sequence is created by separate queries (see "build_sequence_queries")
+        if column.identity == Identity.ALWAYS:
+            definition_parts.append(f"generated always as identity {OracleSQL.build_identity_cache(table, column)} ")
+        elif column.identity == Identity.DEFAULT:
+            definition_parts.append(f"generated by default as identity {OracleSQL.build_identity_cache(table, column)}  ")
+        elif column.identity == Identity.DEFAULT_ON_NULL:
+            definition_parts.append(f"generated by default on null as identity "
+                                    f"{OracleSQL.build_identity_cache(table, column)}  ")
+
+        if not column.is_nullable:
+            definition_parts.append("not null ")
+
+        # nested table is created by "nested table" clause of "create table"
+        if column.constraint is not None and not OracleSQL.is_nested_column(column):
+            definition_parts.append(f"{column.constraint} ")
+        return ''.join(definition_parts)
+
+    @staticmethod
+    def build_sequence_queries(table: Table, column: TableColumn):
+        """
+        :return: query creating the sequence of identity column ('seq'), and query dropping it
+        """
+        sequence_name = f"SEQ_{table.name}_{column.name}"
+        sequence_query = f"create sequence {sequence_name} {OracleSQL.build_identity_cache(table, column)};\n" \
+                         f"alter table {table.name} modify {column.name} default {sequence_name}.nextval;\n"
+        return sequence_query, f"drop sequence {sequence_name};\n"
+
+    @staticmethod
+    def build_index_query(table: Table, column: TableColumn):
+        """
+        :return: query creating the index of the column, with the build options "index_parallel" and "index_nologging"
+        """
+        index_name: str = f"IDX_{table.name}__{column.name}"
+        index_query: str = f"create index {index_name} on {table.name} ({column.name})"
+        build_options: list[str] = []
+        reset_options: list[str] = []
+        if Config.index_parallel:
+            build_options.append(f"parallel {Config.index_parallel}")
+            # otherwise the optimizer uses parallel queries on the index after it is built
+            reset_options.append("noparallel")
+        if Config.is_index_nologging:
+            build_options.append("nologging")
+            reset_options.append("logging")
+        if not build_options:
+            return f"{index_query};\n"
+        return f"{index_query} {' '.join(build_options)};\nalter index {index_name} {' '.join(reset_options)};\n"
 
     @staticmethod
     def create_ddl_queries(table: Table):
@@ -47,117 +144,66 @@ class OracleSQL(SQL_DBMS, abc.ABC):
         nested_table_queries: list = []
         comment_queries: list = []
         sequences_queries: list = []
+        table_fk_queries: list = []
         # lists to return
         drop_seq_queries: list = []
         fk_queries: list = []
         fk_drop_queries: list = []
         create_table_queries: list = []
         drop_table_queries: list = []
+        # in load optimized order ("deferred_constraints") the indexes and unique constraints are created after the data
+        # is inserted, together with the foreign keys
+        constraint_queries: list = fk_queries if Config.is_deferred_constraints else create_table_queries
 
-        create_query = f"create table {table.name} (\n"
+        # the parts of "create table" are collected and joined once, so wide tables are rendered in linear time
+        name_width, type_width = OracleSQL.build_padding_widths(table)
+        columns_definitions: list[str] = []
         for column in table.columns:
-            if column.data_type.upper() == 'NAN':
-                logger.error(f"Error: the column {table.name}.{column.name} does not have a type")
-            create_query = f"{create_query}\t{column.name.ljust(40)} {column.data_type.ljust(20)} "
-
-            if column.default_value != 'nan':
-                create_query = f"{create_query}default {column.default_value} "
-
-            if column.identity != 'nan':
-                # set the cache for the identity column / sequence
-                cache = ''
-                if column.cache.isdigit():
-                    if int(column.cache) <= 0:
-                        logger.warning(f"Cannot define cache smaller then 1 in {table.name}.{column.name}")
-                    else:
-                        cache = 'cache ' + column.cache
-                elif column.cache == 'nocache':
-                    cache = 'nocache'
-
-                if column.identity == 'always':
-                    create_query = f"{create_query}generated always as identity {cache} "
-                elif column.identity == 'default':
-                    create_query = f"{create_query}generated by default as identity {cache}  "
-                elif column.identity == 'default on null':
-                    create_query = f"{create_query}generated by default on null as identity {cache}  "
-                elif column.identity == 'seq':
-                    sequence_name = f"SEQ_{table.name}_{column.name}"
-                    sequence_query = f"create sequence {sequence_name} {cache};\n" \
-                                     f"alter table {table.name} modify {column.name} default {sequence_name}.nextval;\n"
-                    sequences_queries.append(sequence_query)
-                    drop_seq_query = f"drop sequence {sequence_name};\n"
-                    drop_seq_queries.append(drop_seq_query)
-                else:
-                    logger.error(f'Wrong input for identity column in table {table.name}, column {column.name}')
-
-            if column.is_nullable == 'no':
-                create_query = f"{create_query}not null "
-
-            if column.constraint != 'nan':
-                if column.constraint.lower().startswith('nested'):
-                    if column.is_nullable == 'no':
-                        logger.error("Nested column can't be 'NOT NULL'")
-                    nested_query = f"nested table {column.name} store as {table.name}__{column.name}"
-                    nested_table_queries.append(nested_query)
-                else:
-                    create_query = f"{create_query}{column.constraint} "
-
-            create_query = f"{create_query},\n"
-
-            if column.is_indexed == 'yes':
-                if any(x in column.constraint.lower() for x in ["unique", 'primary key']):
+            if column.data_type is None:
+                diagnostics.error('missing_data_type', f"Error: the column {table.name}.{column.name} does not have a type",
+                                  table.name, column.name)
+            columns_definitions.append(f"\t{OracleSQL.build_column_definition(table, column, name_width, type_width)}")
+
+            if column.identity == Identity.SEQUENCE:
+                sequence_query, drop_seq_query = OracleSQL.build_sequence_queries(table, column)
+                sequences_queries.append(sequence_query)
+                drop_seq_queries.append(drop_seq_query)
+
+            if OracleSQL.is_nested_column(column):
+                if not column.is_nullable:
+                    diagnostics.error('nested_not_null', "Nested column can't be 'NOT NULL'", table.name, column.name)
+                nested_table_queries.append(f"\nnested table {column.name} store as {table.name}__{column.name}")
+
+            if column.is_indexed:
+                if column.constraint is not None and any(x in column.constraint.lower() for x in ["unique", 'primary key']):
                     # Make error in case unique or primary key column are marked to be indexed
-                    logger.warning(
-                        f"Column {table.name}.{column.name} is already Unique/Primary-key and cannot be indexed")
-                index_query = f"create index IDX_{table.name}__{column.name} on {table.name} ({column.name});\n"
-                index_queries.append(index_query)
-
-            if column.comment != 'nan':
-                comment_query = f"comment on column {table.name}.{column.name} is '{column.comment}';\n"
-                if comment_query.count('\'') % 2 != 0:
-                    logger.error(f"table: {table.name}, column: {column.name} contains non-escaped single quote")
-                comment_queries.append(comment_query)
-
-            if column.foreign_key != 'NAN':
-                fk_constraint_name = f"FK_{table.name}__{column.name}"
-                # foreign_key in xlsx consist of 2 or 3 parts, separated by comma:
-                # first is table name, second is column name, and third is on delete [cascade]\[set null] if exist
-                fk_referenced = column.foreign_key.split(',')
-                if len(fk_referenced) < 2:
-                    logger.error(f"wrong number of arguments in: {table.name}.{column.name} ")
-                    exit()
-                fk_query = f"alter table {table.name} add constraint {fk_constraint_name} \n" \
-                           f"\tforeign key ({column.name}) references {fk_referenced[0].strip()}({fk_referenced[1].strip()})"
-
-                if len(fk_referenced) > 2:
-                    fk_query = f"{fk_query} on delete {fk_referenced[2].lower().strip()}"
-                fk_query = f"{fk_query};\n"
-                fk_queries.append(fk_query)
-
-                fk_drop_query = f"alter table {table.name}\n\t\tdrop constraint {fk_constraint_name};\n"
-                fk_drop_queries.append(fk_drop_query)
+                    diagnostics.warning('indexed_key_column', f"Column {table.name}.{column.name} is already "
+                                        f"Unique/Primary-key and cannot be indexed", table.name, column.name)
+                index_queries.append(OracleSQL.build_index_query(table, column))
 
-        create_query = f"{create_query[:-2]}\n) " + "rowdependencies" if Config.is_rowdependencies else f"{create_query[:-2]}\n) "
+            if column.comment is not None:
+                comment_queries.append(OracleSQL.build_comment_query(table, column))
 
-        for nes_query in nested_table_queries:
-            create_query = f"{create_query}\n{nes_query}"
+            if column.foreign_key is not None:
+                fk_query, fk_drop_query = OracleSQL.build_fk_queries(table, column)
+                table_fk_queries.append(fk_query)
+                fk_drop_queries.append(fk_drop_query)
 
-        create_query = f"{create_query};\n"
+        create_query: str = ''.join([f"create table {table.name} (\n", ',\n'.join(columns_definitions), "\n) ",
+                                     "rowdependencies" if Config.is_rowdependencies else '',
+                                     *nested_table_queries, ";\n"])
 
         # save all queries to global list
         create_table_queries.append(create_query)
         for index_query in index_queries:
-            create_table_queries.append(index_query)
-        if table.comment != 'nan':
+            constraint_queries.append(index_query)
+        if table.comment is not None:
             create_table_queries.append(f"comment on table {table.name} is '{table.comment}';\n")
         for multi_unique_constraint in table.multi_columns_unique:
-            constraint_name = '_'.join(multi_unique_constraint.split(','))
-            constraint_name = f"UNIQUE_{table.name}__{constraint_name}"
-            multi_unique_query = f"alter table {table.name}\n\t" \
-                                 f"add constraint {constraint_name}\n\t" \
-                                 f"unique ({multi_unique_constraint});\n"
-            create_table_queries.append(multi_unique_query)
-            fk_drop_queries.append(f"alter table {table.name}\n\tdrop constraint {constraint_name};\n")
+            multi_unique_query, multi_unique_drop_query = OracleSQL.build_multi_unique_queries(table, multi_unique_constraint)
+            constraint_queries.append(multi_unique_query)
+            fk_drop_queries.append(multi_unique_drop_query)
+        fk_queries.extend(table_fk_queries)
 
         for comment_query in comment_queries:
             create_table_queries.append(comment_query)
@@ -170,3 +216,95 @@ class OracleSQL(SQL_DBMS, abc.ABC):
         drop_table_queries.append(drop_table_query)
 
         return drop_seq_queries, fk_queries, fk_drop_queries, create_table_queries, drop_table_queries
+
+    @staticmethod
+    def create_alter_queries(old_table: Table, new_table: Table):
+        """
+        create the queries changing the table from its old definition into the new one, columns are matched by name
+        (so renamed column is dropped and added)
+        :param old_table: the table as created by the previous version
+        :param new_table: the table in the current version, with the same name
+        :return: queries dropping foreign keys, unique constraints and indexes, queries changing the columns,
+                 and queries adding foreign keys, unique constraints, indexes and comments
+        """
+        drop_constraint_queries: list = []
+        alter_table_queries: list = []
+        add_constraint_queries: list = []
+
+        old_columns: dict = {column.name: column for column in old_table.columns}
+        new_columns: dict = {column.name: column for column in new_table.columns}
+
+        for old_column in old_table.columns:
+            new_column: TableColumn = new_columns.get(old_column.name)
+            if old_column.foreign_key is not None and (new_column is None or new_column.foreign_key != old_column.foreign_key):
+                drop_constraint_queries.append(OracleSQL.build_fk_queries(old_table, old_column)[1])
+            # index of dropped column is dropped with it
+            if old_column.is_indexed and new_column is not None and not new_column.is_indexed:
+                drop_constraint_queries.append(f"drop index IDX_{old_table.name}__{old_column.name};\n")
+        for multi_unique_constraint in old_table.multi_columns_unique:
+            if multi_unique_constraint not in new_table.multi_columns_unique:
+                drop_constraint_queries.append(OracleSQL.build_multi_unique_queries(old_table, multi_unique_constraint)[1])
+
+        dropped_columns: list = [column for column in old_table.columns if column.name not in new_columns]
+        if dropped_columns:
+            alter_table_queries.append(f"alter table {new_table.name} drop ({', '.join(column.name for column in dropped_columns)});\n")
+            for column in dropped_columns:
+                if column.identity == Identity.SEQUENCE:
+                    alter_table_queries.append(OracleSQL.build_sequence_queries(old_table, column)[1])
+
+        name_width, type_width = OracleSQL.build_padding_widths(new_table)
+        added_columns: list = [column for column in new_table.columns if column.name not in old_columns]
+        if added_columns:
+            columns_definitions: str = ',\n'.join(
+                f"\t{OracleSQL.build_column_definition(new_table, column, name_width, type_width).rstrip()}"
+                for column in added_columns)
+            alter_table_queries.append(f"alter table {new_table.name} add (\n{columns_definitions}\n);\n")
+            for column in added_columns:
+                if column.identity == Identity.SEQUENCE:
+                    alter_table_queries.append(OracleSQL.build_sequence_queries(new_table, column)[0])
+                if OracleSQL.is_nested_column(column):
+                    diagnostics.warning('nested_column_added', f"The nested table column {new_table.name}.{column.name} "
+                                                               f"must be added manually", new_table.name, column.name)
+
+        # only the changed parts are modified, since modifying a column to its current nullability is an error
+        modified_columns: list = []
+        for new_column in new_table.columns:
+            old_column: TableColumn = old_columns.get(new_column.name)
+            if old_column is None:
+                continue
+            changes: list = []
+            if new_column.data_type != old_column.data_type:
+                changes.append(new_column.data_type)
+            if new_column.default_value != old_column.default_value:
+                changes.append('default null' if new_column.default_value is None else f"default {new_column.default_value}")
+            if new_column.is_nullable != old_column.is_nullable:
+                changes.append('null' if new_column.is_nullable else 'not null')
+            if changes:
+                modified_columns.append(f"\t{new_column.name.ljust(name_width)} {' '.join(changes)}")
+            if (new_column.identity, new_column.cache, new_column.constraint) != \
+                    (old_column.identity, old_column.cache, old_column.constraint):
+                diagnostics.warning('identity_changed', f"The identity or constraint of {new_table.name}.{new_column.name} "
+                                                        f"changed, it is not altered (drop and add the column instead)",
+                                    new_table.name, new_column.name)
+        if modified_columns:
+            alter_table_queries.append(f"alter table {new_table.name} modify (\n" + ',\n'.join(modified_columns) + "\n);\n")
+
+        if new_table.comment != old_table.comment:
+            alter_table_queries.append(f"comment on table {new_table.name} is "
+                                       f"'{new_table.comment or ''}';\n")
+
+        for new_column in new_table.columns:
+            old_column: TableColumn = old_columns.get(new_column.name, TableColumn())
+            if new_column.foreign_key is not None and new_column.foreign_key != old_column.foreign_key:
+                add_constraint_queries.append(OracleSQL.build_fk_queries(new_table, new_column)[0])
+            if new_column.is_indexed and not old_column.is_indexed:
+                add_constraint_queries.append(OracleSQL.build_index_query(new_table, new_column))
+            if new_column.comment is not None and new_column.comment != old_column.comment:
+                add_constraint_queries.append(OracleSQL.build_comment_query(new_table, new_column))
+            elif new_column.comment is None and old_column.comment is not None:
+                add_constraint_queries.append(f"comment on column {new_table.name}.{new_column.name} is '';\n")
+        for multi_unique_constraint in new_table.multi_columns_unique:
+            if multi_unique_constraint not in old_table.multi_columns_unique:
+                add_constraint_queries.append(OracleSQL.build_multi_unique_queries(new_table, multi_unique_constraint)[0])
+
+        return drop_constraint_queries, alter_table_queries, add_constraint_queries
@@ -0,0 +1,119 @@
+# this file is used to process the sheets in a pool of processes, when running with "--workers"
+import collections
+import concurrent.futures
+
+from config import Config
+from diagnostics import diagnostics
+from profiler import profiler
+from queries_writer import QueriesFilesWriter
+from xlsx2sql import *
+
+
+def init_worker(config_values: dict):
+    """
+    initialize a worker process, in case it didn't inherit the configuration from the main process
+    :param config_values: configuration values exported by "Config.export_config"
+    """
+    Config.import_config(config_values)
+    # forked process starts with the problems and counters of the main process, they are reported by it
+    diagnostics.reset()
+    profiler.pop_counters()
+
+
+def ddl_sheet_job(sheet: Sheet):
+    """
+    :param sheet: DDL "Sheet" loaded into memory
+    :return: list of "Table" of all the tables in the sheet, the problems found in them (already logged) and the
+             profiler counters
+    """
+    return create_sheet_ddl_tables(sheet), diagnostics.pop_entries(), profiler.pop_counters()
+
+
+def ddl_blocks_job(blocks_raw: list):
+    """
+    :param blocks_raw: list of matrixes, one for each DDL table (as given by "iter_sheet_indexed_blocks" for streamed
+                       or sparse sheet)
+    :return: list of "Table" of all the tables, the problems found in them (already logged) and the profiler counters
+    """
+    return [create_ddl_table(block_raw, 1) for block_raw in blocks_raw], diagnostics.pop_entries(), \
+        profiler.pop_counters()
+
+
+def dml_block_job(block_raw):
+    """
+    :param block_raw: matrix in which a DML table starts in position [1, 1]
+    :return: insert and delete queries of the table (as returned by "create_dml_queries"), the problems found in it
+             (already logged) and the profiler counters (tables and rows)
+    """
+    return *create_dml_queries(block_raw, 1), diagnostics.pop_entries(), profiler.pop_counters()
+
+
+def split_dml_sheet(sheet_raw):
+    """
+    split a DML sheet into smaller matrixes, one for each table, to be processed separately
+    :param sheet_raw: matrix sheet containing DML tables
+    :return: generator of matrixes in which the "###_dml" cell is in position [1, 1]
+    """
+    for block in index_sheet_blocks(sheet_raw, 'dml'):
+        # the row ending the table is kept, to mark the end of the table
+        yield sheet_raw[block.marker_row - 1:block.data_end_row + 1]
+
+
+def process_sheets_in_pool(sheets_raw, workers: int, writer: QueriesFilesWriter):
+    """
+    parse the sheets and create their queries using a pool of processes.
+    DDL sheets are parsed as a whole, and their queries are created at the end since the tables are ordered by their
+    foreign keys. DML sheets are split into tables since they can be very large.
+    the results are written in the order of the sheets, so the queries are identical to a single process run.
+    :param sheets_raw: list (or generator when streaming) of "Sheet"
+    :param workers: number of processes in the pool
+    :param writer: the created queries are written into it
+    :return: None
+    """
+    def collect_result(job_type: str, future):
+        if job_type == 'ddl':
+            tables, diagnostics_entries, counters = future.result()
+            ddl_tables.extend(tables)
+            profiler.count('tables', len(tables))
+            profiler.count('columns', sum(len(table.columns) for table in tables))
+        else:
+            insert_queries, delete_queries, diagnostics_entries, counters = future.result()
+            writer.extend(QueryType.INSERT, insert_queries)
+            writer.extend(QueryType.DELETE, delete_queries)
+        # the problems and counters of the worker are reported by the main process
+        diagnostics.extend(diagnostics_entries)
+        for counter_name, amount in counters.items():
+            profiler.count(counter_name, amount)
+
+    ddl_tables: list[Table] = []
+    # limit the number of jobs waiting for results, so a streamed workbook is not loaded all at once into memory
+    max_pending_jobs: int = workers * 4
+    pending_jobs = collections.deque()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                                initargs=(Config.export_config(),)) as executor:
+        for sheet in sheets_raw:
+            # streamed and sparse sheets are sent by tables, dense sheets are split here
+            is_dense_sheet: bool = sheet.sheet_rows is None and sheet.sheet_blocks is None
+            if sheet.sheet_name.startswith('ddl_'):
+                if is_dense_sheet:
+                    pending_jobs.append(('ddl', executor.submit(ddl_sheet_job, sheet)))
+                else:
+                    blocks_raw = [block_raw for block_raw, _ in iter_sheet_indexed_blocks(sheet, 'ddl')]
+                    pending_jobs.append(('ddl', executor.submit(ddl_blocks_job, blocks_raw)))
+            elif sheet.sheet_name.startswith('dml_'):
+                if is_dense_sheet:
+                    blocks_raw = split_dml_sheet(sheet.sheet_raw)
+                else:
+                    blocks_raw = (block_raw for block_raw, _ in iter_sheet_indexed_blocks(sheet, 'dml'))
+                for block_raw in blocks_raw:
+                    pending_jobs.append(('dml', executor.submit(dml_block_job, block_raw)))
+                    while len(pending_jobs) > max_pending_jobs:
+                        collect_result(*pending_jobs.popleft())
+
+            while len(pending_jobs) > max_pending_jobs:
+                collect_result(*pending_jobs.popleft())
+
+        while pending_jobs:
+            collect_result(*pending_jobs.popleft())
+
+    writer.write_queries(iter_ddl_queries(ddl_tables))
@@ -0,0 +1,237 @@
+# this page is specific for PostgreSQL, the data of each DML table is loaded by a single "copy ... from stdin"
+# (run the queries file with psql), or by insert queries with "copy_insert: False", and the Oracle data types of the
+# workbook are converted to their PostgreSQL ones.
+
+import abc
+import re
+
+from config import Config
+from definitions import Identity, Table, TableColumn
+from diagnostics import diagnostics
+from sql_dbms import COLUMN_NAME_MIN_WIDTH, DATA_TYPE_MIN_WIDTH, SQL_DBMS, unescape_quotes
+from logger import logger
+
+# Oracle data types written in the workbooks, and the PostgreSQL types they are created as
+ORACLE_DATA_TYPES: dict = {'VARCHAR2': 'VARCHAR', 'NVARCHAR2': 'VARCHAR', 'NCHAR': 'CHAR', 'NUMBER': 'NUMERIC',
+                           'CLOB': 'TEXT', 'NCLOB': 'TEXT', 'LONG': 'TEXT', 'BLOB': 'BYTEA', 'RAW': 'BYTEA',
+                           'BINARY_FLOAT': 'REAL', 'BINARY_DOUBLE': 'DOUBLE PRECISION'}
+# PostgreSQL types without size
+UNSIZED_DATA_TYPES: frozenset = frozenset({'TEXT', 'BYTEA', 'REAL', 'DOUBLE PRECISION'})
+# characters escaped in the rows of "copy" text format
+COPY_ESCAPES: dict = {ord('\\'): '\\\\', ord('\t'): '\\t', ord('\n'): '\\n', ord('\r'): '\\r'}
+
+
+class PostgreSQL(SQL_DBMS, abc.ABC):
+    # psql stops at the first error, and each part of the queries file runs in one transaction
+    file_header_extra: str = "\\set ON_ERROR_STOP on\nbegin;\n"
+    commit_query: str = "\ncommit;\n"
+    is_copy_insert: bool = True
+    # without cache option the identity cache is 1
+    identity_nocache_option: str = 'cache 1'
+    fk_novalidate_query: str = " not valid;\nalter table {table_name} validate constraint {constraint_name};\n"
+    reserved_keywords: frozenset = frozenset(
+        {'ALL', 'ANALYSE', 'ANALYZE', 'AND', 'ANY', 'ARRAY', 'AS', 'ASC', 'ASYMMETRIC', 'AUTHORIZATION', 'BINARY',
+         'BOTH', 'CASE', 'CAST', 'CHECK', 'COLLATE', 'COLLATION', 'COLUMN', 'CONCURRENTLY', 'CONSTRAINT', 'CREATE',
+         'CROSS', 'CURRENT_CATALOG', 'CURRENT_DATE', 'CURRENT_ROLE', 'CURRENT_SCHEMA', 'CURRENT_TIME',
+         'CURRENT_TIMESTAMP', 'CURRENT_USER', 'DEFAULT', 'DEFERRABLE', 'DESC', 'DISTINCT', 'DO', 'ELSE', 'END',
+         'EXCEPT', 'FALSE', 'FETCH', 'FOR', 'FOREIGN', 'FREEZE', 'FROM', 'FULL', 'GRANT', 'GROUP', 'HAVING', 'ILIKE',
+         'IN', 'INITIALLY', 'INNER', 'INTERSECT', 'INTO', 'IS', 'ISNULL', 'JOIN', 'LATERAL', 'LEADING', 'LEFT', 'LIKE',
+         'LIMIT', 'LOCALTIME', 'LOCALTIMESTAMP', 'NATURAL', 'NOT', 'NOTNULL', 'NULL', 'OFFSET', 'ON', 'ONLY', 'OR',
+         'ORDER', 'OUTER', 'OVERLAPS', 'PLACING', 'PRIMARY', 'REFERENCES', 'RETURNING', 'RIGHT', 'SELECT',
+         'SESSION_USER', 'SIMILAR', 'SOME', 'SYMMETRIC', 'SYSTEM_USER', 'TABLE', 'TABLESAMPLE', 'THEN', 'TO',
+         'TRAILING', 'TRUE', 'UNION', 'UNIQUE', 'USER', 'USING', 'VARIADIC', 'VERBOSE', 'WHEN', 'WHERE', 'WINDOW',
+         'WITH'})
+
+    @staticmethod
+    def to_sql_value(value: str):
+        # empty cell is loaded as null by "copy" (as in OracleDB, where '' is null)
+        return 'null' if value == "''" else value
+
+    @staticmethod
+    def build_insert_query(table_name: str, columns_names: str, values: list):
+        return f"insert into {table_name} ({', '.join(columns_names)})\n\t\t " \
+               f"values ({', '.join(PostgreSQL.to_sql_value(value) for value in values)});\n"
+
+    @staticmethod
+    def build_batch_insert_query(table_name: str, columns_names: list, values_list: list[list]):
+        rows_values: str = ',\n\t\t\t'.join(f"({', '.join(PostgreSQL.to_sql_value(value) for value in values)})"
+                                            for values in values_list)
+        return f"insert into {table_name} ({', '.join(columns_names)})\n\t\t values {rows_values};\n"
+
+    @staticmethod
+    def build_copy_query(table_name: str, columns_names: list, columns_values: list[list]):
+        """
+        :param table_name: the table to load into
+        :param columns_names: the columns of the table values, by their order
+        :param columns_values: the table columns, as returned by "read_dml_block"
+        :return: "copy" of all the rows of the table, in text format: tab separated, "\\N" for empty (or whitespace
+                 only) cell, which is null as in the insert queries (see "to_sql_value").
+                 values are written as they are quoted in the insert queries (escaped single quotes are unescaped)
+        """
+        copy_columns: list[list] = [['\\N' if not value else unescape_quotes(value).translate(COPY_ESCAPES)
+                                     for value in column_values] for column_values in columns_values]
+        rows: str = ''.join('\t'.join(row_values) + '\n' for row_values in zip(*copy_columns))
+        return f"copy {table_name} ({', '.join(columns_names)}) from stdin;\n{rows}\\.\n"
+
+    @staticmethod
+    def build_delete_query(table_name: str, columns_names: str, values: list):
+        delete_conditions: list = []
+        for column_name, value in zip(columns_names, values):
+            delete_conditions.append(f"{column_name} is null" if value == "''" else f"{column_name} = {value}")
+
+        return f"delete from {table_name} where {' and '.join(delete_conditions)};\n"
+
+    @staticmethod
+    def build_parameterized_insert_query(table_name: str, columns_names: list):
+        # psycopg2 uses the "format" parameter style
+        return f"insert into {table_name} ({', '.join(columns_names)}) values ({', '.join(['%s'] * len(columns_names))})"
+
+    @staticmethod
+    def connect(database: str):
+        """
+        :param database: connection string of the database, such as "dbname=test user=postgres host=localhost"
+        :return: psycopg2 connection (psycopg2 is required only for the direct execution)
+        """
+        try:
+            import psycopg2
+        except ImportError:
+            logger.error("Executing into PostgreSQL requires psycopg2, install it with: pip install psycopg2-binary")
+            exit()
+        return psycopg2.connect(database)
+
+    @staticmethod
+    def convert_data_type(table: Table, column: TableColumn):
+        """
+        :return: the PostgreSQL type of the column: Oracle types are replaced, and virtual column ("type AS (expression)")
+                 is created as stored generated column
+        """
+        data_type: str = column.data_type or ''
+        # length semantics (50 CHAR / 50 BYTE) are not supported by PostgreSQL
+        data_type = re.sub(r"\(\s*(\d+)\s+(CHAR|BYTE)\s*\)", r"(\1)", data_type, flags=re.IGNORECASE)
+        virtual_match = re.fullmatch(r"(.*?)\s+as\s*(\(.*\))(\s+virtual)?", data_type, flags=re.IGNORECASE | re.DOTALL)
+        if virtual_match:
+            data_type = virtual_match.group(1)
+
+        type_match = re.fullmatch(r"(\w+)\s*(\([^)]*\))?(.*)", data_type, flags=re.DOTALL)
+        if type_match and type_match.group(1).upper() in ORACLE_DATA_TYPES:
+            type_name: str = ORACLE_DATA_TYPES[type_match.group(1).upper()]
+            type_size: str = '' if type_name in UNSIZED_DATA_TYPES else (type_match.group(2) or '')
+            # identity columns must be integers
+            if column.identity not in (None, Identity.SEQUENCE) and type_name == 'NUMERIC' and \
+                    re.fullmatch(r"(\(\s*\d+\s*(,\s*0\s*)?\))?", type_size):
+                type_name, type_size = 'BIGINT', ''
+            data_type = f"{type_name}{type_size}{type_match.group(3)}"
+
+        if virtual_match:
+            if column.default_value is not None or column.identity is not None:
+                diagnostics.error('virtual_column_default', f"Virtual column {table.name}.{column.name} can't have "
+                                                            f"default value or identity", table.name, column.name)
+            data_type = f"{data_type} generated always as {virtual_match.group(2)} stored"
+        return data_type
+
+    @staticmethod
+    def build_column_definition(table: Table, column: TableColumn, name_width: int = COLUMN_NAME_MIN_WIDTH,
+                                type_width: int = DATA_TYPE_MIN_WIDTH):
+        """
+        :param name_width: width the column name is padded to (see "build_padding_widths")
+        :param type_width: width the data type is padded to
+        :return: definition of the column, as written in "create table"
+        """
+        data_type: str = PostgreSQL.convert_data_type(table, column)
+        definition_parts: list[str] = [column.name.ljust(name_width), ' ', data_type.ljust(type_width), ' ']
+        if column.default_value is not None:
+            definition_parts.append(f"default {column.default_value} ")
+
+        # identity by sequence is created by separate queries (see "build_sequence_queries")
+        identity_options: str = PostgreSQL.build_identity_cache(table, column)
+        identity_options = f"({identity_options}) " if identity_options else ''
+        if column.identity == Identity.ALWAYS:
+            definition_parts.append(f"generated always as identity {identity_options}")
+        elif column.identity in (Identity.DEFAULT, Identity.DEFAULT_ON_NULL):
+            if column.identity == Identity.DEFAULT_ON_NULL:
+                diagnostics.warning('unsupported_identity', f"Identity 'default on null' of {table.name}.{column.name} is "
+                                                            f"not supported by PostgreSQL, it is created as 'by default' "
+                                                            f"(inserting null is an error)", table.name, column.name)
+            definition_parts.append(f"generated by default as identity {identity_options}")
+
+        if not column.is_nullable:
+            definition_parts.append("not null ")
+
+        if PostgreSQL.is_nested_column(column):
+            diagnostics.warning('unsupported_nested_table', f"Nested table {table.name}.{column.name} is not supported "
+                                                            f"by PostgreSQL, it is created as regular column of its type",
+                                table.name, column.name)
+        elif column.constraint is not None:
+            definition_parts.append(f"{column.constraint} ")
+        return ''.join(definition_parts)
+
+    @staticmethod
+    def build_sequence_queries(table: Table, column: TableColumn):
+        """
+        :return: query creating the sequence of identity column ('seq'), and query dropping it
+        """
+        sequence_name = f"SEQ_{table.name}_{column.name}"
+        sequence_query = f"create sequence {sequence_name} {PostgreSQL.build_identity_cache(table, column)};\n" \
+                         f"alter table {table.name} alter column {column.name} set default nextval('{sequence_name}');\n"
+        return sequence_query, f"drop sequence {sequence_name};\n"
+
+    @staticmethod
+    def create_ddl_queries(table: Table):
+        index_queries: list = []
+        comment_queries: list = []
+        sequences_queries: list = []
+        # lists to return
+        drop_seq_queries: list = []
+        fk_queries: list = []
+        fk_drop_queries: list = []
+        create_table_queries: list = []
+        drop_table_queries: list = []
+        # in load optimized order ("deferred_constraints") the indexes and unique constraints are created after the data
+        # is inserted, together with the foreign keys
+        constraint_queries: list = fk_queries if Config.is_deferred_constraints else create_table_queries
+        table_fk_queries: list = []
+
+        name_width, type_width = PostgreSQL.build_padding_widths(table)
+        columns_definitions: list[str] = []
+        for column in table.columns:
+            if column.data_type is None:
+                diagnostics.error('missing_data_type', f"Error: the column {table.name}.{column.name} does not have a type",
+                                  table.name, column.name)
+            columns_definitions.append(f"\t{PostgreSQL.build_column_definition(table, column, name_width, type_width)}")
+
+            if column.identity == Identity.SEQUENCE:
+                sequence_query, drop_seq_query = PostgreSQL.build_sequence_queries(table, column)
+                sequences_queries.append(sequence_query)
+                drop_seq_queries.append(drop_seq_query)
+
+            if column.is_indexed:
+                if column.constraint is not None and any(x in column.constraint.lower() for x in ["unique", 'primary key']):
+                    diagnostics.warning('indexed_key_column', f"Column {table.name}.{column.name} is already "
+                                        f"Unique/Primary-key and cannot be indexed", table.name, column.name)
+                index_queries.append(f"create index IDX_{table.name}__{column.name} on {table.name} ({column.name});\n")
+
+            if column.comment is not None:
+                comment_queries.append(PostgreSQL.build_comment_query(table, column))
+
+            if column.foreign_key is not None:
+                fk_query, fk_drop_query = PostgreSQL.build_fk_queries(table, column)
+                table_fk_queries.append(fk_query)
+                fk_drop_queries.append(fk_drop_query)
+
+        create_table_queries.append(''.join([f"create table {table.name} (\n", ',\n'.join(columns_definitions), "\n);\n"]))
+        constraint_queries.extend(index_queries)
+        if table.comment is not None:
+            create_table_queries.append(f"comment on table {table.name} is '{table.comment}';\n")
+        for multi_unique_constraint in table.multi_columns_unique:
+            multi_unique_query, multi_unique_drop_query = PostgreSQL.build_multi_unique_queries(table, multi_unique_constraint)
+            constraint_queries.append(multi_unique_query)
+            fk_drop_queries.append(multi_unique_drop_query)
+        fk_queries.extend(table_fk_queries)
+        create_table_queries.extend(comment_queries)
+        create_table_queries.extend(sequences_queries)
+        create_table_queries.append('\n\n')
+
+        # indexes, identity sequences and comments are dropped with the table
+        drop_table_queries.append(f"drop table {table.name};\n")
+
+        return drop_seq_queries, fk_queries, fk_drop_queries, create_table_queries, drop_table_queries
@@ -0,0 +1,96 @@
+# this file is used to measure each stage of the run, the report is written with "--profile"
+import contextlib
+import json
+import sys
+import time
+
+
+def peak_rss_mb():
+    """
+    :return: peak resident memory of this process in MB, None if not available (Windows)
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports in KB, macOS in bytes
+    return round(peak_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Profiler:
+    """
+    collect the time, counters and memory of each stage of the run.
+    a stage can be entered more than once (for example once for each sheet), its time is summed
+    """
+    def __init__(self):
+        self.stages: dict[str, dict] = {}
+        self.active_stages: list[str] = []
+        self.start_time: float = time.perf_counter()
+
+    @contextlib.contextmanager
+    def stage(self, stage_name: str):
+        stage: dict = self.stages.setdefault(stage_name, {'seconds': 0.0, 'calls': 0, 'counters': {}})
+        self.active_stages.append(stage_name)
+        start_time: float = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage['seconds'] += time.perf_counter() - start_time
+            stage['calls'] += 1
+            # the peak is of the whole process, until the end of the stage
+            stage['peak_rss_mb'] = peak_rss_mb()
+            self.active_stages.pop()
+
+    def count(self, counter_name: str, amount: int = 1):
+        """
+        add to a counter of the current stage (the innermost one, if stages are nested)
+        """
+        stage_name: str = self.active_stages[-1] if self.active_stages else 'other'
+        stage: dict = self.stages.setdefault(stage_name, {'seconds': 0.0, 'calls': 0, 'counters': {}})
+        stage['counters'][counter_name] = stage['counters'].get(counter_name, 0) + amount
+
+    def pop_counters(self):
+        """
+        :return: the counters of all the stages summed by name, which are removed (used by worker processes to return
+                 them with the results)
+        """
+        counters: dict = {}
+        for stage in self.stages.values():
+            for counter_name, amount in stage['counters'].items():
+                counters[counter_name] = counters.get(counter_name, 0) + amount
+            stage['counters'] = {}
+        return counters
+
+    def write_report(self, report_path, cprofile=None, cprofile_path=None, hot_functions_count: int = 30):
+        """
+        write the measurements into json file
+        :param report_path: path of the json report
+        :param cprofile: "cProfile.Profile" of the run, if profiled with cProfile
+        :param cprofile_path: path to dump the cProfile statistics into (can be opened with "pstats" or "snakeviz")
+        :param hot_functions_count: number of functions (with most time) from cProfile added to the report
+        """
+        report: dict = {'total_seconds': round(time.perf_counter() - self.start_time, 4),
+                        'peak_rss_mb': peak_rss_mb(), 'stages': {}}
+        for stage_name, stage in self.stages.items():
+            report['stages'][stage_name] = {**stage, 'seconds': round(stage['seconds'], 4)}
+
+        if cprofile is not None:
+            import pstats
+            cprofile.dump_stats(str(cprofile_path))
+            statistics = pstats.Stats(cprofile)
+            hot_functions: list[dict] = []
+            # each function is (file, line, name) : (primitive calls, calls, self time, cumulative time, callers)
+            for (file_name, line, function_name), (_, calls, self_time, cumulative_time, _) in \
+                    sorted(statistics.stats.items(), key=lambda item: item[1][2], reverse=True)[:hot_functions_count]:
+                hot_functions.append({'function': f"{file_name}:{line}({function_name})", 'calls': calls,
+                                      'self_seconds': round(self_time, 4),
+                                      'cumulative_seconds': round(cumulative_time, 4)})
+            report['hot_functions'] = hot_functions
+            report['cprofile_dump'] = str(cprofile_path)
+
+        with open(report_path, 'w', encoding='utf-8') as report_file:
+            json.dump(report, report_file, indent=4)
+
+
+profiler = Profiler()
@@ -0,0 +1,358 @@
+# this file is used to write the created queries into the output files while they are being created
+import gzip
+import hashlib
+import io
+import json
+import pathlib
+import shutil
+import tempfile
+
+from config import Config
+from definitions import QueryType
+from diagnostics import diagnostics
+from logger import logger
+from profiler import profiler
+
+# size of the write buffer of each file
+WRITE_BUFFER_SIZE: int = 1024 * 1024
+# written after each query in the spools when the output files are split, so the queries can be read back one by one
+# (the cells of xlsx file can't contain this character)
+QUERY_SEPARATOR: str = '\0'
+
+
+def iter_separated_queries(spool_file):
+    """
+    :param spool_file: temporary file of queries written with "QUERY_SEPARATOR" after each one
+    :return: generator of the queries in the file
+    """
+    spool_file.seek(0)
+    remainder: str = ''
+    while True:
+        chunk: str = spool_file.read(WRITE_BUFFER_SIZE)
+        if not chunk:
+            break
+        queries: list[str] = (remainder + chunk).split(QUERY_SEPARATOR)
+        remainder = queries.pop()
+        yield from queries
+
+
+class QueriesSpool:
+    """
+    keep queries of one part of an output file in a temporary file, until the whole output file can be written
+    """
+    def __init__(self, is_separated: bool = False):
+        self.spool_file = tempfile.TemporaryFile('w+', encoding='utf-8', buffering=WRITE_BUFFER_SIZE,
+                                                 dir=Config.output_dir_path)
+        self.is_separated = is_separated
+
+    def write(self, query: str):
+        self.spool_file.write(query)
+        if self.is_separated:
+            self.spool_file.write(QUERY_SEPARATOR)
+
+    def copy_to(self, output_file):
+        if self.is_separated:
+            for query in iter_separated_queries(self.spool_file):
+                output_file.write_query(query)
+        else:
+            self.spool_file.seek(0)
+            shutil.copyfileobj(self.spool_file, output_file, WRITE_BUFFER_SIZE)
+
+    def close(self):
+        self.spool_file.close()
+
+
+class ReversedQueriesSpool:
+    """
+    keep queries of one part of an output file, to be written in reversed order.
+    queries are kept in memory up to "segment_size", then written reversed into a temporary segment file.
+    the segments files are copied in reversed order, so the whole part is reversed without holding it in memory
+    """
+    def __init__(self, segment_size: int = 10000, is_separated: bool = False):
+        self.segment_size = segment_size
+        self.segment: list[str] = []
+        self.segments_files: list = []
+        self.is_separated = is_separated
+
+    def write(self, query: str):
+        self.segment.append(query)
+        if len(self.segment) >= self.segment_size:
+            segment_file = tempfile.TemporaryFile('w+', encoding='utf-8', buffering=WRITE_BUFFER_SIZE,
+                                                  dir=Config.output_dir_path)
+            for segment_query in reversed(self.segment):
+                segment_file.write(segment_query)
+                if self.is_separated:
+                    segment_file.write(QUERY_SEPARATOR)
+            self.segments_files.append(segment_file)
+            self.segment = []
+
+    def copy_to(self, output_file):
+        if self.is_separated:
+            for query in reversed(self.segment):
+                output_file.write_query(query)
+            for segment_file in reversed(self.segments_files):
+                for query in iter_separated_queries(segment_file):
+                    output_file.write_query(query)
+            return
+        output_file.writelines(reversed(self.segment))
+        for segment_file in reversed(self.segments_files):
+            segment_file.seek(0)
+            shutil.copyfileobj(segment_file, output_file, WRITE_BUFFER_SIZE)
+
+    def close(self):
+        for segment_file in self.segments_files:
+            segment_file.close()
+
+
+class HashingFile(io.RawIOBase):
+    """
+    binary file computing the size and sha256 of the bytes written into it
+    """
+    def __init__(self, file_path: pathlib.Path):
+        super().__init__()
+        self.disk_file = open(file_path, 'wb')
+        self.content_hash = hashlib.sha256()
+        self.size: int = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.content_hash.update(data)
+        self.size += len(data)
+        return self.disk_file.write(data)
+
+    def close(self):
+        if not self.closed:
+            self.disk_file.close()
+        super().close()
+
+
+class OutputFile:
+    """
+    output file written as one file, or split between queries into numbered parts (by "split_output_bytes" or
+    "split_output_statements"), each part ending with commit. the files are compressed with gzip if
+    "is_compressed_output". each file is written into temporary file, which replaces the file only when it is complete
+    """
+    def __init__(self, file_path: pathlib.Path, header: str = '', footer: str = ''):
+        """
+        :param file_path: path of the file, the parts are named by it with the part number
+        :param header: written at the start of each part
+        :param footer: written at the end of the file (the parts of split file end with commit)
+        """
+        self.file_path = file_path
+        self.header = header
+        self.footer = footer
+        self.is_split: bool = bool(Config.split_output_bytes or Config.split_output_statements)
+        # name, size, sha256 and number of statements of each written file
+        self.parts: list[dict] = []
+        self.text_file = None
+        self.opened_files: list = []
+        self.hashing_file = None
+        self.temp_path = None
+        self.part_bytes: int = 0
+        self.part_statements: int = 0
+
+    def part_path(self, part_number: int):
+        """
+        :param part_number: number of the part (from 1), not used if the file is not split
+        :return: path of the file or the part
+        """
+        suffix: str = self.file_path.suffix + ('.gz' if Config.is_compressed_output else '')
+        if not self.is_split:
+            return self.file_path.with_suffix(suffix)
+        return self.file_path.with_name(f"{self.file_path.stem}_part_{part_number:03d}{suffix}")
+
+    def open_part(self):
+        part_path = self.part_path(len(self.parts) + 1)
+        self.temp_path = part_path.with_name(f"{part_path.name}.tmp")
+        self.hashing_file = HashingFile(self.temp_path)
+        binary_file = io.BufferedWriter(self.hashing_file, WRITE_BUFFER_SIZE)
+        self.opened_files = [binary_file]
+        if Config.is_compressed_output:
+            # without name and time in the gzip header, the same content always has the same checksum
+            binary_file = gzip.GzipFile(filename='', mode='wb', fileobj=binary_file, mtime=0)
+            self.opened_files.insert(0, binary_file)
+        self.text_file = io.TextIOWrapper(binary_file, encoding='utf-8')
+        self.opened_files.insert(0, self.text_file)
+        self.parts.append({'file': part_path.name, 'statements': 0})
+        self.part_bytes = self.part_statements = 0
+        self.write(self.header)
+
+    def close_part(self, is_last_part: bool):
+        if self.is_split:
+            self.write(Config.sql_type_config.commit_query)
+        elif is_last_part:
+            self.write(self.footer)
+        # the gzip file doesn't close the file it writes into, so each file is closed
+        for opened_file in self.opened_files:
+            opened_file.close()
+        self.parts[-1].update({'bytes': self.hashing_file.size, 'sha256': self.hashing_file.content_hash.hexdigest()})
+        self.temp_path.replace(pathlib.Path(self.file_path.parent, self.parts[-1]['file']))
+
+    def write(self, text: str):
+        self.text_file.write(text)
+        self.part_bytes += len(text) if text.isascii() else len(text.encode('utf-8'))
+
+    def writelines(self, texts):
+        for text in texts:
+            self.write(text)
+
+    def write_query(self, query: str):
+        """
+        write a query, into the next part if the current one reached the size or number of statements
+        :param query: one or more complete statements, or empty lines between tables
+        """
+        is_statement: bool = not query.isspace()
+        if self.is_split and is_statement and self.part_statements > 0:
+            # the part ends with commit, which is counted in its size as well
+            query_bytes: int = (len(query) if query.isascii() else len(query.encode('utf-8'))) + \
+                len(Config.sql_type_config.commit_query)
+            if (Config.split_output_bytes and self.part_bytes + query_bytes > Config.split_output_bytes) or \
+                    (Config.split_output_statements and self.part_statements >= Config.split_output_statements):
+                self.close_part(is_last_part=False)
+                self.open_part()
+        self.write(query)
+        if is_statement:
+            self.part_statements += 1
+            self.parts[-1]['statements'] += 1
+
+    def remove_stale_files(self):
+        """
+        remove parts (or the whole file) written by previous runs and not by this one
+        """
+        written_names: set = {part['file'] for part in self.parts}
+        stale_paths: list = [self.file_path, self.file_path.with_suffix(f"{self.file_path.suffix}.gz")]
+        stale_paths.extend(self.file_path.parent.glob(f"{self.file_path.stem}_part_*{self.file_path.suffix}*"))
+        for stale_path in stale_paths:
+            if stale_path.name not in written_names and stale_path.suffix != '.tmp' and stale_path.exists():
+                stale_path.unlink()
+
+    def __enter__(self):
+        self.open_part()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close_part(is_last_part=True)
+            self.remove_stale_files()
+        else:
+            for opened_file in self.opened_files:
+                opened_file.close()
+            self.temp_path.unlink()
+
+
+class QueriesFilesWriter:
+    """
+    write the queries into the output files (queries file and drop file) while they are being created.
+    each part of the files is kept aside until closing, since the queries of the different parts are created mixed
+    """
+    def __init__(self, queries_file_path=None, drops_file_path=None):
+        # the output files of the config are used by default
+        self.queries_file_path = queries_file_path or Config.output_queries_file
+        self.drops_file_path = drops_file_path or Config.output_drops_file
+        self.spools: dict = {}
+        self.queries_counts: dict = {query_type: 0 for query_type in QueryType}
+        # the written files, as listed by "OutputFile.parts"
+        self.queries_parts: list[dict] = []
+        self.drops_parts: list[dict] = []
+
+    def __enter__(self):
+        Config.output_dir_path.mkdir(exist_ok=True)
+        # split files are written query by query, so the spools keep the boundaries between the queries
+        is_separated: bool = bool(Config.split_output_bytes or Config.split_output_statements)
+        for query_type in (QueryType.CREATE_TABLE, QueryType.FK, QueryType.INSERT):
+            self.spools[query_type] = QueriesSpool(is_separated=is_separated)
+        # the drops are written in reversed order of creation
+        for query_type in (QueryType.DROP_TABLE, QueryType.FK_DROP, QueryType.DELETE):
+            self.spools[query_type] = ReversedQueriesSpool(is_separated=is_separated)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            # nothing is written in case of an error while creating the queries, or fatal problems in the workbook
+            if exc_type is None:
+                diagnostics.exit_on_errors()
+                self.write_files()
+        finally:
+            for spool in self.spools.values():
+                spool.close()
+
+    def write(self, query_type: QueryType, query: str):
+        self.spools[query_type].write(query)
+        self.queries_counts[query_type] += 1
+
+    def extend(self, query_type: QueryType, queries):
+        for query in queries:
+            self.spools[query_type].write(query)
+            self.queries_counts[query_type] += 1
+
+    def write_queries(self, typed_queries):
+        """
+        :param typed_queries: iterable of (QueryType, query), as created by "iter_ddl_queries" or "iter_dml_block_queries"
+        """
+        for query_type, query in typed_queries:
+            self.spools[query_type].write(query)
+            self.queries_counts[query_type] += 1
+
+    def write_files(self):
+        with profiler.stage('write_files'):
+            self.write_queries_file()
+            self.write_drops_file()
+            # counted queries include the empty lines between tables
+            for query_type, queries_count in self.queries_counts.items():
+                profiler.count(f"{query_type.value}_statements", queries_count)
+            profiler.count('bytes_written', sum(part['bytes'] for part in self.queries_parts + self.drops_parts))
+            if Config.split_output_bytes or Config.split_output_statements or Config.is_compressed_output:
+                self.write_manifest()
+            else:
+                # the manifest of a previous run lists parts which were removed
+                self.manifest_path().unlink(missing_ok=True)
+
+        logger.debug(f"content has been written into {self.queries_file_path.parent}")
+
+    def write_queries_file(self):
+        # Write all updates into sql file
+        with OutputFile(self.queries_file_path, Config.sql_type_config.file_header_extra,
+                        Config.sql_type_config.commit_query) as queries_file:
+            # Write the ddl queries created in this python
+            queries_file.write('\n-------------------------- Creating tables with their relevant information --------------------------\n')
+            self.spools[QueryType.CREATE_TABLE].copy_to(queries_file)
+            if Config.is_deferred_constraints:
+                # load optimized order, the inserted rows don't maintain the indexes and constraints
+                queries_file.write('\n-------------------------- Inserting data to tables --------------------------\n')
+                self.spools[QueryType.INSERT].copy_to(queries_file)
+                queries_file.write('\n----------------------- Creating indexes, constraints and Foreign Keys -----------------------\n')
+                self.spools[QueryType.FK].copy_to(queries_file)
+            else:
+                queries_file.write('\n----------------------------------- Creating Foreign Keys -----------------------------------\n')
+                self.spools[QueryType.FK].copy_to(queries_file)
+                queries_file.write('\n-------------------------- Inserting data to tables --------------------------\n')
+                self.spools[QueryType.INSERT].copy_to(queries_file)
+        self.queries_parts = queries_file.parts
+
+    def write_drops_file(self):
+        # write all drops into sql drop file
+        with OutputFile(self.drops_file_path) as drops_file:
+            # Write the ddl drops created in this python, and dml deletes for inserted data
+            drops_file.write('\n\n----------------- Dropping Foreign Keys and other constraints -----------------\n')
+            self.spools[QueryType.FK_DROP].copy_to(drops_file)
+            drops_file.write("\n----------------- Deleting data added to existing table from previous version -----------------")
+            self.spools[QueryType.DELETE].copy_to(drops_file)
+            drops_file.write('\n----------------- Dropping Tables and sequences -----------------\n')
+            self.spools[QueryType.DROP_TABLE].copy_to(drops_file)
+        self.drops_parts = drops_file.parts
+
+    def manifest_path(self):
+        """
+        :return: path of the manifest of the split or compressed output files
+        """
+        return self.queries_file_path.with_name(f"{self.queries_file_path.stem}_manifest.json")
+
+    def write_manifest(self):
+        """
+        list the written files (in the order they should run) with their sizes and checksums, in json file
+        """
+        manifest: dict = {'queries_files': self.queries_parts, 'drops_files': self.drops_parts}
+        with open(self.manifest_path(), 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=4)
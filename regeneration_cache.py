@@ -0,0 +1,133 @@
+# this file is used to reuse queries created in previous runs, for tables which didn't change since then
+import hashlib
+import pathlib
+import pickle
+
+from config import Config
+from dependency_graph import sort_tables_by_dependencies
+from diagnostics import diagnostics
+from logger import logger
+from xlsx2sql import *
+
+# change it when the created queries change, so queries cached by previous versions are not used
+CACHE_VERSION: int = 7
+
+
+def block_cells_text(block_raw, first_row: int, last_row: int, columns_count: int):
+    """
+    :param block_raw: the matrix containing the table
+    :param first_row: first row of the table
+    :param last_row: last row of the table (inclusive)
+    :param columns_count: number of columns (from column 1) of the table
+    :return: text of all the cells of the table, the same no matter how wide the matrix is
+    """
+    import numpy as np
+
+    cells = np.full((last_row - first_row + 1, columns_count), 'nan', dtype=object)
+    available_columns: int = min(columns_count, block_raw.shape[1] - 1)
+    cells[:, :available_columns] = block_raw[first_row:last_row + 1, 1:available_columns + 1]
+    return '\x1f'.join(cells.ravel().tolist())
+
+
+def indexed_block_cells_text(block_raw, block: Block):
+    """
+    :param block_raw: the matrix containing the table
+    :param block: location of the table in the matrix
+    :return: text of the cells the table is created from (and the row and column ending the table)
+    """
+    columns_count: int = block.width + 1 if block.block_type == 'dml' else block.width
+    return block_cells_text(block_raw, block.marker_row, block.data_end_row, columns_count)
+
+
+def create_table_queries(block_raw, block: Block):
+    """
+    :return: the parsed "Table", and list of its (QueryType, query)
+    """
+    table: Table = create_ddl_table(block_raw, block.marker_row)
+    return table, list(iter_ddl_queries([table]))
+
+
+class RegenerationCache:
+    """
+    cache on disk of the queries created for each table, by the hash of the table's cells.
+    the queries of a table are created again only if its cells (or the configuration) changed
+    """
+    def __init__(self):
+        self.cache_dir = pathlib.Path(Config.output_dir_path, "cache", Config.input_file_relative_path.stem)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # the created queries depend on the configuration as well, so it is part of each hash
+        config_values = sorted((key, value) for key, value in Config.export_config().items()
+                               if isinstance(value, (bool, int, float, str)) or value is None)
+        self.config_text: str = f"{CACHE_VERSION}\x1e{Config.sql_type_config.__class__.__name__}\x1e{config_values}"
+        self.used_hashes: set[str] = set()
+        self.reused_count: int = 0
+        self.created_count: int = 0
+        # DDL queries are written at the end, ordered by the foreign keys of the tables
+        self.ddl_tables_queries: list[tuple] = []
+
+    def get_queries(self, block_type: str, cells_text: str, create_queries):
+        """
+        :param block_type: 'ddl' or 'dml'
+        :param cells_text: text of the table's cells
+        :param create_queries: function creating the queries of the table, used when they are not in the cache
+        :return: the value returned by "create_queries": list of (QueryType, query) of the table for DML table,
+                 and ("Table", list of (QueryType, query)) for DDL table
+        """
+        block_hash: str = hashlib.sha256(f"{self.config_text}\x1e{block_type}\x1e{cells_text}".encode('utf-8')).hexdigest()
+        self.used_hashes.add(block_hash)
+        cache_file_path = pathlib.Path(self.cache_dir, f"{block_hash}.pickle")
+        if cache_file_path.exists():
+            self.reused_count += 1
+            with open(cache_file_path, 'rb') as cache_file:
+                typed_queries, diagnostics_entries = pickle.load(cache_file)
+            # the problems of the table are reported in each run, not only when it is created
+            diagnostics.replay(diagnostics_entries)
+            return typed_queries
+
+        self.created_count += 1
+        diagnostics_mark: int = diagnostics.mark()
+        typed_queries = create_queries()
+        # written to temporary file first, so a stopped run doesn't leave partial cache file
+        temp_file_path = cache_file_path.with_suffix('.tmp')
+        with open(temp_file_path, 'wb') as cache_file:
+            pickle.dump((typed_queries, diagnostics.entries_since(diagnostics_mark)), cache_file,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        temp_file_path.replace(cache_file_path)
+        return typed_queries
+
+    def iter_sheet_queries(self, sheet: Sheet):
+        """
+        :param sheet: DDL or DML "Sheet", either loaded into memory or streamed
+        :return: generator of (QueryType, query) of all the tables in DML sheet,
+                 the queries of DDL sheet are kept until "iter_ddl_queries"
+        """
+        if sheet.sheet_name.startswith('ddl_'):
+            for block_raw, block in iter_sheet_indexed_blocks(sheet, 'ddl'):
+                self.ddl_tables_queries.append(self.get_queries('ddl', indexed_block_cells_text(block_raw, block),
+                                                                lambda: create_table_queries(block_raw, block)))
+        elif sheet.sheet_name.startswith('dml_'):
+            for block_raw, block in iter_sheet_indexed_blocks(sheet, 'dml'):
+                # the delete queries depend on the key of the table from the DDL sheets
+                cells_text: str = f"{indexed_block_cells_text(block_raw, block)}\x1e{Config.tables_keys.get(block.table_name)}"
+                yield from self.get_queries('dml', cells_text,
+                                            lambda: list(iter_dml_block_queries(block_raw, block)))
+
+    def iter_ddl_queries(self):
+        """
+        :return: generator of (QueryType, query) of all the DDL tables, ordered by "sort_tables_by_dependencies"
+        """
+        tables_queries: dict = {id(table): typed_queries for table, typed_queries in self.ddl_tables_queries}
+        for table in sort_tables_by_dependencies([table for table, _ in self.ddl_tables_queries]):
+            yield from tables_queries[id(table)]
+
+    def evict_stale(self):
+        """
+        delete cached queries of tables which are no longer in the workbook (or changed), call only after a full run
+        """
+        evicted_count: int = 0
+        for cache_file_path in self.cache_dir.glob('*.pickle'):
+            if cache_file_path.stem not in self.used_hashes:
+                cache_file_path.unlink()
+                evicted_count += 1
+        logger.debug(f"cache: {self.reused_count} tables reused, {self.created_count} tables created, "
+                      f"{evicted_count} stale tables evicted")
@@ -0,0 +1,171 @@
+# this file is used to create queries altering the schema of previous version of the workbook into the current one,
+# instead of dropping and creating the tables again
+import json
+import pathlib
+
+from config import Config
+from diagnostics import diagnostics
+from logger import logger
+from xlsx2sql import *
+
+# change it when the format of the snapshot file changes
+SNAPSHOT_VERSION: int = 2
+
+
+def schema_snapshot_path():
+    """
+    :return: path of the snapshot of the workbook in the config file, written with "--snapshot"
+    """
+    return pathlib.Path(Config.output_dir_path, f"schema_{Config.input_file_relative_path.stem}.json")
+
+
+def save_schema_snapshot(tables: list[Table], snapshot_path: pathlib.Path):
+    """
+    save the parsed DDL tables into json file, to be compared with later versions of the workbook
+    :param tables: list of "Table"(s) as created by "create_sheet_ddl_tables"
+    :param snapshot_path: path of the json snapshot file
+    """
+    def column_values(column: TableColumn):
+        values: dict = {key: getattr(column, key) for key in TableColumn.__slots__}
+        values['identity'] = column.identity.value if column.identity is not None else None
+        return values
+
+    snapshot: dict = {'version': SNAPSHOT_VERSION,
+                      'tables': [{**{key: getattr(table, key) for key in Table.__slots__},
+                                  'columns': [column_values(column) for column in table.columns]}
+                                 for table in tables]}
+    with open(snapshot_path, 'w', encoding='utf-8') as snapshot_file:
+        json.dump(snapshot, snapshot_file, indent=4)
+    logger.debug(f"schema snapshot of {len(tables)} tables has been written into {snapshot_path}")
+
+
+def load_schema_snapshot(snapshot_path: pathlib.Path):
+    """
+    :param snapshot_path: path of json snapshot file created by "save_schema_snapshot"
+    :return: list of the "Table"(s) in the snapshot
+    """
+    with open(snapshot_path, 'r', encoding='utf-8') as snapshot_file:
+        snapshot: dict = json.load(snapshot_file)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        logger.error(f"The schema snapshot {snapshot_path} was created by another version, create it again")
+        exit()
+
+    tables: list[Table] = []
+    for table_values in snapshot['tables']:
+        table: Table = Table()
+        for key, value in table_values.items():
+            if key != 'columns':
+                setattr(table, key, value)
+        for column_values in table_values['columns']:
+            table_column: TableColumn = TableColumn()
+            for key, value in column_values.items():
+                setattr(table_column, key, value)
+            if table_column.identity is not None:
+                table_column.identity = Identity(table_column.identity)
+            table.columns.append(table_column)
+        tables.append(table)
+    return tables
+
+
+def read_workbook_tables(xlsx_path: pathlib.Path):
+    """
+    :param xlsx_path: path of xlsx file
+    :return: list of the DDL "Table"(s) in all the DDL sheets of the workbook
+    """
+    tables: list[Table] = []
+    sheets = xlsx_to_streamed_sheets(xlsx_path) if Config.is_streaming_reader else xlsx_to_sheets(xlsx_path)
+    for sheet in sheets:
+        if sheet.sheet_name.startswith('ddl_'):
+            tables.extend(create_sheet_ddl_tables(sheet))
+    return tables
+
+
+def read_schema(schema_path: pathlib.Path):
+    """
+    :param schema_path: path of either xlsx file or json snapshot file
+    :return: list of the DDL "Table"(s) of the schema
+    """
+    if not schema_path.exists():
+        logger.error(f"The file {schema_path} does not exist")
+        exit()
+    if schema_path.suffix.lower() == '.json':
+        return load_schema_snapshot(schema_path)
+    return read_workbook_tables(schema_path)
+
+
+def create_schema_diff_queries(old_tables: list[Table], new_tables: list[Table]):
+    """
+    create the queries changing the schema from the old tables into the new ones, tables are matched by name.
+    all the constraints are dropped first and added last, so the order of the tables doesn't matter
+    :param old_tables: the tables of the previous version
+    :param new_tables: the tables of the current version
+    :return: queries dropping constraints, queries creating, dropping and altering tables, and queries adding constraints
+    """
+    drop_constraint_queries: list = []
+    alter_table_queries: list = []
+    add_constraint_queries: list = []
+
+    new_tables_names: set = {table.name for table in new_tables}
+    for old_table in old_tables:
+        if old_table.name not in new_tables_names:
+            drop_seq_queries, _, fk_drop_queries, _, drop_table_queries = Config.sql_type_config.create_ddl_queries(old_table)
+            drop_constraint_queries.extend(fk_drop_queries)
+            alter_table_queries.extend(drop_table_queries + drop_seq_queries)
+
+    old_tables_by_name: dict = {table.name: table for table in old_tables}
+    for new_table in new_tables:
+        old_table: Table = old_tables_by_name.get(new_table.name)
+        if old_table is None:
+            _, fk_queries, _, create_table_queries, _ = Config.sql_type_config.create_ddl_queries(new_table)
+            alter_table_queries.extend(create_table_queries)
+            add_constraint_queries.extend(fk_queries)
+        else:
+            table_drop_queries, table_alter_queries, table_add_queries = \
+                Config.sql_type_config.create_alter_queries(old_table, new_table)
+            drop_constraint_queries.extend(table_drop_queries)
+            alter_table_queries.extend(table_alter_queries)
+            add_constraint_queries.extend(table_add_queries)
+
+    return drop_constraint_queries, alter_table_queries, add_constraint_queries
+
+
+def write_alter_file(alter_file_path: pathlib.Path, drop_constraint_queries: list, alter_table_queries: list,
+                     add_constraint_queries: list):
+    """
+    write the queries created by "create_schema_diff_queries" into sql file
+    """
+    with open(alter_file_path, 'w', encoding='utf-8') as alter_file:
+        alter_file.write(Config.sql_type_config.file_header_extra)
+        alter_file.write('\n----------------- Dropping changed Foreign Keys, constraints and indexes -----------------\n')
+        alter_file.writelines(drop_constraint_queries)
+        alter_file.write('\n-------------------------- Altering tables --------------------------\n')
+        alter_file.writelines(alter_table_queries)
+        alter_file.write('\n----------------- Adding changed Foreign Keys, constraints, indexes and comments -----------------\n')
+        alter_file.writelines(add_constraint_queries)
+        # closes the transaction opened by the header (in PostgreSQL)
+        alter_file.write(Config.sql_type_config.commit_query)
+
+
+def diff_schemas(old_schema_path: pathlib.Path):
+    """
+    write the queries altering the schema of the old version into the workbook in the config file ("alter_" file),
+    and the queries reverting them ("alter_reverse_" file)
+    :param old_schema_path: path of the old version, either xlsx file or json snapshot file
+    :return: None
+    """
+    old_tables: list[Table] = read_schema(old_schema_path)
+    new_tables: list[Table] = read_workbook_tables(Config.input_file_absolute_path)
+    try:
+        alter_queries: tuple = create_schema_diff_queries(old_tables, new_tables)
+        # the reverse queries are the diff in the opposite direction, its problems were already reported by the diff
+        with diagnostics.muted():
+            reverse_queries: tuple = create_schema_diff_queries(new_tables, old_tables)
+    except NotImplementedError:
+        logger.error(f"Schema diff is not supported for {Config.dbms_type_str}")
+        exit()
+    diagnostics.exit_on_errors()
+
+    stem: str = Config.input_file_relative_path.stem
+    write_alter_file(pathlib.Path(Config.output_dir_path, f"alter_{stem}.sql"), *alter_queries)
+    write_alter_file(pathlib.Path(Config.output_dir_path, f"alter_reverse_{stem}.sql"), *reverse_queries)
+    logger.debug(f"schema diff from {old_schema_path} has been written into {Config.output_dir_path}")
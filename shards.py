@@ -0,0 +1,95 @@
+# this file is used to split the queries into independent scripts (shards), when running with "--shards"
+import contextlib
+import json
+import pathlib
+
+from config import Config
+from dependency_graph import build_dependency_graph, find_cycles, split_into_shards
+from logger import logger
+from queries_writer import QueriesFilesWriter
+from xlsx2sql import *
+
+
+def create_shard_writer(shard_name: str):
+    """
+    :param shard_name: suffix of the shard's files names
+    :return: "QueriesFilesWriter" of the shard's queries file and drops file
+    """
+    stem: str = Config.input_file_relative_path.stem
+    return QueriesFilesWriter(pathlib.Path(Config.output_dir_path, f"queries_{stem}_shard_{shard_name}.sql"),
+                              pathlib.Path(Config.output_dir_path, f"drops_{stem}_shard_{shard_name}.sql"))
+
+
+def iter_dml_blocks(sheets: list[Sheet], tables_positions: dict):
+    """
+    :param sheets: the sheets of the workbook
+    :param tables_positions: position of each DDL table, by its order of creation
+    :return: generator of (matrix, "Block") of all the DML tables. when the sheets are in memory, the tables are ordered
+             by "tables_positions" (so referenced tables are loaded first), and tables without DDL table are last
+    """
+    dml_blocks = (indexed_block for sheet in sheets if sheet.sheet_name.startswith('dml_')
+                  for indexed_block in iter_sheet_indexed_blocks(sheet, 'dml'))
+    if Config.is_streaming_reader:
+        # streamed tables can't be reordered, they are written by their order in the workbook
+        yield from dml_blocks
+    else:
+        yield from sorted(dml_blocks, key=lambda indexed_block: tables_positions.get(indexed_block[1].table_name,
+                                                                                     len(tables_positions)))
+
+
+def convert_into_shards(read_sheets, shards_count: int):
+    """
+    split the tables into groups without foreign keys between them (see "split_into_shards"), and write queries file
+    and drops file for each group, so the groups can be created and loaded in parallel sessions.
+    DML of tables which are not created by the workbook is written into another shard ("after"), to run after all the
+    other shards. the shards are listed in json manifest
+    :param read_sheets: function returning iterable of the workbook's "Sheet"(s), the workbook is read twice
+    :param shards_count: maximal number of shards
+    :return: None
+    """
+    tables: list[Table] = []
+    for sheet in read_sheets():
+        if sheet.sheet_name.startswith('ddl_'):
+            tables.extend(create_sheet_ddl_tables(sheet))
+
+    Config.tables_keys = create_tables_keys(tables)
+    shards: list = split_into_shards(tables, shards_count)
+    tables_shards: dict = {table.name: shard_i for shard_i, shard in enumerate(shards) for table in shard}
+    tables_positions: dict = {table.name: position
+                              for position, table in enumerate(table for shard in shards for table in shard)}
+
+    manifest: dict = {'run_order': "the shards have no foreign keys between them and can run in parallel sessions, "
+                                   "then after_shards (if exists). drops files run in the opposite order",
+                      'shards': [], 'after_shards': None,
+                      'cycles': find_cycles(build_dependency_graph(tables))}
+    with contextlib.ExitStack() as writers_stack:
+        writers: list[QueriesFilesWriter] = []
+        for shard_i, shard in enumerate(shards, start=1):
+            writer: QueriesFilesWriter = writers_stack.enter_context(create_shard_writer(str(shard_i)))
+            writer.write_queries(iter_ddl_queries(shard))
+            writers.append(writer)
+            manifest['shards'].append({'queries_file': writer.queries_file_path.name,
+                                       'drops_file': writer.drops_file_path.name,
+                                       'tables': [table.name for table in shard]})
+
+        after_writer = None
+        after_tables: list[str] = []
+        for block_raw, block in iter_dml_blocks(read_sheets(), tables_positions):
+            if block.table_name in tables_shards:
+                writer = writers[tables_shards[block.table_name]]
+            else:
+                if after_writer is None:
+                    after_writer = writers_stack.enter_context(create_shard_writer('after'))
+                writer = after_writer
+                after_tables.append(block.table_name)
+            writer.write_queries(iter_dml_block_queries(block_raw, block))
+
+        if after_writer is not None:
+            manifest['after_shards'] = {'queries_file': after_writer.queries_file_path.name,
+                                        'drops_file': after_writer.drops_file_path.name,
+                                        'tables': list(dict.fromkeys(after_tables))}
+
+    manifest_path = pathlib.Path(Config.output_dir_path, f"shards_{Config.input_file_relative_path.stem}.json")
+    with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4)
+    logger.debug(f"{len(shards)} shards have been written, their manifest is {manifest_path}")
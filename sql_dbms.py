@@ -1,15 +1,48 @@
 import abc
 
+from config import Config
+from definitions import Table, TableColumn
+from diagnostics import diagnostics
+
+# minimal widths of the columns names and types in "create table" (see "build_padding_widths")
+COLUMN_NAME_MIN_WIDTH: int = 40
+DATA_TYPE_MIN_WIDTH: int = 20
+# longer types (such as virtual columns expressions) are not aligned with, they would widen all the other columns
+DATA_TYPE_MAX_WIDTH: int = 30
+
+
+def unescape_quotes(value: str):
+    """
+    the cells are written as they are quoted in the insert queries, with escaped single quotes ('')
+    :param value: value of a cell, as returned by "slice_dml_values" (in xlsx2sql.py)
+    :return: the value as it is stored in the database, used when the values are not written as SQL literals
+             (direct execution, bulk load data files and "copy")
+    """
+    return value.replace("''", "'")
+
+
 # abstract class (interface) that is used to create SQL-specific subclasses
 # noinspection PyPep8Naming
 class SQL_DBMS(abc.ABC):
-    # enforce implementing properties and methods in subclassesF
+    # enforce implementing properties and methods in subclasses
     @property
     @abc.abstractmethod
     def reserved_keywords(self):
         raise NotImplementedError()
 
     file_header_extra = ''
+    # ends the queries file, and each part of split output file
+    commit_query: str = "\ncommit;\n/\n"
+    # formats of bulk load files supported by the DBMS (see "build_bulk_load_queries")
+    bulk_load_formats: tuple = ()
+    # DBMS loading each DML table by a single statement instead of insert queries (see "build_copy_query"), unless
+    # "copy_insert" is 'False' in the config file
+    is_copy_insert: bool = False
+    # cache option of identity column / sequence with 'nocache' in the workbook (see "build_identity_cache")
+    identity_nocache_option: str = 'nocache'
+    # ends the foreign key query with "fk_novalidate", the existing rows are checked by the second step, without
+    # locking the table against DML. DBMS supporting it should override this format
+    fk_novalidate_query: str = None
 
     @staticmethod
     @abc.abstractmethod
@@ -21,7 +54,139 @@ class SQL_DBMS(abc.ABC):
     def build_delete_query(table_name: str, columns_names: str, values: list):
         raise NotImplementedError()
 
+    @staticmethod
+    def build_values_insert_query(table_name: str, columns_names: str, values: list):
+        # "insert ... values" with the values as they are formatted, shared by DBMS implementing "build_insert_query"
+        return f"insert into {table_name} ({', '.join(columns_names)})\n\t\t values ({', '.join(values)});\n"
+
+    @staticmethod
+    def build_batch_insert_query(table_name: str, columns_names: list, values_list: list[list]):
+        # default is multi-row VALUES, DBMS without support for it should override this method
+        rows_values: str = ',\n\t\t\t'.join(f"({', '.join(values)})" for values in values_list)
+        return f"insert into {table_name} ({', '.join(columns_names)})\n\t\t values {rows_values};\n"
+
+    @staticmethod
+    def build_equality_delete_query(table_name: str, columns_names: str, values: list):
+        # compares each column with its formatted value, shared by DBMS implementing "build_delete_query"
+        delete_conditions: list = []
+        for column_name, value in zip(columns_names, values):
+            delete_conditions.append(f"{column_name} = {value}")
+
+        return f"delete from {table_name} where {' and '.join(delete_conditions)};\n"
+
+    @staticmethod
+    def build_key_delete_query(table_name: str, key_columns: list, keys_values: list[list]):
+        # delete rows by their keys, multiple columns key is compared as row value
+        if len(key_columns) == 1:
+            return f"delete from {table_name} where {key_columns[0]} in ({', '.join(key_values[0] for key_values in keys_values)});\n"
+        keys: str = ', '.join(f"({', '.join(key_values)})" for key_values in keys_values)
+        return f"delete from {table_name} where ({', '.join(key_columns)}) in ({keys});\n"
+
+    @staticmethod
+    def build_range_delete_query(table_name: str, key_column: str, first_value: str, last_value: str):
+        return f"delete from {table_name} where {key_column} between {first_value} and {last_value};\n"
+
+    @classmethod
+    def build_identity_cache(cls, table: Table, column: TableColumn):
+        """
+        :return: the cache clause of the identity column / sequence ('' for the default cache)
+        """
+        if column.cache is not None and column.cache.isdigit():
+            if int(column.cache) <= 0:
+                diagnostics.warning('wrong_cache', f"Cannot define cache smaller then 1 in {table.name}.{column.name}",
+                                    table.name, column.name)
+            else:
+                return 'cache ' + column.cache
+        elif column.cache == 'nocache':
+            return cls.identity_nocache_option
+        return ''
+
+    @staticmethod
+    def is_nested_column(column: TableColumn):
+        return column.constraint is not None and column.constraint.lower().startswith('nested')
+
+    @staticmethod
+    def build_comment_query(table: Table, column: TableColumn):
+        comment_query = f"comment on column {table.name}.{column.name} is '{column.comment}';\n"
+        if comment_query.count('\'') % 2 != 0:
+            diagnostics.error('unescaped_column_comment', f"table: {table.name}, column: {column.name} contains "
+                                                          f"non-escaped single quote", table.name, column.name)
+        return comment_query
+
+    @classmethod
+    def build_fk_queries(cls, table: Table, column: TableColumn):
+        """
+        :return: query adding the foreign key constraint of the column, and query dropping it
+        """
+        fk_constraint_name = f"FK_{table.name}__{column.name}"
+        # foreign_key in xlsx consist of 2 or 3 parts, separated by comma:
+        # first is table name, second is column name, and third is on delete [cascade]\[set null] if exist
+        fk_referenced = column.foreign_key.split(',')
+        if len(fk_referenced) < 2:
+            diagnostics.fatal('wrong_foreign_key', f"wrong number of arguments in: {table.name}.{column.name} ",
+                              table.name, column.name)
+            return '', ''
+        fk_query = f"alter table {table.name} add constraint {fk_constraint_name} \n" \
+                   f"\tforeign key ({column.name}) references {fk_referenced[0].strip()}({fk_referenced[1].strip()})"
+
+        if len(fk_referenced) > 2:
+            fk_query = f"{fk_query} on delete {fk_referenced[2].lower().strip()}"
+        if Config.is_fk_novalidate and cls.fk_novalidate_query is not None:
+            fk_query = fk_query + cls.fk_novalidate_query.format(table_name=table.name, constraint_name=fk_constraint_name)
+        else:
+            fk_query = f"{fk_query};\n"
+
+        fk_drop_query = f"alter table {table.name}\n\t\tdrop constraint {fk_constraint_name};\n"
+        return fk_query, fk_drop_query
+
+    @staticmethod
+    def build_multi_unique_queries(table: Table, multi_unique_constraint: str):
+        """
+        :param multi_unique_constraint: columns names of the unique constraint, separated by comma
+        :return: query adding the unique constraint, and query dropping it
+        """
+        constraint_name = '_'.join(multi_unique_constraint.split(','))
+        constraint_name = f"UNIQUE_{table.name}__{constraint_name}"
+        multi_unique_query = f"alter table {table.name}\n\t" \
+                             f"add constraint {constraint_name}\n\t" \
+                             f"unique ({multi_unique_constraint});\n"
+        return multi_unique_query, f"alter table {table.name}\n\tdrop constraint {constraint_name};\n"
+
     @staticmethod
     @abc.abstractmethod
     def create_ddl_queries():
         raise NotImplementedError()
+
+    @staticmethod
+    def build_padding_widths(table):
+        # the columns names and types of "create table" are aligned by the longest ones in the table,
+        # at least to the minimal widths (so tables with shorter names are written as before)
+        name_width: int = max([COLUMN_NAME_MIN_WIDTH] + [len(column.name) for column in table.columns])
+        type_width: int = max([DATA_TYPE_MIN_WIDTH] + [len(column.data_type) for column in table.columns
+                                                       if column.data_type and len(column.data_type) <= DATA_TYPE_MAX_WIDTH])
+        return name_width, type_width
+
+    @staticmethod
+    def build_bulk_load_queries(bulk_load_format: str, table_name: str, columns_names: list, data_file_name: str):
+        # used for large DML tables written into csv data file, DBMS supporting it should override this method
+        raise NotImplementedError()
+
+    @staticmethod
+    def build_copy_query(table_name: str, columns_names: list, columns_values: list[list]):
+        # used when "is_copy_insert", DBMS supporting it should override this method
+        raise NotImplementedError()
+
+    @staticmethod
+    def create_alter_queries(old_table, new_table):
+        # used by the schema diff ("--diff"), DBMS supporting it should override this method
+        raise NotImplementedError()
+
+    @staticmethod
+    def build_parameterized_insert_query(table_name: str, columns_names: list):
+        # used by the direct execution with DB-API "executemany", default is the "qmark" parameter style
+        return f"insert into {table_name} ({', '.join(columns_names)}) values ({', '.join(['?'] * len(columns_names))})"
+
+    @staticmethod
+    def connect(database: str):
+        # DB-API connection for the direct execution, DBMS supporting it should override this method
+        raise NotImplementedError()
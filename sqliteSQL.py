@@ -0,0 +1,125 @@
+# this page is specific for SQLite, mostly used to run and benchmark the direct execution ("--execute") locally.
+# SQLite is more limited than other DBMS, so some of the definitions are not supported and are ignored with warning.
+
+import abc
+import re
+import sqlite3
+
+from config import Config
+from definitions import Table
+from diagnostics import diagnostics
+from sql_dbms import SQL_DBMS
+
+class SQLiteSQL(SQL_DBMS, abc.ABC):
+    reserved_keywords: frozenset = frozenset(
+        {'ABORT', 'ACTION', 'ADD', 'AFTER', 'ALL', 'ALTER', 'ALWAYS', 'ANALYZE', 'AND', 'AS', 'ASC', 'ATTACH',
+         'AUTOINCREMENT', 'BEFORE', 'BEGIN', 'BETWEEN', 'BY', 'CASCADE', 'CASE', 'CAST', 'CHECK', 'COLLATE', 'COLUMN',
+         'COMMIT', 'CONFLICT', 'CONSTRAINT', 'CREATE', 'CROSS', 'CURRENT', 'CURRENT_DATE', 'CURRENT_TIME',
+         'CURRENT_TIMESTAMP', 'DATABASE', 'DEFAULT', 'DEFERRABLE', 'DEFERRED', 'DELETE', 'DESC', 'DETACH', 'DISTINCT',
+         'DO', 'DROP', 'EACH', 'ELSE', 'END', 'ESCAPE', 'EXCEPT', 'EXCLUDE', 'EXCLUSIVE', 'EXISTS', 'EXPLAIN', 'FAIL',
+         'FILTER', 'FIRST', 'FOLLOWING', 'FOR', 'FOREIGN', 'FROM', 'FULL', 'GENERATED', 'GLOB', 'GROUP', 'GROUPS',
+         'HAVING', 'IF', 'IGNORE', 'IMMEDIATE', 'IN', 'INDEX', 'INDEXED', 'INITIALLY', 'INNER', 'INSERT', 'INSTEAD',
+         'INTERSECT', 'INTO', 'IS', 'ISNULL', 'JOIN', 'KEY', 'LAST', 'LEFT', 'LIKE', 'LIMIT', 'MATCH', 'MATERIALIZED',
+         'NATURAL', 'NO', 'NOT', 'NOTHING', 'NOTNULL', 'NULL', 'NULLS', 'OF', 'OFFSET', 'ON', 'OR', 'ORDER', 'OTHERS',
+         'OUTER', 'OVER', 'PARTITION', 'PLAN', 'PRAGMA', 'PRECEDING', 'PRIMARY', 'QUERY', 'RAISE', 'RANGE',
+         'RECURSIVE', 'REFERENCES', 'REGEXP', 'REINDEX', 'RELEASE', 'RENAME', 'REPLACE', 'RESTRICT', 'RETURNING',
+         'RIGHT', 'ROLLBACK', 'ROW', 'ROWS', 'SAVEPOINT', 'SELECT', 'SET', 'TABLE', 'TEMP', 'TEMPORARY', 'THEN',
+         'TIES', 'TO', 'TRANSACTION', 'TRIGGER', 'UNBOUNDED', 'UNION', 'UNIQUE', 'UPDATE', 'USING', 'VACUUM',
+         'VALUES', 'VIEW', 'VIRTUAL', 'WHEN', 'WHERE', 'WINDOW', 'WITH', 'WITHOUT'})
+
+    @staticmethod
+    def build_insert_query(table_name: str, columns_names: str, values: list):
+        return SQL_DBMS.build_values_insert_query(table_name, columns_names, values)
+
+    @staticmethod
+    def build_delete_query(table_name: str, columns_names: str, values: list):
+        return SQL_DBMS.build_equality_delete_query(table_name, columns_names, values)
+
+    @staticmethod
+    def connect(database: str):
+        connection = sqlite3.connect(database)
+        # SQLite does not enforce foreign keys unless asked to
+        connection.execute("pragma foreign_keys = on")
+        return connection
+
+    @staticmethod
+    def create_ddl_queries(table: Table):
+        index_queries: list = []
+        # SQLite can't add foreign keys and constraints to existing table, so they are part of the create query
+        table_constraints: list = []
+        # lists to return
+        drop_seq_queries: list = []
+        fk_queries: list = []
+        fk_drop_queries: list = []
+        create_table_queries: list = []
+        drop_table_queries: list = []
+
+        name_width, type_width = SQLiteSQL.build_padding_widths(table)
+        columns_definitions: list = []
+        for column in table.columns:
+            if column.data_type is None:
+                diagnostics.error('missing_data_type', f"Error: the column {table.name}.{column.name} does not have a type",
+                                  table.name, column.name)
+            # length semantics (50 CHAR / 50 BYTE) are not supported by SQLite
+            data_type: str = re.sub(r"\(\s*(\d+)\s+(CHAR|BYTE)\s*\)", r"(\1)", column.data_type or '')
+            constraint: str = column.constraint or ''
+
+            if column.identity is not None:
+                # the only identity in SQLite is "integer primary key autoincrement"
+                if 'primary key' in constraint.lower():
+                    data_type = 'INTEGER'
+                    constraint = re.sub('primary key', 'primary key autoincrement', constraint, flags=re.IGNORECASE)
+                else:
+                    diagnostics.warning('unsupported_identity', f"Identity of non primary key column "
+                                                                f"{table.name}.{column.name} is not supported by SQLite",
+                                        table.name, column.name)
+
+            column_definition: str = f"\t{column.name.ljust(name_width)} {data_type.ljust(type_width)} "
+
+            if column.default_value is not None:
+                # SQLite allows expressions (other than literals) only inside parentheses
+                if re.fullmatch(r"'.*'|[-+]?\d+(\.\d+)?", column.default_value):
+                    column_definition = f"{column_definition}default {column.default_value} "
+                else:
+                    column_definition = f"{column_definition}default ({column.default_value}) "
+
+            if not column.is_nullable:
+                column_definition = f"{column_definition}not null "
+
+            if SQLiteSQL.is_nested_column(column):
+                diagnostics.warning('unsupported_nested_table', f"Nested table {table.name}.{column.name} is not "
+                                                                f"supported by SQLite", table.name, column.name)
+            elif constraint:
+                column_definition = f"{column_definition}{constraint} "
+
+            if column.foreign_key is not None:
+                fk_referenced = column.foreign_key.split(',')
+                if len(fk_referenced) < 2:
+                    diagnostics.fatal('wrong_foreign_key', f"wrong number of arguments in: {table.name}.{column.name} ",
+                                      table.name, column.name)
+                else:
+                    column_definition = f"{column_definition}references {fk_referenced[0].strip()}({fk_referenced[1].strip()}) "
+                if len(fk_referenced) > 2:
+                    column_definition = f"{column_definition}on delete {fk_referenced[2].lower().strip()} "
+
+            columns_definitions.append(column_definition)
+
+            if column.is_indexed:
+                index_query = f"create index IDX_{table.name}__{column.name} on {table.name} ({column.name});\n"
+                index_queries.append(index_query)
+
+        for multi_unique_constraint in table.multi_columns_unique:
+            constraint_name = '_'.join(multi_unique_constraint.split(','))
+            table_constraints.append(f"\tconstraint UNIQUE_{table.name}__{constraint_name} unique ({multi_unique_constraint})")
+
+        create_query = f"create table {table.name} (\n" + ',\n'.join(columns_definitions + table_constraints) + "\n);\n"
+
+        # SQLite has no comments on tables and columns, and indexes are dropped with their table
+        create_table_queries.append(create_query)
+        # in load optimized order ("deferred_constraints") the indexes are created after the data is inserted
+        (fk_queries if Config.is_deferred_constraints else create_table_queries).extend(index_queries)
+        create_table_queries.append('\n\n')
+
+        drop_table_queries.append(f"drop table {table.name};\n")
+
+        return drop_seq_queries, fk_queries, fk_drop_queries, create_table_queries, drop_table_queries
@@ -0,0 +1,15 @@
+
+
+----------------- Dropping Foreign Keys and other constraints -----------------
+alter table ADDRESS
+		drop constraint FK_ADDRESS__PERSON_ID;
+
+----------------- Deleting data added to existing table from previous version -----------------
+delete from ADDRESS where ID in (1, 2, 3);
+
+delete from PERSON where ID between 1 and 4;
+delete from PERSON where NAME = 'no key' and ID is null and NICKNAME is null;
+
+----------------- Dropping Tables and sequences -----------------
+drop table ADDRESS;
+drop table PERSON;
@@ -0,0 +1,23 @@
+
+
+----------------- Dropping Foreign Keys and other constraints -----------------
+alter table TEST1_TABLE_2
+		drop constraint FK_TEST1_TABLE_2__TEST_TABLE_1_ID;
+alter table TEST_TABLE_1
+	drop constraint UNIQUE_TEST_TABLE_1__SERIAL_NUM_NAME;
+alter table TEST_TABLE_1
+	drop constraint UNIQUE_TEST_TABLE_1__NAME_AGE;
+alter table TEST_TABLE_1
+		drop constraint FK_TEST_TABLE_1__TEST_TABLE;
+
+----------------- Deleting data added to existing table from previous version -----------------
+delete from TEST_TABLE where ID = 4 and FRUIT_NAME = 'Banana';
+delete from TEST_TABLE where ID = 3 and FRUIT_NAME = 'Orange';
+delete from TEST_TABLE where ID = 2 and FRUIT_NAME = 'Lemon';
+delete from TEST_TABLE where ID = 1 and FRUIT_NAME = 'Apple';
+
+----------------- Dropping Tables and sequences -----------------
+drop table TEST1_TABLE_2;
+drop table TEST_TABLE_1;
+drop sequence SEQ_TEST_TABLE_1_SERIAL_NUM;
+drop table TEST_TABLE;
@@ -0,0 +1,45 @@
+\set ON_ERROR_STOP on
+begin;
+
+-------------------------- Creating tables with their relevant information --------------------------
+create table PERSON (
+	ID                                       BIGINT               generated by default as identity (cache 20) not null Primary key ,
+	NAME                                     VARCHAR(50)          ,
+	NICKNAME                                 VARCHAR(50)          
+);
+create index IDX_PERSON__NAME on PERSON (NAME);
+comment on table PERSON is 'people''s table';
+comment on column PERSON.ID is 'the person''s id';
+comment on column PERSON.NICKNAME is 'nick name';
+
+
+create table ADDRESS (
+	ID                                       BIGINT               generated always as identity (cache 1) not null Primary key ,
+	PERSON_ID                                NUMERIC(10)          ,
+	STREET                                   VARCHAR(100)         
+);
+
+
+
+----------------------------------- Creating Foreign Keys -----------------------------------
+alter table ADDRESS add constraint FK_ADDRESS__PERSON_ID 
+	foreign key (PERSON_ID) references PERSON(ID) on delete set null;
+
+-------------------------- Inserting data to tables --------------------------
+insert into PERSON (NAME, ID, NICKNAME)
+		 values ('O''Brien', 1, null),
+			('D''Arcy', 2, 'Dee');
+insert into PERSON (NAME, ID, NICKNAME)
+		 values ('tab	here', 3, null),
+			('back\slash', 4, null);
+insert into PERSON (NAME, ID, NICKNAME)
+		 values ('no key', null, null);
+
+insert into ADDRESS (ID, PERSON_ID, STREET)
+		 values (1, 1, 'Main street'),
+			(2, null, null);
+insert into ADDRESS (ID, PERSON_ID, STREET)
+		 values (3, 2, null);
+
+
+commit;
@@ -0,0 +1,59 @@
+\set ON_ERROR_STOP on
+begin;
+
+-------------------------- Creating tables with their relevant information --------------------------
+create table TEST_TABLE (
+	ID                                       BIGINT               generated by default as identity (cache 1) not null Primary key ,
+	FRUIT_NAME                               VARCHAR(100)         default 'Banana' unique 
+);
+
+
+create table TEST_TABLE_1 (
+	ID                                       BIGINT               generated always as identity not null Primary key ,
+	TEST_TABLE                               NUMERIC(10,5)        not null Unique ,
+	SERIAL_NUM                               NUMERIC              not null ,
+	NAME                                     VARCHAR(100)         not null Unique ,
+	AGE                                      NUMERIC              check (AGE between 0 and 120) ,
+	FILENAME                                 VARCHAR(255)         ,
+	FILE_MIMETYPE                            VARCHAR(255)         ,
+	FILE_BLOB                                BYTEA                ,
+	ALL_NAMES                                NAME_LIST            default NAME_LIST() ,
+	BARCODE                                  VARCHAR(50) generated always as ('BARCODE_' || ID) stored not null Unique 
+);
+comment on table TEST_TABLE_1 is 'Test table comment';
+alter table TEST_TABLE_1
+	add constraint UNIQUE_TEST_TABLE_1__NAME_AGE
+	unique (NAME,AGE);
+alter table TEST_TABLE_1
+	add constraint UNIQUE_TEST_TABLE_1__SERIAL_NUM_NAME
+	unique (SERIAL_NUM,NAME);
+comment on column TEST_TABLE_1.TEST_TABLE is 'references TEST_TABLE table';
+comment on column TEST_TABLE_1.NAME is 'first + last name';
+comment on column TEST_TABLE_1.BARCODE is 'virtual column';
+create sequence SEQ_TEST_TABLE_1_SERIAL_NUM cache 10;
+alter table TEST_TABLE_1 alter column SERIAL_NUM set default nextval('SEQ_TEST_TABLE_1_SERIAL_NUM');
+
+
+create table TEST1_TABLE_2 (
+	ID                                       BIGINT               generated by default as identity not null Primary key ,
+	TEST_TABLE_1_ID                          NUMERIC              not null 
+);
+
+
+
+----------------------------------- Creating Foreign Keys -----------------------------------
+alter table TEST_TABLE_1 add constraint FK_TEST_TABLE_1__TEST_TABLE 
+	foreign key (TEST_TABLE) references TEST_TABLE(ID) on delete cascade;
+alter table TEST1_TABLE_2 add constraint FK_TEST1_TABLE_2__TEST_TABLE_1_ID 
+	foreign key (TEST_TABLE_1_ID) references TEST_TABLE_1(ID);
+
+-------------------------- Inserting data to tables --------------------------
+copy TEST_TABLE (ID, FRUIT_NAME) from stdin;
+1	Apple
+2	Lemon
+3	Orange
+4	Banana
+\.
+
+
+commit;
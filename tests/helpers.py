@@ -0,0 +1,149 @@
+# shared functions of the tests: each conversion runs "main.py" in a separate process, in a temporary directory,
+# since the configuration, the logger and the "generated" directory are global to the process
+import pathlib
+import subprocess
+import sys
+
+import yaml
+
+REPO_DIR = pathlib.Path(__file__).resolve().parent.parent
+TEST_XLSX_PATH = REPO_DIR / 'test.xlsx'
+GOLDEN_DIR = pathlib.Path(__file__).resolve().parent / 'golden'
+# header row of DDL table, as in "test.xlsx"
+DDL_HEADER: list = ['COLUMN_NAME', 'DATA_TYPE', 'NULLABLE', 'FK', 'IDENTITY', 'cache', 'constraint', 'Default', 'Index',
+                    'comments']
+# text cells which pandas reads as empty cells (except 'None'), all the readers must read them the same
+NA_TEXTS: tuple = ('None', 'NA', 'null', 'N/A')
+# files written next to the queries files which differ between runs
+VOLATILE_FILES_NAMES: frozenset = frozenset({'xlsx.log', 'diagnostics.json', 'profile.json', 'batch_summary.json'})
+
+
+def write_workbook(xlsx_path: pathlib.Path, sheets: dict):
+    """
+    :param xlsx_path: path of the created xlsx file
+    :param sheets: dictionary of sheet name to its rows, each row is list of cells values (None for empty cell)
+    :return: the path of the xlsx file
+    """
+    import openpyxl
+
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for sheet_name, rows in sheets.items():
+        worksheet = workbook.create_sheet(sheet_name)
+        for row in rows:
+            worksheet.append(row)
+    workbook.save(xlsx_path)
+    return xlsx_path
+
+
+def write_config(work_dir: pathlib.Path, xlsx_path: pathlib.Path, config: dict = None):
+    """
+    :param work_dir: directory of the run, the config file is written into it
+    :param xlsx_path: the converted workbook
+    :param config: keys of the config file, in addition to the required keys ("dbms_type" default is OracleSQL)
+    :return: the command running "main.py" with the config file
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    config_path = work_dir / 'config.yaml'
+    config_path.write_text(yaml.safe_dump({'dbms_type': 'oracleSQL', 'xlsx_location': str(xlsx_path),
+                                           'rowdependencies': True, **(config or {})}))
+    return [sys.executable, str(REPO_DIR / 'main.py'), '-config_path', str(config_path)]
+
+
+def run_xlsx2sql(work_dir: pathlib.Path, xlsx_path: pathlib.Path, config: dict = None, arguments: list = ()):
+    """
+    convert the workbook by running "main.py" in the directory, with config file of the given keys
+    :param work_dir: directory of the run, the output files are written into its "generated" directory
+    :param xlsx_path: the converted workbook
+    :param config: keys of the config file (see "write_config")
+    :param arguments: command line arguments, such as ["--workers", "2"]
+    :return: the completed process, its output is the log of the run
+    """
+    return subprocess.run([*write_config(work_dir, xlsx_path, config), *arguments], cwd=work_dir, capture_output=True,
+                          text=True)
+
+
+def convert(work_dir: pathlib.Path, xlsx_path: pathlib.Path, config: dict = None, arguments: list = ()):
+    """
+    same as "run_xlsx2sql", for a conversion which must succeed
+    :return: the "generated" directory of the run
+    """
+    process = run_xlsx2sql(work_dir, xlsx_path, config, arguments)
+    assert process.returncode == 0, process.stdout + process.stderr
+    return work_dir / 'generated'
+
+
+def read_output_files(generated_dir: pathlib.Path):
+    """
+    :param generated_dir: the "generated" directory of a run
+    :return: dictionary of relative path to content of all the output files (without logs and other volatile files)
+    """
+    return {str(file_path.relative_to(generated_dir)): file_path.read_bytes()
+            for file_path in sorted(generated_dir.rglob('*'))
+            if file_path.is_file() and file_path.name not in VOLATILE_FILES_NAMES and 'cache' not in file_path.parts
+            and 'snapshot' not in file_path.parts}
+
+
+def build_sample_sheets(customers_count: int = 120, products_count: int = 80):
+    """
+    sheets of a workbook with two groups of tables connected by foreign keys (customers and orders, products and
+    their tags), and DML of a table which is not created by the workbook. the DML has empty cells, quotes, gaps in
+    the keys, texts read as empty cells and tables spread over two sheets
+    :return: dictionary of sheet name to its rows, for "write_workbook"
+    """
+    customers_rows: list = [[customer_id, f"customer''s name {customer_id}" if customer_id % 7 == 0 else f"name {customer_id}",
+                             None if customer_id % 5 == 0 else f"mail{customer_id}@example.com",
+                             NA_TEXTS[customer_id % 4] if customer_id % 11 == 0 else f"city {customer_id % 9}"]
+                            for customer_id in range(1, customers_count + 1)]
+    orders_rows: list = [[order_id, order_id % customers_count + 1, order_id * 1.25, None if order_id % 3 else f"note {order_id}"]
+                         for order_id in range(1, 3 * customers_count + 1)]
+    # runs of contiguous ids with gaps between them
+    products_ids: list = [product_id for product_id in range(1, 2 * products_count) if product_id % 10 not in (4, 7, 8)]
+    products_rows: list = [[product_id, f"product {product_id}", None if product_id % 6 == 0 else product_id * 0.5]
+                           for product_id in products_ids[:products_count]]
+    tags_rows: list = [[products_ids[tag_i % products_count], f"tag {tag_i % 4}"] for tag_i in range(products_count)]
+    return {
+        'ddl_orders': [
+            ['###_ddl', "customers'' table"],
+            ['CUSTOMER'],
+            DDL_HEADER,
+            ['ID', 'NUMBER(10)', 'No', None, 'default', 10, 'Primary key', None, None, None],
+            ['NAME', 'VARCHAR2(100)', 'No', None, None, None, None, None, None, 'first + last name'],
+            ['EMAIL', 'VARCHAR2(100)', None, None, None, None, 'unique', None, None, "customer''s email"],
+            ['CITY', 'VARCHAR2(50)', None, None, None, None, None, '"unknown"', 'Yes', None],
+            [None],
+            ['###_ddl'],
+            ['ORDERS'],
+            DDL_HEADER,
+            ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+            ['CUSTOMER_ID', 'NUMBER(10)', 'No', 'CUSTOMER, ID, cascade', None, None, None, None, 'Yes', None],
+            ['TOTAL', 'NUMBER(10,2)', None, None, None, None, None, None, None, None],
+            ['NOTE', 'VARCHAR2(200)', None, None, None, None, None, None, None, None],
+        ],
+        'ddl_catalog': [
+            ['###_ddl', None, '[NAME,PRICE]'],
+            ['PRODUCT'],
+            DDL_HEADER,
+            ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+            ['NAME', 'VARCHAR2(100)', 'No', None, None, None, None, None, None, None],
+            ['PRICE', 'NUMBER(10,2)', None, None, None, None, None, None, None, 'price in dollars'],
+            [None],
+            ['###_ddl'],
+            ['PRODUCT_TAG'],
+            DDL_HEADER,
+            ['PRODUCT_ID', 'NUMBER(10)', 'No', 'PRODUCT, ID', None, None, None, None, None, None],
+            ['TAG', 'VARCHAR2(30)', None, None, None, None, None, None, None, None],
+        ],
+        'dml_orders': [
+            ['###_dml'], ['CUSTOMER'], ['ID', 'NAME', 'EMAIL', 'CITY'], *customers_rows,
+            [None],
+            ['###_dml'], ['ORDERS'], ['ID', 'CUSTOMER_ID', 'TOTAL', 'NOTE'], *orders_rows,
+        ],
+        'dml_catalog': [
+            ['###_dml'], ['PRODUCT'], ['ID', 'NAME', 'PRICE'], *products_rows,
+            [None],
+            ['###_dml'], ['PRODUCT_TAG'], ['PRODUCT_ID', 'TAG'], *tags_rows,
+            [None],
+            ['###_dml'], ['LEGACY_SETTING'], ['NAME', 'VALUE'], ['mode', 'fast'], ['level', 3],
+        ],
+    }
@@ -0,0 +1,64 @@
+# "--batch" converts each workbook into its own directory, a failed workbook doesn't stop the others but fails the run
+import json
+import shutil
+
+import pytest
+
+from helpers import DDL_HEADER, TEST_XLSX_PATH, build_sample_sheets, convert, read_output_files, run_xlsx2sql, \
+    write_workbook
+
+# foreign key without the referenced column, which stops the conversion of the workbook
+BROKEN_SHEETS: dict = {
+    'ddl_broken': [
+        ['###_ddl'],
+        ['BROKEN'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+        ['PARENT_ID', 'NUMBER(10)', None, 'PARENT', None, None, None, None, None, None],
+    ],
+}
+
+
+@pytest.fixture(scope='module')
+def batch_dir(tmp_path_factory):
+    """
+    :return: directory of two valid workbooks and a broken one
+    """
+    batch_dir = tmp_path_factory.mktemp('batch')
+    write_workbook(batch_dir / 'sample.xlsx', build_sample_sheets())
+    shutil.copy(TEST_XLSX_PATH, batch_dir / 'test.xlsx')
+    write_workbook(batch_dir / 'broken.xlsx', BROKEN_SHEETS)
+    return batch_dir
+
+
+@pytest.mark.parametrize('arguments', [[], ['--workers', '2']])
+def test_failed_workbook(tmp_path, batch_dir, arguments):
+    process = run_xlsx2sql(tmp_path / 'batch', batch_dir / 'sample.xlsx', arguments=['--batch', str(batch_dir), *arguments])
+    assert process.returncode == 1, process.stdout + process.stderr
+    generated_dir = tmp_path / 'batch' / 'generated'
+    results: list[dict] = json.loads((generated_dir / 'batch_summary.json').read_text(encoding='utf-8'))
+    assert [(result['workbook'], result['status']) for result in results] == \
+        [(str(batch_dir / 'broken.xlsx'), 'failed'), (str(batch_dir / 'sample.xlsx'), 'ok'),
+         (str(batch_dir / 'test.xlsx'), 'ok')]
+    assert results[0]['error'] is not None and results[0]['bytes_written'] == 0
+    assert all(result['bytes_written'] > 0 for result in results[1:])
+
+    # the broken workbook has only its log and problems, the others are the same as converting them one by one
+    assert sorted(file_path.name for file_path in (generated_dir / 'broken').iterdir()) == ['diagnostics.json', 'xlsx.log']
+    report: dict = json.loads((generated_dir / 'broken' / 'diagnostics.json').read_text(encoding='utf-8'))
+    assert report['rules']['wrong_foreign_key']['tables'] == ['BROKEN']
+    for workbook_name in ('sample', 'test'):
+        single_generated_dir = convert(tmp_path / workbook_name, batch_dir / f"{workbook_name}.xlsx")
+        assert read_output_files(generated_dir / workbook_name) == read_output_files(single_generated_dir)
+
+
+def test_valid_workbooks(tmp_path, batch_dir):
+    generated_dir = convert(tmp_path, batch_dir / 'sample.xlsx', arguments=['--batch', str(batch_dir / 's*.xlsx')])
+    results: list[dict] = json.loads((generated_dir / 'batch_summary.json').read_text(encoding='utf-8'))
+    assert [result['status'] for result in results] == ['ok']
+
+
+def test_no_workbooks(tmp_path, batch_dir):
+    process = run_xlsx2sql(tmp_path, batch_dir / 'sample.xlsx', arguments=['--batch', str(batch_dir / 'missing*.xlsx')])
+    assert process.returncode == 1
+    assert 'No xlsx files were found in' in process.stdout + process.stderr
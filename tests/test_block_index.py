@@ -0,0 +1,73 @@
+# the tables are found by the index of the "###_ddl"/"###_dml" markers in the first column (vectorized for sheets in
+# memory, row by row for streamed sheets). text starting with "###" which is not a marker doesn't start a table
+import pytest
+
+from helpers import DDL_HEADER, convert, read_output_files, write_workbook
+
+STRAY_SHEETS: dict = {
+    'ddl_stray': [
+        ['### notes: the tables of the sheet'],
+        [None],
+        ['###_ddl', 'first table'],
+        ['FIRST'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+        [None],
+        ['###'],
+        ['### not a table'],
+        [None],
+        # any text after "###_ddl" is allowed in DDL marker
+        ['###_ddl second'],
+        ['SECOND'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+        ['NAME', 'VARCHAR2(20)', None, None, None, None, None, None, None, '###_dml'],
+        [None],
+        ['###_dml'],
+        ['NOT_DDL'],
+    ],
+    'dml_stray': [
+        ['###_ddl'],
+        ['###'],
+        ['###_dml'], ['FIRST'], ['ID'], [1], [2],
+        # a marker ends the previous table, also without an empty row
+        ['###_dml'], ['SECOND'], ['ID', 'NAME'], [1, '###'], [2, '###_dml'],
+        [None],
+        ['###_dmlx'], ['NOT_DML'], ['ID'], [5],
+        [None],
+        [None, '###_dml'],
+        ['###_dml '],
+        [None],
+        ['###_dml'], ['THIRD'], ['ID'], [7],
+    ],
+}
+
+
+@pytest.fixture(scope='module')
+def stray_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'stray.xlsx', STRAY_SHEETS)
+
+
+@pytest.fixture(scope='module')
+def expected_output_files(tmp_path_factory, stray_xlsx_path):
+    return read_output_files(convert(tmp_path_factory.mktemp('dense'), stray_xlsx_path))
+
+
+def test_stray_markers(expected_output_files):
+    queries: str = expected_output_files['queries_stray.sql'].decode('utf-8')
+    assert [line.split()[2] for line in queries.splitlines() if line.startswith('create table ')] == ['FIRST', 'SECOND']
+    assert [line.split()[2] for line in queries.splitlines() if line.startswith('insert into ')] == \
+        ['FIRST', 'FIRST', 'SECOND', 'SECOND', 'THIRD']
+    assert "values (1, '###');\n" in queries and "values (2, '###_dml');\n" in queries
+    assert 'NOT_DDL' not in queries and 'NOT_DML' not in queries
+
+
+@pytest.mark.parametrize('config, arguments', [
+    ({'streaming_reader': True}, []),
+    ({'sparse_reader': True}, []),
+    ({}, ['--workers', '2']),
+    ({'streaming_reader': True}, ['--workers', '2']),
+    ({'regeneration_cache': True}, []),
+])
+def test_readers_equivalence(tmp_path, stray_xlsx_path, expected_output_files, config, arguments):
+    assert read_output_files(convert(tmp_path, stray_xlsx_path, config, arguments)) == expected_output_files
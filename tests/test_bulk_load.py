@@ -0,0 +1,72 @@
+# DML tables with at least "bulk_load_min_rows" rows are written as csv data files, loaded by SQL*Loader control
+# files or by external tables, instead of insert queries
+import csv
+
+import pytest
+
+from helpers import build_sample_sheets, convert, write_workbook
+
+
+@pytest.fixture(scope='module')
+def sample_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'sample.xlsx', build_sample_sheets())
+
+
+def read_data_file(generated_dir, table_name: str):
+    """
+    :return: the rows of the csv data file of the table
+    """
+    data_file_path, = (generated_dir / 'bulk_sample').glob(f"{table_name}_*.csv")
+    with open(data_file_path, encoding='utf-8', newline='') as data_file:
+        return list(csv.reader(data_file))
+
+
+@pytest.mark.parametrize('bulk_load_format', ['sqlldr', 'external_table'])
+def test_data_files(tmp_path, sample_xlsx_path, bulk_load_format):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'bulk_load_min_rows': 100, 'bulk_load_format': bulk_load_format})
+    queries: str = (generated_dir / 'queries_sample.sql').read_text(encoding='utf-8')
+    # only the tables with at least 100 rows are bulk loaded
+    assert sorted(path.name.split('_')[0] for path in (generated_dir / 'bulk_sample').glob('*.csv')) == ['CUSTOMER', 'ORDERS']
+    assert 'insert into CUSTOMER ' not in queries and 'insert into PRODUCT ' in queries
+
+    customers_rows: list = read_data_file(generated_dir, 'CUSTOMER')
+    assert len(customers_rows) == 120
+    # escaped quotes are unescaped, and empty cells and texts read as empty cells are empty fields (null)
+    assert customers_rows[6] == ['7', "customer's name 7", 'mail7@example.com', 'city 7']
+    assert customers_rows[9] == ['10', 'name 10', '', 'city 1']
+    assert customers_rows[10] == ['11', 'name 11', 'mail11@example.com', '']
+    assert customers_rows[43][3] == 'None'
+    assert read_data_file(generated_dir, 'ORDERS')[:2] == [['1', '2', '1.25', ''], ['2', '3', '2.5', '']]
+
+
+def test_sqlldr_control_file(tmp_path, sample_xlsx_path):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'bulk_load_min_rows': 100, 'bulk_load_format': 'sqlldr'})
+    data_file_path, = (generated_dir / 'bulk_sample').glob('CUSTOMER_*.csv')
+    control_file_name: str = f"{data_file_path.stem}.ctl"
+    # the fields are longer than the default 255 characters of SQL*Loader
+    assert (generated_dir / 'bulk_sample' / control_file_name).read_text(encoding='utf-8') == \
+        f"options (direct=true)\nload data\ncharacterset UTF8\ninfile '{data_file_path.name}'\nappend\n" \
+        f"into table CUSTOMER\nfields terminated by ',' optionally enclosed by '\"'\ntrailing nullcols\n" \
+        f"(ID char(4000), NAME char(4000), EMAIL char(4000), CITY char(4000))\n"
+    queries: str = (generated_dir / 'queries_sample.sql').read_text(encoding='utf-8')
+    assert f"-- CUSTOMER is loaded by SQL*Loader, run in the bulk load directory: sqlldr control={control_file_name}\n" \
+        in queries
+
+
+def test_external_table(tmp_path, sample_xlsx_path):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'bulk_load_min_rows': 100, 'bulk_load_format': 'external_table',
+                                                         'bulk_load_directory': 'DATA_DIR'})
+    data_file_path, = (generated_dir / 'bulk_sample').glob('CUSTOMER_*.csv')
+    assert not list((generated_dir / 'bulk_sample').glob('*.ctl'))
+    queries: str = (generated_dir / 'queries_sample.sql').read_text(encoding='utf-8')
+    columns_definitions: str = ',\n'.join(f"\t{column_name.ljust(40)} VARCHAR2(4000)"
+                                          for column_name in ('ID', 'NAME', 'EMAIL', 'CITY'))
+    assert f"create table EXT_CUSTOMER (\n{columns_definitions}\n) organization external (\n" \
+        f"\ttype oracle_loader default directory DATA_DIR\n" \
+        f"\taccess parameters (records delimited by newline characterset UTF8\n" \
+        f"\t\tfields terminated by ',' optionally enclosed by '\"' missing field values are null\n" \
+        f"\t\t(ID char(4000), NAME char(4000), EMAIL char(4000), CITY char(4000)))\n" \
+        f"\tlocation ('{data_file_path.name}')\n) reject limit 0;\n" in queries
+    assert "insert /*+ append */ into CUSTOMER (ID, NAME, EMAIL, CITY)\n" \
+        "\t\tselect ID, NAME, EMAIL, CITY from EXT_CUSTOMER;\n" in queries
+    assert queries.index('select ID, NAME, EMAIL, CITY from EXT_CUSTOMER;') < queries.index('drop table EXT_CUSTOMER;')
@@ -0,0 +1,78 @@
+# with "deferred_constraints" the queries file is in load optimized order: the tables are created without their indexes
+# and multi columns unique constraints, the data is inserted, and only then the indexes, constraints and foreign keys
+import pytest
+
+from helpers import build_sample_sheets, convert, read_output_files, write_workbook
+
+CREATE_SECTION: str = '\n-------------------------- Creating tables with their relevant information --------------------------\n'
+FK_SECTION: str = '\n----------------------------------- Creating Foreign Keys -----------------------------------\n'
+INSERT_SECTION: str = '\n-------------------------- Inserting data to tables --------------------------\n'
+DEFERRED_SECTION: str = '\n----------------------- Creating indexes, constraints and Foreign Keys -----------------------\n'
+
+DEFERRED_QUERIES: list[str] = [
+    "create index IDX_CUSTOMER__CITY on CUSTOMER (CITY);",
+    "create index IDX_ORDERS__CUSTOMER_ID on ORDERS (CUSTOMER_ID);",
+    "alter table ORDERS add constraint FK_ORDERS__CUSTOMER_ID \n"
+    "\tforeign key (CUSTOMER_ID) references CUSTOMER(ID) on delete cascade;",
+    "alter table PRODUCT\n\tadd constraint UNIQUE_PRODUCT__NAME_PRICE\n\tunique (NAME,PRICE);",
+    "alter table PRODUCT_TAG add constraint FK_PRODUCT_TAG__PRODUCT_ID \n"
+    "\tforeign key (PRODUCT_ID) references PRODUCT(ID);",
+]
+
+
+@pytest.fixture(scope='module')
+def sample_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'sample.xlsx', build_sample_sheets())
+
+
+def split_statements(section: str):
+    return [statement.strip('\n') + ';' for statement in section.split(';\n') if statement.strip('\n')]
+
+
+@pytest.mark.parametrize('arguments', [[], ['--workers', '2']])
+def test_load_order(tmp_path, sample_xlsx_path, arguments):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'deferred_constraints': True}, arguments)
+    queries: str = (generated_dir / 'queries_sample.sql').read_text(encoding='utf-8')
+    create_section, insert_section = queries.removeprefix(CREATE_SECTION).split(INSERT_SECTION)
+    insert_section, deferred_section = insert_section.split(DEFERRED_SECTION)
+    assert 'create index' not in create_section and 'add constraint' not in create_section
+    assert insert_section.count('insert into ') == 642
+    assert split_statements(deferred_section.removesuffix('\ncommit;\n/\n')) == DEFERRED_QUERIES
+
+    # the same statements as the default order, only moved
+    default_generated_dir = convert(tmp_path / 'default', sample_xlsx_path)
+    default_queries: str = (default_generated_dir / 'queries_sample.sql').read_text(encoding='utf-8')
+    assert sorted(split_statements(queries.replace(DEFERRED_SECTION, ''))) == \
+        sorted(split_statements(default_queries.replace(FK_SECTION, '')))
+    assert (generated_dir / 'drops_sample.sql').read_bytes() == (default_generated_dir / 'drops_sample.sql').read_bytes()
+
+
+def test_oracle_load_options(tmp_path, sample_xlsx_path):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'deferred_constraints': True, 'index_parallel': 4,
+                                                         'index_nologging': True, 'fk_novalidate': True})
+    deferred_section: str = (generated_dir / 'queries_sample.sql').read_text(encoding='utf-8').split(DEFERRED_SECTION)[1]
+    # the options are reset after the index is built, and the foreign keys are validated after all of them were added
+    assert split_statements(deferred_section.removesuffix('\ncommit;\n/\n')) == [
+        "create index IDX_CUSTOMER__CITY on CUSTOMER (CITY) parallel 4 nologging;",
+        "alter index IDX_CUSTOMER__CITY noparallel logging;",
+        "create index IDX_ORDERS__CUSTOMER_ID on ORDERS (CUSTOMER_ID) parallel 4 nologging;",
+        "alter index IDX_ORDERS__CUSTOMER_ID noparallel logging;",
+        "alter table ORDERS add constraint FK_ORDERS__CUSTOMER_ID \n"
+        "\tforeign key (CUSTOMER_ID) references CUSTOMER(ID) on delete cascade enable novalidate;",
+        "alter table ORDERS modify constraint FK_ORDERS__CUSTOMER_ID enable validate;",
+        "alter table PRODUCT\n\tadd constraint UNIQUE_PRODUCT__NAME_PRICE\n\tunique (NAME,PRICE);",
+        "alter table PRODUCT_TAG add constraint FK_PRODUCT_TAG__PRODUCT_ID \n"
+        "\tforeign key (PRODUCT_ID) references PRODUCT(ID) enable novalidate;",
+        "alter table PRODUCT_TAG modify constraint FK_PRODUCT_TAG__PRODUCT_ID enable validate;",
+    ]
+
+
+def test_shards_equivalence(tmp_path, sample_xlsx_path):
+    # each shard is in load optimized order, with the same statements as the whole file
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'deferred_constraints': True}, ['--shards', '2'])
+    shards_queries: list[str] = [output.decode('utf-8') for file_name, output in read_output_files(generated_dir).items()
+                                 if file_name.startswith('queries_sample_shard_')]
+    assert len(shards_queries) > 1
+    deferred_queries: list[str] = [statement for shard_queries in shards_queries for statement in
+                                   split_statements(shard_queries.split(DEFERRED_SECTION)[1].removesuffix('\ncommit;\n/\n'))]
+    assert sorted(deferred_queries) == sorted(DEFERRED_QUERIES)
@@ -0,0 +1,56 @@
+# the problems of the workbook are counted by rule and by table in "diagnostics.json", fatal problems stop the run
+# only after the whole workbook was checked, without writing any queries file
+import json
+
+import pytest
+
+from helpers import DDL_HEADER, build_sample_sheets, run_xlsx2sql, write_workbook
+
+
+def build_broken_sheets():
+    """
+    :return: the sheets of the sample workbook, with a sheet of unescaped table comment, foreign keys without the
+             referenced column, column without type and reserved table name
+    """
+    sheets: dict = build_sample_sheets()
+    sheets['ddl_broken'] = [
+        ['###_ddl', "broken's table"],
+        ['BROKEN'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+        ['PARENT_ID', 'NUMBER(10)', None, 'PARENT', None, None, None, None, None, None],
+        ['CUSTOMER_ID', 'NUMBER(10)', None, 'CUSTOMER', None, None, None, None, None, None],
+        ['NOTE', None, None, None, None, None, None, None, None, None],
+        [None],
+        ['###_ddl'],
+        ['TABLE'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+    ]
+    return sheets
+
+
+@pytest.fixture(scope='module')
+def broken_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'broken.xlsx', build_broken_sheets())
+
+
+@pytest.mark.parametrize('arguments', [[], ['--workers', '2'], ['--shards', '2']])
+def test_fatal_problems(tmp_path, broken_xlsx_path, arguments):
+    process = run_xlsx2sql(tmp_path, broken_xlsx_path, arguments=arguments)
+    assert process.returncode == 1, process.stdout + process.stderr
+    assert 'Traceback' not in process.stderr
+    assert '4 fatal problems were found in the workbook, nothing was written' in process.stdout + process.stderr
+    generated_dir = tmp_path / 'generated'
+    assert sorted(file_path.name for file_path in generated_dir.rglob('*')) == ['diagnostics.json', 'xlsx.log']
+
+    report: dict = json.loads((generated_dir / 'diagnostics.json').read_text(encoding='utf-8'))
+    assert report['severities'] == {'fatal': 4, 'error': 1}
+    assert {rule: (rule_counts['severity'], rule_counts['count'], rule_counts['tables'])
+            for rule, rule_counts in report['rules'].items()} == {
+        'unescaped_table_comment': ('fatal', 1, ['BROKEN']),
+        'reserved_table_name': ('fatal', 1, ['TABLE']),
+        'wrong_foreign_key': ('fatal', 2, ['BROKEN']),
+        'missing_data_type': ('error', 1, ['BROKEN']),
+    }
+    assert report['tables'] == {'BROKEN': 4, 'TABLE': 1}
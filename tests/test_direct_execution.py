@@ -0,0 +1,46 @@
+# "--execute" creates the tables and inserts the data straight into the database (SQLite in the tests)
+import sqlite3
+
+import pytest
+
+from helpers import build_sample_sheets, convert, run_xlsx2sql, write_workbook
+
+
+@pytest.fixture(scope='module')
+def sample_xlsx_path(tmp_path_factory):
+    sheets: dict = build_sample_sheets()
+    # without the DML of the table which is not created by the workbook
+    sheets['dml_catalog'] = sheets['dml_catalog'][:sheets['dml_catalog'].index(['LEGACY_SETTING']) - 2]
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'sample.xlsx', sheets)
+
+
+@pytest.mark.parametrize('config', [{}, {'streaming_reader': True, 'deferred_constraints': True},
+                                    {'execution_batch_size': 7, 'commit_interval': 20}])
+def test_execute(tmp_path, sample_xlsx_path, config):
+    database_path = tmp_path / 'sample.db'
+    convert(tmp_path, sample_xlsx_path, {'dbms_type': 'sqlite', 'database': str(database_path), **config}, ['--execute'])
+    # nothing is written but the log files
+    assert not list((tmp_path / 'generated').glob('*.sql'))
+
+    with sqlite3.connect(database_path) as connection:
+        tables_counts: dict = {table_name: connection.execute(f"select count(*) from {table_name}").fetchone()[0]
+                               for table_name in ('CUSTOMER', 'ORDERS', 'PRODUCT', 'PRODUCT_TAG')}
+        assert tables_counts == {'CUSTOMER': 120, 'ORDERS': 360, 'PRODUCT': 80, 'PRODUCT_TAG': 80}
+        # escaped quotes are stored unescaped, and empty cells as null
+        assert connection.execute("select NAME, EMAIL from CUSTOMER where ID = 35").fetchone() == \
+            ("customer's name 35", None)
+        assert connection.execute("select CITY from CUSTOMER where ID = 44").fetchone() == ('None',)
+
+
+def test_missing_table(tmp_path):
+    # LEGACY_SETTING is not created by the workbook, and doesn't exist in the database
+    xlsx_path = write_workbook(tmp_path / 'sample.xlsx', build_sample_sheets())
+    database_path = tmp_path / 'sample.db'
+    process = run_xlsx2sql(tmp_path, xlsx_path, {'dbms_type': 'sqlite', 'database': str(database_path)}, ['--execute'])
+    assert process.returncode == 1
+    assert 'Traceback' not in process.stderr
+    assert "Inserting into table LEGACY_SETTING failed: no such table: LEGACY_SETTING" in process.stdout
+
+    # the rows inserted since the last commit are rolled back, the tables were committed when they were created
+    with sqlite3.connect(database_path) as connection:
+        assert connection.execute("select count(*) from CUSTOMER").fetchone() == (0,)
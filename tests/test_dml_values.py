@@ -0,0 +1,51 @@
+# the values of DML table are formatted by column: columns of only non-negative integers (without leading zeros) are
+# written as numbers, other columns are quoted, with their single quotes escaped
+import pytest
+
+from helpers import convert, write_workbook
+
+INSERT_SECTION: str = '\n-------------------------- Inserting data to tables --------------------------\n'
+
+VALUES_SHEETS: dict = {
+    'dml_values': [
+        ['###_dml'],
+        ['VALUE_TYPES'],
+        ['ID', 'PRICE', 'ZIP', 'MIXED', 'QUOTED', 'NEGATIVE'],
+        [1, 1.25, '01234', 5, "O'Brien", -3],
+        [20, 3, '98765', 'abc', "D''Arcy", 4],
+        [3, None, None, None, "it''s O'Brien's", None],
+        [0, 0.5, '0', 10, "''", -0.5],
+    ],
+}
+
+EXPECTED_VALUES: list[str] = [
+    "(1, '1.25', '01234', '5', 'O''Brien', '-3')",
+    "(20, '3', '98765', 'abc', 'D''Arcy', '4')",
+    "(3, '', '', '', 'it''s O''Brien''s', '')",
+    "(0, '0.5', '0', '10', '''', '-0.5')",
+]
+
+
+@pytest.fixture(scope='module')
+def values_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'values.xlsx', VALUES_SHEETS)
+
+
+@pytest.mark.parametrize('config', [{}, {'streaming_reader': True}, {'sparse_reader': True}])
+def test_insert_values(tmp_path, values_xlsx_path, config):
+    generated_dir = convert(tmp_path, values_xlsx_path, config)
+    queries: str = (generated_dir / 'queries_values.sql').read_text(encoding='utf-8')
+    insert_queries: list[str] = [query for query in queries.split(INSERT_SECTION)[1].split(';\n') if 'insert' in query]
+    # decimal and negative numbers, numbers with leading zeros and columns mixed with text are quoted
+    assert insert_queries == [f"insert into VALUE_TYPES (ID, PRICE, ZIP, MIXED, QUOTED, NEGATIVE)\n\t\t values {values}"
+                              for values in EXPECTED_VALUES]
+
+
+def test_delete_values(tmp_path, values_xlsx_path):
+    generated_dir = convert(tmp_path, values_xlsx_path)
+    drops: str = (generated_dir / 'drops_values.sql').read_text(encoding='utf-8')
+    # the rows are deleted by the same literals they are inserted with
+    assert "delete from VALUE_TYPES where ID = 3 and PRICE = '' and ZIP = '' and MIXED = '' " \
+           "and QUOTED = 'it''s O''Brien''s' and NEGATIVE = '';\n" in drops
+    assert "delete from VALUE_TYPES where ID = 1 and PRICE = '1.25' and ZIP = '01234' and MIXED = '5' " \
+           "and QUOTED = 'O''Brien' and NEGATIVE = '-3';\n" in drops
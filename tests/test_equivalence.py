@@ -0,0 +1,108 @@
+# the same workbook must be converted into byte-identical output files by all the ways of reading and processing it,
+# each one is compared with the output of the default run (dense reader, in one process)
+import gzip
+import json
+
+import pytest
+
+from helpers import build_sample_sheets, convert, read_output_files, write_workbook
+
+# the queries of the (split) queries file end with commit, as the "commit_query" of OracleSQL
+COMMIT_QUERY: str = "\ncommit;\n/\n"
+BASE_CONFIGS: dict = {'all_columns_delete': {}, 'key_based_delete': {'key_based_delete': True, 'delete_batch_size': 7}}
+# config keys and command line arguments of the ways of reading and processing the workbook
+VARIANTS: dict = {
+    'streaming_reader': ({'streaming_reader': True}, []),
+    'sparse_reader': ({'sparse_reader': True}, []),
+    'workers': ({}, ['--workers', '3']),
+    'streaming_reader_workers': ({'streaming_reader': True}, ['--workers', '2']),
+    'sparse_reader_workers': ({'sparse_reader': True}, ['--workers', '2']),
+}
+
+
+@pytest.fixture(scope='module')
+def sample_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'sample.xlsx', build_sample_sheets())
+
+
+@pytest.fixture(scope='module')
+def reference_output(tmp_path_factory, sample_xlsx_path):
+    """
+    :return: function returning the output files of the default run with the base config (and arguments),
+             each run is done once for all the tests of the module
+    """
+    outputs: dict = {}
+
+    def get_reference_output(base_name: str, arguments: tuple = ()):
+        if (base_name, arguments) not in outputs:
+            generated_dir = convert(tmp_path_factory.mktemp('reference'), sample_xlsx_path, BASE_CONFIGS[base_name],
+                                    list(arguments))
+            outputs[base_name, arguments] = read_output_files(generated_dir)
+        return outputs[base_name, arguments]
+
+    return get_reference_output
+
+
+def read_joined_file(generated_dir, parts: list[dict]):
+    """
+    :param generated_dir: the "generated" directory of the run
+    :param parts: the parts of split (or compressed) file, as listed in its manifest
+    :return: the content of the parts as one file, without the commit ending each part
+    """
+    contents: list[bytes] = []
+    for part in parts:
+        content: bytes = (generated_dir / part['file']).read_bytes()
+        if part['file'].endswith('.gz'):
+            content = gzip.decompress(content)
+        contents.append(content.decode('utf-8').removesuffix(COMMIT_QUERY))
+    return ''.join(contents)
+
+
+@pytest.mark.parametrize('variant_name', VARIANTS)
+@pytest.mark.parametrize('base_name', BASE_CONFIGS)
+def test_readers_and_workers(tmp_path, sample_xlsx_path, reference_output, base_name, variant_name):
+    config, arguments = VARIANTS[variant_name]
+    generated_dir = convert(tmp_path, sample_xlsx_path, {**BASE_CONFIGS[base_name], **config}, arguments)
+    assert read_output_files(generated_dir) == reference_output(base_name)
+
+
+@pytest.mark.parametrize('base_name', BASE_CONFIGS)
+def test_regeneration_cache(tmp_path, sample_xlsx_path, reference_output, base_name):
+    config: dict = {**BASE_CONFIGS[base_name], 'regeneration_cache': True}
+    # the first run fills the cache, and the second one takes all the tables from it
+    for _ in range(2):
+        assert read_output_files(convert(tmp_path, sample_xlsx_path, config)) == reference_output(base_name)
+
+    # only the changed tables are created again (the cache is of the workbook with the same name)
+    (tmp_path / 'changed').mkdir()
+    changed_xlsx_path = write_workbook(tmp_path / 'changed' / 'sample.xlsx', build_sample_sheets(customers_count=100))
+    fresh_output: dict = read_output_files(convert(tmp_path / 'fresh', changed_xlsx_path, BASE_CONFIGS[base_name]))
+    assert read_output_files(convert(tmp_path, changed_xlsx_path, config)) == fresh_output
+
+
+@pytest.mark.parametrize('arguments', [[], ['--workers', '2']])
+def test_workbook_snapshot(tmp_path, sample_xlsx_path, reference_output, arguments):
+    # the first run saves the snapshot, and the second one loads it instead of parsing the workbook
+    for _ in range(2):
+        generated_dir = convert(tmp_path, sample_xlsx_path, {'workbook_snapshot': True}, arguments)
+        assert read_output_files(generated_dir) == reference_output('all_columns_delete')
+    assert (generated_dir / 'snapshot' / 'sample' / 'manifest.json').exists()
+
+
+@pytest.mark.parametrize('config', [{'split_output_statements': 25}, {'split_output_mb': 0.01}, {'compress_output': True},
+                                    {'split_output_statements': 40, 'compress_output': True}])
+def test_split_and_compressed_output(tmp_path, sample_xlsx_path, reference_output, config):
+    generated_dir = convert(tmp_path, sample_xlsx_path, config)
+    manifest: dict = json.loads((generated_dir / 'queries_sample_manifest.json').read_text(encoding='utf-8'))
+    reference: dict = reference_output('all_columns_delete')
+    assert read_joined_file(generated_dir, manifest['queries_files']) == \
+        reference['queries_sample.sql'].decode('utf-8').removesuffix(COMMIT_QUERY)
+    assert read_joined_file(generated_dir, manifest['drops_files']) == reference['drops_sample.sql'].decode('utf-8')
+
+
+@pytest.mark.parametrize('config', [{'streaming_reader': True}, {'sparse_reader': True},
+                                    {'key_based_delete': True, 'delete_batch_size': 7, 'streaming_reader': True}])
+def test_shards(tmp_path, sample_xlsx_path, reference_output, config):
+    base_name: str = 'key_based_delete' if config.get('key_based_delete') else 'all_columns_delete'
+    generated_dir = convert(tmp_path, sample_xlsx_path, config, ['--shards', '2'])
+    assert read_output_files(generated_dir) == reference_output(base_name, ('--shards', '2'))
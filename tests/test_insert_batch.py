@@ -0,0 +1,70 @@
+# rows of DML table are inserted in batches of "insert_batch_size" rows: "insert all" in OracleSQL, and multi rows
+# "values" in the other DBMS. the last batch has the remaining rows, a single row is a regular insert query
+import pytest
+
+from helpers import DDL_HEADER, convert, write_workbook
+
+INSERT_SECTION: str = '\n-------------------------- Inserting data to tables --------------------------\n'
+
+ITEMS_SHEETS: dict = {
+    'ddl_items': [
+        ['###_ddl'],
+        ['ITEM'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+        ['NAME', 'VARCHAR2(20)', None, None, None, None, None, None, None, None],
+    ],
+    'dml_items': [
+        ['###_dml'], ['ITEM'], ['ID', 'NAME'], [1, "a''b"], [2, None], [3, 'c'], [4, 'd'], [5, 'e'],
+    ],
+}
+
+
+@pytest.fixture(scope='module')
+def items_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'items.xlsx', ITEMS_SHEETS)
+
+
+def read_insert_queries(generated_dir):
+    """
+    :return: the section of the insert queries in the queries file, without the commit ending the file
+    """
+    queries: str = (generated_dir / 'queries_items.sql').read_text(encoding='utf-8')
+    return queries.split(INSERT_SECTION)[1].removesuffix('\ncommit;\n/\n').rstrip('\n') + '\n'
+
+
+@pytest.mark.parametrize('arguments', [[], ['--workers', '2']])
+def test_insert_all(tmp_path, items_xlsx_path, arguments):
+    generated_dir = convert(tmp_path, items_xlsx_path, {'insert_batch_size': 2}, arguments)
+    assert read_insert_queries(generated_dir) == (
+        "insert all\n"
+        "\tinto ITEM (ID, NAME) values (1, 'a''b')\n"
+        "\tinto ITEM (ID, NAME) values (2, '')\n"
+        "select 1 from dual;\n"
+        "insert all\n"
+        "\tinto ITEM (ID, NAME) values (3, 'c')\n"
+        "\tinto ITEM (ID, NAME) values (4, 'd')\n"
+        "select 1 from dual;\n"
+        "insert into ITEM (ID, NAME)\n"
+        "\t\t values (5, 'e');\n")
+
+
+def test_multi_rows_values(tmp_path, items_xlsx_path):
+    generated_dir = convert(tmp_path, items_xlsx_path, {'dbms_type': 'sqlite', 'insert_batch_size': 3})
+    assert read_insert_queries(generated_dir) == (
+        "insert into ITEM (ID, NAME)\n"
+        "\t\t values (1, 'a''b'),\n"
+        "\t\t\t(2, ''),\n"
+        "\t\t\t(3, 'c');\n"
+        "insert into ITEM (ID, NAME)\n"
+        "\t\t values (4, 'd'),\n"
+        "\t\t\t(5, 'e');\n")
+
+
+def test_batch_larger_than_table(tmp_path, items_xlsx_path):
+    generated_dir = convert(tmp_path / 'batch', items_xlsx_path, {'insert_batch_size': 100})
+    queries: str = read_insert_queries(generated_dir)
+    assert queries.count('insert all\n') == 1 and queries.count('\tinto ITEM ') == 5
+    # the drops file doesn't depend on the batch size
+    single_generated_dir = convert(tmp_path / 'single', items_xlsx_path)
+    assert (generated_dir / 'drops_items.sql').read_bytes() == (single_generated_dir / 'drops_items.sql').read_bytes()
@@ -0,0 +1,79 @@
+# rows with values in all the key columns are deleted by their keys ("key_based_delete"): contiguous numbers of integer
+# key by range, and the other keys in chunks of "delete_batch_size"
+import pytest
+
+from helpers import DDL_HEADER, convert, write_workbook
+
+KEYS_SHEETS: dict = {
+    'ddl_keys': [
+        ['###_ddl'],
+        ['INT_KEY'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None],
+        ['NAME', 'VARCHAR2(20)', None, None, None, None, None, None, None, None],
+        [None],
+        ['###_ddl'],
+        ['DECIMAL_KEY'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10,2)', 'No', None, None, None, 'Primary key', None, None, None],
+        [None],
+        ['###_ddl'],
+        ['TEXT_KEY'],
+        DDL_HEADER,
+        ['NAME', 'VARCHAR2(20)', None, None, None, None, None, None, None, None],
+        ['CODE', 'VARCHAR2(10)', 'No', None, None, None, 'Primary key', None, None, None],
+    ],
+    'dml_keys': [
+        ['###_dml'], ['INT_KEY'], ['ID', 'NAME'],
+        *[[key, f"name {key}"] for key in (1, 2, 3, 4, 5, 8, 10, 11, 20, 21, 22, 23, 30)],
+        [None],
+        ['###_dml'], ['DECIMAL_KEY'], ['ID'], [1], [2], [3], [4], [5],
+        [None],
+        ['###_dml'], ['TEXT_KEY'], ['NAME', 'CODE'], ['a', 'x'], ['b', 'y'], ['c', 'z'], ['no code', None],
+    ],
+}
+
+
+@pytest.fixture(scope='module')
+def keys_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'keys.xlsx', KEYS_SHEETS)
+
+
+def read_delete_queries(generated_dir, table_name: str):
+    """
+    :return: the delete queries of the table in the drops file, by their order
+    """
+    drops: str = (generated_dir / 'drops_keys.sql').read_text(encoding='utf-8')
+    return [line for line in drops.splitlines() if line.startswith(f"delete from {table_name} ")]
+
+
+def test_range_and_chunk_split(tmp_path, keys_xlsx_path):
+    generated_dir = convert(tmp_path, keys_xlsx_path, {'key_based_delete': True, 'delete_batch_size': 2})
+    # runs of at least 3 numbers are deleted by range, the shorter ones with the other keys
+    assert read_delete_queries(generated_dir, 'INT_KEY') == ["delete from INT_KEY where ID in (11, 30);",
+                                                             "delete from INT_KEY where ID in (8, 10);",
+                                                             "delete from INT_KEY where ID between 20 and 23;",
+                                                             "delete from INT_KEY where ID between 1 and 5;"]
+    # range of non-integer key would also delete the existing rows between the inserted ones
+    assert read_delete_queries(generated_dir, 'DECIMAL_KEY') == ["delete from DECIMAL_KEY where ID in (5);",
+                                                                 "delete from DECIMAL_KEY where ID in (3, 4);",
+                                                                 "delete from DECIMAL_KEY where ID in (1, 2);"]
+    # row without key is deleted by all of its values
+    assert read_delete_queries(generated_dir, 'TEXT_KEY') == ["delete from TEXT_KEY where CODE in ('z');",
+                                                              "delete from TEXT_KEY where CODE in ('x', 'y');",
+                                                              "delete from TEXT_KEY where NAME = 'no code' and CODE = '';"]
+
+
+def test_single_chunk(tmp_path, keys_xlsx_path):
+    generated_dir = convert(tmp_path, keys_xlsx_path, {'key_based_delete': True})
+    assert read_delete_queries(generated_dir, 'INT_KEY') == ["delete from INT_KEY where ID in (8, 10, 11, 30);",
+                                                             "delete from INT_KEY where ID between 20 and 23;",
+                                                             "delete from INT_KEY where ID between 1 and 5;"]
+    assert read_delete_queries(generated_dir, 'DECIMAL_KEY') == ["delete from DECIMAL_KEY where ID in (1, 2, 3, 4, 5);"]
+
+
+def test_all_columns_delete_by_default(tmp_path, keys_xlsx_path):
+    generated_dir = convert(tmp_path, keys_xlsx_path)
+    assert read_delete_queries(generated_dir, 'INT_KEY') == \
+        [f"delete from INT_KEY where ID = {key} and NAME = 'name {key}';"
+         for key in (30, 23, 22, 21, 20, 11, 10, 8, 5, 4, 3, 2, 1)]
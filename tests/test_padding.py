@@ -0,0 +1,77 @@
+# the columns of "create table" are aligned by the longest name and type in the table, at least to the widths of the
+# previous renderer (40 and 20), so tables with shorter names and types are written as before
+import pytest
+
+from helpers import DDL_HEADER, convert, write_workbook
+
+
+def ddl_column(name: str, data_type: str, nullable: str = None, constraint: str = None):
+    return [name, data_type, nullable, None, None, None, constraint, None, None, None]
+
+
+PADDING_SHEETS: dict = {
+    'ddl_padding': [
+        ['###_ddl'],
+        ['SHORT_NAMES'],
+        DDL_HEADER,
+        ddl_column('ID', 'NUMBER(10)', 'No', 'Primary key'),
+        ddl_column('NAME', 'VARCHAR2(100)'),
+        ddl_column('TAGS', 'TAG_LIST', None, 'nested'),
+        [None],
+        ['###_ddl'],
+        ['WIDE_NAMES'],
+        DDL_HEADER,
+        ddl_column('ID', 'NUMBER(10)', 'No', 'Primary key'),
+        ddl_column('A' * 50, 'VARCHAR2(100)'),
+        ddl_column('CREATED', 'TIMESTAMP(6) WITH TIME ZONE'),
+        # types longer than 30 characters (virtual columns) don't widen the types of the other columns
+        ddl_column('TOTAL', 'NUMBER(10,2) as (ID * 2) virtual'),
+    ],
+}
+
+
+def render_old_column(name: str, data_type: str, is_nullable: bool = True, constraint: str = None):
+    """
+    :return: the column as written by the previous renderer, with fixed widths
+    """
+    return f"\t{name.ljust(40)} {data_type.ljust(20)} {'' if is_nullable else 'not null '}" \
+           f"{'' if constraint is None else f'{constraint} '}"
+
+
+@pytest.fixture(scope='module')
+def padding_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'padding.xlsx', PADDING_SHEETS)
+
+
+@pytest.mark.parametrize('dbms_type, table_end', [
+    ('oracleSQL', ") rowdependencies\nnested table TAGS store as SHORT_NAMES__TAGS;\n"),
+    ('sqlite', ");\n"),
+])
+def test_short_names_as_before(tmp_path, padding_xlsx_path, dbms_type, table_end):
+    generated_dir = convert(tmp_path, padding_xlsx_path, {'dbms_type': dbms_type})
+    queries: str = (generated_dir / 'queries_padding.sql').read_text(encoding='utf-8')
+    old_columns: list[str] = [render_old_column('ID', 'NUMBER(10)', False, 'Primary key'),
+                              render_old_column('NAME', 'VARCHAR2(100)'), render_old_column('TAGS', 'TAG_LIST')]
+    assert "create table SHORT_NAMES (\n" + ',\n'.join(old_columns) + '\n' + table_end in queries
+
+
+def test_wide_names(tmp_path, padding_xlsx_path):
+    generated_dir = convert(tmp_path, padding_xlsx_path)
+    queries: str = (generated_dir / 'queries_padding.sql').read_text(encoding='utf-8')
+    # the names are padded to 50 characters and the types to 27 characters
+    assert "create table WIDE_NAMES (\n" \
+           f"\t{'ID'.ljust(50)} {'NUMBER(10)'.ljust(27)} not null Primary key ,\n" \
+           f"\t{'A' * 50} {'VARCHAR2(100)'.ljust(27)} ,\n" \
+           f"\t{'CREATED'.ljust(50)} TIMESTAMP(6) WITH TIME ZONE ,\n" \
+           f"\t{'TOTAL'.ljust(50)} NUMBER(10,2) AS (ID * 2) VIRTUAL \n" \
+           ") rowdependencies;\n" in queries
+
+
+def test_alter_add_column(tmp_path, padding_xlsx_path):
+    # the previous version of the workbook, without the last column
+    (tmp_path / 'old').mkdir()
+    old_xlsx_path = write_workbook(tmp_path / 'old' / 'padding.xlsx', {'ddl_padding': PADDING_SHEETS['ddl_padding'][:-1]})
+    generated_dir = convert(tmp_path, padding_xlsx_path, arguments=['--diff', str(old_xlsx_path)])
+    alter_queries: str = (generated_dir / 'alter_padding.sql').read_text(encoding='utf-8')
+    # the added column is aligned by the widths of the whole table
+    assert f"alter table WIDE_NAMES add (\n\t{'TOTAL'.ljust(50)} NUMBER(10,2) AS (ID * 2) VIRTUAL\n);\n" in alter_queries
@@ -0,0 +1,40 @@
+# with "--workers" the tables are parsed in worker processes, their counters and problems are reported by the main
+# process as in a run with one process
+import json
+
+import pytest
+
+from helpers import build_sample_sheets, convert, write_workbook
+
+
+@pytest.fixture(scope='module')
+def sample_xlsx_path(tmp_path_factory):
+    sheets: dict = build_sample_sheets()
+    # column name which is a reserved word, reported while parsing the DDL sheet
+    sheets['ddl_catalog'][-1][0] = 'LEVEL'
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'sample.xlsx', sheets)
+
+
+def read_counters(generated_dir):
+    """
+    :return: the counters of the profile report summed by name, since the stages of the parallel run are different
+    """
+    counters: dict = {}
+    for stage in json.loads((generated_dir / 'profile.json').read_text(encoding='utf-8'))['stages'].values():
+        for counter_name, amount in stage['counters'].items():
+            counters[counter_name] = counters.get(counter_name, 0) + amount
+    return counters
+
+
+@pytest.mark.parametrize('config', [{}, {'streaming_reader': True}, {'bulk_load_min_rows': 100}])
+def test_workers_report(tmp_path, sample_xlsx_path, config):
+    generated_dir = convert(tmp_path / 'one', sample_xlsx_path, config, ['--profile'])
+    workers_generated_dir = convert(tmp_path / 'workers', sample_xlsx_path, config, ['--profile', '--workers', '2'])
+    counters: dict = read_counters(workers_generated_dir)
+    assert {counter_name: counters.get(counter_name) for counter_name in ('tables', 'columns', 'dml_tables', 'rows')} == \
+        {'tables': 4, 'columns': 13, 'dml_tables': 5, 'rows': 642}
+    assert counters == read_counters(generated_dir)
+
+    report: dict = json.loads((workers_generated_dir / 'diagnostics.json').read_text(encoding='utf-8'))
+    assert report['rules']['reserved_column_name']['tables'] == ['PRODUCT_TAG']
+    assert report == json.loads((generated_dir / 'diagnostics.json').read_text(encoding='utf-8'))
@@ -0,0 +1,81 @@
+# the PostgreSQL output of the workbooks is compared with the expected queries files in "golden/postgresql".
+# after an intended change of the output, rewrite the expected files by running the tests with XLSX2SQL_UPDATE_GOLDEN=1
+import os
+
+import pytest
+
+from helpers import DDL_HEADER, GOLDEN_DIR, TEST_XLSX_PATH, convert, write_workbook
+
+# workbook with empty and whitespace only cells and empty keys (deleted by all of their values, with "is null"),
+# quotes, tabs and backslashes (escaped in "copy"), identities and comments
+NULLS_SHEETS: dict = {
+    'ddl_people': [
+        ['###_ddl', "people''s table"],
+        ['PERSON'],
+        DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, 'default', 20, 'Primary key', None, None, "the person''s id"],
+        ['NAME', 'VARCHAR2(50)', None, None, None, None, None, None, 'Yes', None],
+        ['NICKNAME', 'VARCHAR2(50)', None, None, None, None, None, None, None, 'nick name'],
+        [None],
+        ['###_ddl'],
+        ['ADDRESS'],
+        DDL_HEADER,
+        ['ID', 'NUMBER', 'No', None, 'always', 'nocache', 'Primary key', None, None, None],
+        ['PERSON_ID', 'NUMBER(10)', None, 'PERSON, ID, set null', None, None, None, None, None, None],
+        ['STREET', 'VARCHAR2(100)', None, None, None, None, None, None, None, None],
+    ],
+    'dml_people': [
+        ['###_dml'],
+        ['PERSON'],
+        ['NAME', 'ID', 'NICKNAME'],
+        ["O''Brien", 1, None],
+        ["D'Arcy", 2, 'Dee'],
+        ['tab\there', 3, None],
+        ['back\\slash', 4, None],
+        ['no key', None, '  '],
+        [None],
+        ['###_dml'],
+        ['ADDRESS'],
+        ['ID', 'PERSON_ID', 'STREET'],
+        [1, 1, 'Main street'],
+        [2, ' ', None],
+        [3, 2, '   '],
+    ],
+}
+
+
+def assert_golden_files(generated_dir, stem: str):
+    """
+    compare the queries files of the workbook with the expected ones
+    :param generated_dir: the "generated" directory of the run
+    :param stem: name of the workbook, without suffix
+    """
+    for file_name in (f"queries_{stem}.sql", f"drops_{stem}.sql"):
+        golden_path = GOLDEN_DIR / 'postgresql' / file_name
+        output: str = (generated_dir / file_name).read_text(encoding='utf-8')
+        if os.environ.get('XLSX2SQL_UPDATE_GOLDEN') == '1':
+            golden_path.write_text(output, encoding='utf-8')
+        assert output == golden_path.read_text(encoding='utf-8'), f"{file_name} differs from {golden_path}"
+
+
+@pytest.mark.parametrize('arguments', [[], ['--workers', '2']])
+def test_test_workbook(tmp_path, arguments):
+    generated_dir = convert(tmp_path, TEST_XLSX_PATH, {'dbms_type': 'postgreSQL'}, arguments)
+    assert_golden_files(generated_dir, 'test')
+
+
+@pytest.mark.parametrize('config', [{}, {'streaming_reader': True}])
+def test_nulls_workbook(tmp_path, config):
+    xlsx_path = write_workbook(tmp_path / 'nulls.xlsx', NULLS_SHEETS)
+    generated_dir = convert(tmp_path / 'run', xlsx_path, {'dbms_type': 'postgreSQL', 'key_based_delete': True, **config})
+    assert_golden_files(generated_dir, 'nulls')
+
+
+@pytest.mark.parametrize('insert_batch_size', [1, 2])
+def test_insert_queries(tmp_path, insert_batch_size):
+    # without "copy" the data is written as insert queries (batch insert with "insert_batch_size" rows)
+    stem: str = f"nulls_insert_{insert_batch_size}"
+    xlsx_path = write_workbook(tmp_path / f"{stem}.xlsx", NULLS_SHEETS)
+    generated_dir = convert(tmp_path / 'run', xlsx_path, {'dbms_type': 'postgreSQL', 'key_based_delete': True,
+                                                          'copy_insert': False, 'insert_batch_size': insert_batch_size})
+    assert_golden_files(generated_dir, stem)
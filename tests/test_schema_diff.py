@@ -0,0 +1,108 @@
+# "--diff" writes the queries altering the schema of the previous version of the workbook into the current one
+import json
+
+import pytest
+
+from helpers import DDL_HEADER, build_sample_sheets, convert, read_output_files, write_workbook
+
+DROP_SECTION: str = '\n----------------- Dropping changed Foreign Keys, constraints and indexes -----------------\n'
+ALTER_SECTION: str = '\n-------------------------- Altering tables --------------------------\n'
+ADD_SECTION: str = '\n----------------- Adding changed Foreign Keys, constraints, indexes and comments -----------------\n'
+COMMIT_QUERY: str = '\ncommit;\n/\n'
+
+
+def build_old_sheets():
+    """
+    :return: the sheets of the sample workbook before: CUSTOMER had PHONE instead of CITY and larger identity cache,
+             ORDERS.NOTE was shorter, AUDIT_LOG was dropped and PRODUCT_TAG was added since
+    """
+    sheets: dict = build_sample_sheets()
+    for row_i, row in enumerate(sheets['ddl_orders']):
+        if row[0] == 'ID' and row[4] == 'default':
+            sheets['ddl_orders'][row_i] = [*row[:5], 20, *row[6:]]
+        elif row[0] == 'CITY':
+            sheets['ddl_orders'][row_i] = ['PHONE', 'VARCHAR2(20)', None, None, None, None, None, None, None, None]
+        elif row[0] == 'NOTE':
+            sheets['ddl_orders'][row_i] = ['NOTE', 'VARCHAR2(100)', None, None, None, None, None, None, None, None]
+    product_rows_count: int = [row[0] for row in sheets['ddl_catalog']].index(None)
+    sheets['ddl_catalog'] = sheets['ddl_catalog'][:product_rows_count] + [
+        [None], ['###_ddl'], ['AUDIT_LOG'], DDL_HEADER,
+        ['ID', 'NUMBER(10)', 'No', None, None, None, 'Primary key', None, None, None]]
+    return sheets
+
+
+def split_sections(alter_file_text: str):
+    """
+    :return: the queries of the sections of alter file: dropping constraints, altering tables and adding constraints
+    """
+    assert alter_file_text.endswith(COMMIT_QUERY)
+    alter_file_text = alter_file_text.removesuffix(COMMIT_QUERY)
+    drop_queries, alter_queries = alter_file_text.removeprefix(DROP_SECTION).split(ALTER_SECTION)
+    alter_queries, add_queries = alter_queries.split(ADD_SECTION)
+    return drop_queries, alter_queries, add_queries
+
+
+@pytest.fixture(scope='module')
+def workbooks_paths(tmp_path_factory):
+    """
+    :return: paths of the current and the old version of the workbook (with the same name)
+    """
+    workbooks_dir = tmp_path_factory.mktemp('workbooks')
+    (workbooks_dir / 'old').mkdir()
+    return write_workbook(workbooks_dir / 'sample.xlsx', build_sample_sheets()), \
+        write_workbook(workbooks_dir / 'old' / 'sample.xlsx', build_old_sheets())
+
+
+def test_alter_queries(tmp_path, workbooks_paths):
+    xlsx_path, old_xlsx_path = workbooks_paths
+    generated_dir = convert(tmp_path, xlsx_path, arguments=['--diff', str(old_xlsx_path)])
+    # only the altering files are written
+    assert sorted(read_output_files(generated_dir)) == ['alter_reverse_sample.sql', 'alter_sample.sql']
+
+    drop_queries, alter_queries, add_queries = split_sections((generated_dir / 'alter_sample.sql').read_text())
+    assert drop_queries == ''
+    assert "drop table AUDIT_LOG;\n" in alter_queries
+    assert "alter table CUSTOMER drop (PHONE);\n" in alter_queries
+    assert "alter table CUSTOMER add (\n\tCITY " in alter_queries
+    assert "alter table ORDERS modify (\n\tNOTE                                     VARCHAR2(200)\n);\n" in alter_queries
+    assert "create table PRODUCT_TAG (\n" in alter_queries
+    assert "create table CUSTOMER" not in alter_queries
+    # the constraints are added after all the tables are altered
+    assert add_queries.startswith("create index IDX_CUSTOMER__CITY on CUSTOMER (CITY);\n")
+    assert "alter table PRODUCT_TAG add constraint FK_PRODUCT_TAG__PRODUCT_ID" in add_queries
+
+    drop_queries, alter_queries, add_queries = split_sections((generated_dir / 'alter_reverse_sample.sql').read_text())
+    assert drop_queries == "alter table PRODUCT_TAG\n\t\tdrop constraint FK_PRODUCT_TAG__PRODUCT_ID;\n"
+    assert "drop table PRODUCT_TAG;\n" in alter_queries
+    assert "alter table CUSTOMER drop (CITY);\n" in alter_queries
+    assert "create table AUDIT_LOG (\n" in alter_queries
+    assert add_queries == ''
+
+
+def test_unchanged_schema(tmp_path, workbooks_paths):
+    xlsx_path, _ = workbooks_paths
+    generated_dir = convert(tmp_path, xlsx_path, arguments=['--diff', str(xlsx_path)])
+    assert split_sections((generated_dir / 'alter_sample.sql').read_text()) == ('', '', '')
+
+
+def test_snapshot_and_readers_equivalence(tmp_path, workbooks_paths):
+    xlsx_path, old_xlsx_path = workbooks_paths
+    reference: dict = read_output_files(convert(tmp_path / 'xlsx', xlsx_path, arguments=['--diff', str(old_xlsx_path)]))
+
+    # the schema of the old version saved with "--snapshot"
+    snapshot_dir = convert(tmp_path / 'snapshot', old_xlsx_path, arguments=['--snapshot'])
+    snapshot_diff_dir = convert(tmp_path / 'snapshot_diff', xlsx_path,
+                                arguments=['--diff', str(snapshot_dir / 'schema_sample.json')])
+    assert read_output_files(snapshot_diff_dir) == reference
+
+    streaming_dir = convert(tmp_path / 'streaming', xlsx_path, {'streaming_reader': True},
+                            ['--diff', str(old_xlsx_path)])
+    assert read_output_files(streaming_dir) == reference
+
+
+def test_diagnostics_reported_once(tmp_path, workbooks_paths):
+    xlsx_path, old_xlsx_path = workbooks_paths
+    generated_dir = convert(tmp_path, xlsx_path, arguments=['--diff', str(old_xlsx_path)])
+    # the changed identity is found in both directions, and reported only by the diff (not by the reverse one)
+    report: dict = json.loads((generated_dir / 'diagnostics.json').read_text(encoding='utf-8'))
+    assert report['rules'] == {'identity_changed': {'severity': 'warning', 'count': 1, 'tables': ['CUSTOMER']}}
@@ -0,0 +1,68 @@
+# "--shards" splits the tables into groups without foreign keys between them, each one written into its own files
+import json
+import re
+
+import pytest
+
+from helpers import build_sample_sheets, convert, write_workbook
+
+# the tables created, referenced, inserted into, deleted from or dropped by queries
+TABLE_NAME_PATTERN = re.compile(r"(?:create table|references|insert into|delete from|drop table) (\w+)")
+
+
+@pytest.fixture(scope='module')
+def sample_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'sample.xlsx', build_sample_sheets())
+
+
+def read_tables_names(file_path):
+    """
+    :return: names of the tables used by the queries in the file
+    """
+    return set(TABLE_NAME_PATTERN.findall(file_path.read_text(encoding='utf-8')))
+
+
+def read_statements(file_path, prefix: str):
+    """
+    :return: the statements in the file starting with the prefix (the values of the sample don't contain ";")
+    """
+    lines: list[str] = file_path.read_text(encoding='utf-8').splitlines(keepends=True)
+    # without the titles of the sections
+    text: str = ''.join(line for line in lines if not line.startswith('--'))
+    statements = (statement.strip() for statement in text.split(';\n'))
+    return [statement for statement in statements if statement.startswith(prefix)]
+
+
+@pytest.mark.parametrize('key_based_delete', [False, True])
+def test_fk_isolation(tmp_path, sample_xlsx_path, key_based_delete):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'key_based_delete': key_based_delete}, ['--shards', '4'])
+    manifest: dict = json.loads((generated_dir / 'shards_sample.json').read_text(encoding='utf-8'))
+    # the two groups of connected tables can't be split further
+    assert [shard['tables'] for shard in manifest['shards']] == [['CUSTOMER', 'ORDERS'], ['PRODUCT', 'PRODUCT_TAG']]
+    assert manifest['cycles'] == []
+    for shard in manifest['shards']:
+        assert read_tables_names(generated_dir / shard['queries_file']) == set(shard['tables'])
+        assert read_tables_names(generated_dir / shard['drops_file']) == set(shard['tables'])
+
+    # DML of table which is not created by the workbook runs after all the shards
+    assert manifest['after_shards']['tables'] == ['LEGACY_SETTING']
+    assert read_tables_names(generated_dir / manifest['after_shards']['queries_file']) == {'LEGACY_SETTING'}
+    assert read_tables_names(generated_dir / manifest['after_shards']['drops_file']) == {'LEGACY_SETTING'}
+
+    # the shards have all the queries of the whole workbook
+    whole_dir = convert(tmp_path / 'whole', sample_xlsx_path, {'key_based_delete': key_based_delete})
+    files_names: list = [file_name for shard in manifest['shards'] + [manifest['after_shards']]
+                         for file_name in (shard['queries_file'], shard['drops_file'])]
+    for prefix in ('create table', 'alter table', 'insert into', 'delete from', 'drop table'):
+        shards_statements: list = [statement for file_name in files_names
+                                   for statement in read_statements(generated_dir / file_name, prefix)]
+        whole_statements: list = read_statements(whole_dir / 'queries_sample.sql', prefix) + \
+            read_statements(whole_dir / 'drops_sample.sql', prefix)
+        assert sorted(shards_statements) == sorted(whole_statements)
+
+
+def test_single_shard(tmp_path, sample_xlsx_path):
+    generated_dir = convert(tmp_path, sample_xlsx_path, arguments=['--shards', '1'])
+    manifest: dict = json.loads((generated_dir / 'shards_sample.json').read_text(encoding='utf-8'))
+    assert len(manifest['shards']) == 1
+    assert sorted(manifest['shards'][0]['tables']) == ['CUSTOMER', 'ORDERS', 'PRODUCT', 'PRODUCT_TAG']
@@ -0,0 +1,62 @@
+# the parts of split (and compressed) output files are listed in the manifest, in the order they should run
+import gzip
+import hashlib
+import json
+
+import pytest
+
+from helpers import build_sample_sheets, convert, write_workbook
+
+COMMIT_QUERY: str = "\ncommit;\n/\n"
+
+
+@pytest.fixture(scope='module')
+def sample_xlsx_path(tmp_path_factory):
+    return write_workbook(tmp_path_factory.mktemp('workbook') / 'sample.xlsx', build_sample_sheets())
+
+
+def read_manifest(generated_dir):
+    return json.loads((generated_dir / 'queries_sample_manifest.json').read_text(encoding='utf-8'))
+
+
+@pytest.mark.parametrize('is_compressed', [False, True])
+def test_manifest_lists_the_parts(tmp_path, sample_xlsx_path, is_compressed):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'split_output_statements': 30, 'compress_output': is_compressed})
+    manifest: dict = read_manifest(generated_dir)
+    suffix: str = '.sql.gz' if is_compressed else '.sql'
+    for stem, parts in (('queries_sample', manifest['queries_files']), ('drops_sample', manifest['drops_files'])):
+        assert len(parts) > 1
+        assert [part['file'] for part in parts] == [f"{stem}_part_{part_number:03d}{suffix}"
+                                                    for part_number in range(1, len(parts) + 1)]
+        for part in parts:
+            content: bytes = (generated_dir / part['file']).read_bytes()
+            assert part['bytes'] == len(content)
+            assert part['sha256'] == hashlib.sha256(content).hexdigest()
+            assert 0 < part['statements'] <= 30
+            if is_compressed:
+                content = gzip.decompress(content)
+            assert content.decode('utf-8').endswith(COMMIT_QUERY)
+    # only the parts are written, without the whole files
+    assert not (generated_dir / 'queries_sample.sql').exists()
+    assert not list(generated_dir.glob('*.tmp'))
+
+
+def test_split_by_size(tmp_path, sample_xlsx_path):
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'split_output_mb': 0.01})
+    parts: list[dict] = read_manifest(generated_dir)['queries_files']
+    assert len(parts) > 1
+    # each part is split between statements, so only a single statement can exceed the size
+    assert all(part['bytes'] <= 0.01 * 1024 * 1024 for part in parts)
+
+
+def test_stale_parts_are_removed(tmp_path, sample_xlsx_path):
+    convert(tmp_path, sample_xlsx_path, {'split_output_statements': 20})
+    generated_dir = convert(tmp_path, sample_xlsx_path, {'split_output_statements': 200})
+    written_files: set = {part['file'] for parts in read_manifest(generated_dir).values() for part in parts}
+    assert {file_path.name for file_path in generated_dir.glob('*_part_*')} == written_files
+
+    # without splitting, the parts of the previous run and their manifest are removed as well
+    generated_dir = convert(tmp_path, sample_xlsx_path)
+    assert not list(generated_dir.glob('*_part_*'))
+    assert not (generated_dir / 'queries_sample_manifest.json').exists()
+    assert (generated_dir / 'queries_sample.sql').exists()
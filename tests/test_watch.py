@@ -0,0 +1,71 @@
+# "--watch" converts the workbook again whenever it is saved, parsing again only the tables which changed
+import subprocess
+import time
+
+import pytest
+
+from helpers import DDL_HEADER, build_sample_sheets, convert, read_output_files, write_config, write_workbook
+
+POLL_INTERVAL: float = 0.1
+TIMEOUT_SECONDS: float = 30
+
+
+def save_workbook(xlsx_path, sheets: dict):
+    """
+    replace the workbook at once, so the watching process never reads a partly written file
+    """
+    write_workbook(xlsx_path.with_name('saving.xlsx'), sheets).replace(xlsx_path)
+
+
+def wait_for_log(log_path, text: str, count: int = 1):
+    """
+    wait until the text appears the given number of times in the output of the watching process
+    :return: the output of the process
+    """
+    deadline: float = time.monotonic() + TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        output: str = log_path.read_text(encoding='utf-8')
+        if output.count(text) >= count:
+            return output
+        time.sleep(POLL_INTERVAL)
+    raise AssertionError(f"'{text}' was not logged {count} times:\n{log_path.read_text(encoding='utf-8')}")
+
+
+@pytest.fixture
+def watch_process(tmp_path):
+    """
+    :return: the workbook path, the log path and the "generated" directory of a process watching the workbook
+    """
+    xlsx_path = write_workbook(tmp_path / 'sample.xlsx', build_sample_sheets())
+    log_path = tmp_path / 'watch.log'
+    with open(log_path, 'w', encoding='utf-8') as log_file:
+        process = subprocess.Popen([*write_config(tmp_path / 'watch', xlsx_path), '--watch', str(POLL_INTERVAL)],
+                                   cwd=tmp_path / 'watch', stdout=log_file, stderr=subprocess.STDOUT)
+    try:
+        yield xlsx_path, log_path, tmp_path / 'watch' / 'generated'
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_regenerate_on_change(tmp_path, watch_process):
+    xlsx_path, log_path, generated_dir = watch_process
+    output: str = wait_for_log(log_path, 'converted in')
+    assert '9 tables parsed, 0 tables unchanged' in output
+    assert read_output_files(generated_dir) == read_output_files(convert(tmp_path / 'first', xlsx_path))
+
+    # a changed DML table is parsed again, the other tables are taken from the previous conversion
+    sheets: dict = build_sample_sheets()
+    sheets['dml_catalog'][-1] = ['level', 4]
+    save_workbook(xlsx_path, sheets)
+    output = wait_for_log(log_path, 'converted in', 2)
+    assert '1 tables parsed, 8 tables unchanged' in output
+    assert read_output_files(generated_dir) == read_output_files(convert(tmp_path / 'second', xlsx_path))
+
+    # a failed conversion keeps the files of the previous one
+    expected_output_files: dict = read_output_files(generated_dir)
+    sheets['ddl_broken'] = [['###_ddl'], ['BROKEN'], DDL_HEADER,
+                            ['PARENT_ID', 'NUMBER(10)', None, 'PARENT', None, None, None, None, None, None]]
+    save_workbook(xlsx_path, sheets)
+    wait_for_log(log_path, 'failed, waiting for the next change')
+    assert read_output_files(generated_dir) == expected_output_files
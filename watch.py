@@ -0,0 +1,140 @@
+# this file is used to keep the script running and convert the workbook again whenever it changes, when running
+# with "--watch"
+import hashlib
+import os
+import pathlib
+import time
+
+from config import Config
+from diagnostics import diagnostics
+from logger import logger
+from queries_writer import QueriesFilesWriter
+from regeneration_cache import indexed_block_cells_text
+from xlsx2sql import *
+
+
+def workbook_state(xlsx_path: pathlib.Path):
+    """
+    :param xlsx_path: path of the watched file
+    :return: (modification time in nanoseconds, size) of the file, None if it doesn't exist
+    """
+    try:
+        stat_result = os.stat(xlsx_path)
+    except FileNotFoundError:
+        return None
+    return stat_result.st_mtime_ns, stat_result.st_size
+
+
+def table_hash(block_raw, block: Block):
+    """
+    :param block_raw: the matrix containing the table
+    :param block: location of the table in the matrix
+    :return: hash of the table's cells, and of the key of DML table (its delete queries depend on the DDL sheets)
+    """
+    extra_text: str = str(Config.tables_keys.get(block.table_name)) if block.block_type == 'dml' else ''
+    cells_text: str = f"{block.block_type}\x1e{indexed_block_cells_text(block_raw, block)}\x1e{extra_text}"
+    return hashlib.sha256(cells_text.encode('utf-8')).hexdigest()
+
+
+class WorkbookWatcher:
+    """
+    convert the workbook whenever it changes, the results of each table are kept in memory between the conversions,
+    so only the tables which changed are parsed again
+    """
+    def __init__(self):
+        # hash of table (see "table_hash") to its "Table" for DDL table or its (QueryType, query) for DML table,
+        # and the problems found in it
+        self.tables_results: dict = {}
+        self.used_hashes: set[str] = set()
+        self.parsed_count: int = 0
+        self.reused_count: int = 0
+
+    def get_table_result(self, block_raw, block: Block, create_result):
+        """
+        :param block_raw: the matrix containing the table
+        :param block: location of the table in the matrix
+        :param create_result: function creating the result of the table, used when the table changed
+        :return: the result of the table, from the previous conversion if the table didn't change
+        """
+        current_hash: str = table_hash(block_raw, block)
+        self.used_hashes.add(current_hash)
+        if current_hash in self.tables_results:
+            self.reused_count += 1
+            previous_result, previous_entries = self.tables_results[current_hash]
+            # the problems of the table are reported in each conversion, until they are fixed
+            diagnostics.replay(previous_entries)
+            return previous_result
+
+        self.parsed_count += 1
+        diagnostics_mark: int = diagnostics.mark()
+        result = create_result()
+        self.tables_results[current_hash] = (result, diagnostics.entries_since(diagnostics_mark))
+        return result
+
+    def convert(self):
+        """
+        convert the workbook into the queries files, the sheets are read by the reader set in the config file
+        (as in "main.py"). a streamed workbook is read twice, since the DDL tables are needed before the DML queries
+        """
+        self.parsed_count = self.reused_count = 0
+        self.used_hashes = set()
+        diagnostics.reset()
+        if Config.is_streaming_reader:
+            read_sheets = lambda: xlsx_to_streamed_sheets(Config.input_file_absolute_path)
+        else:
+            sheets: list[Sheet] = xlsx_to_sheets(Config.input_file_absolute_path)
+            read_sheets = lambda: sheets
+
+        ddl_tables: list[Table] = []
+        for sheet in read_sheets():
+            if sheet.sheet_name.startswith('ddl_'):
+                for block_raw, block in iter_sheet_indexed_blocks(sheet, 'ddl'):
+                    ddl_tables.append(self.get_table_result(
+                        block_raw, block, lambda: create_ddl_table(block_raw, block.marker_row)))
+        if Config.is_key_based_delete:
+            Config.tables_keys = create_tables_keys(ddl_tables)
+
+        # each output file is replaced only when it is complete (see "OutputFile")
+        with QueriesFilesWriter() as writer:
+            for sheet in read_sheets():
+                if sheet.sheet_name.startswith('dml_'):
+                    for block_raw, block in iter_sheet_indexed_blocks(sheet, 'dml'):
+                        writer.write_queries(self.get_table_result(
+                            block_raw, block, lambda: list(iter_dml_block_queries(block_raw, block))))
+            writer.write_queries(iter_ddl_queries(ddl_tables))
+        diagnostics.write_summary()
+
+        # results of deleted (or changed) tables are not kept
+        for stale_hash in set(self.tables_results) - self.used_hashes:
+            del self.tables_results[stale_hash]
+
+    def watch(self, poll_interval: float):
+        """
+        poll the modification time and size of the workbook, and convert it when they change (until stopped by Ctrl+C).
+        the conversion starts only after the file didn't change for one more interval, so a file being saved is not read
+        :param poll_interval: seconds between checks of the workbook
+        """
+        xlsx_path = Config.input_file_absolute_path
+        converted_state = None
+        previous_state = None
+        logger.info(f"watching {xlsx_path} for changes, press Ctrl+C to stop")
+        try:
+            while True:
+                current_state = workbook_state(xlsx_path)
+                if current_state is not None and current_state == previous_state and current_state != converted_state:
+                    start_time: float = time.perf_counter()
+                    try:
+                        self.convert()
+                    # fatal errors are logged and then "exit()" is called, the files of the last conversion are kept
+                    except (Exception, SystemExit) as error:
+                        logger.error(f"Converting {xlsx_path} failed, waiting for the next change: {error!r}")
+                    else:
+                        end_time: float = time.perf_counter()
+                        logger.info(f"converted in {end_time - start_time:.3f}s ({time.time() - current_state[0] / 1e9:.3f}s "
+                                    f"since the workbook was saved): {self.parsed_count} tables parsed, "
+                                    f"{self.reused_count} tables unchanged")
+                    converted_state = current_state
+                previous_state = current_state
+                time.sleep(poll_interval)
+        except KeyboardInterrupt:
+            logger.info("stopped watching")
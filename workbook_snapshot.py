@@ -0,0 +1,106 @@
+# this file is used to save the sheets read by "xlsx_to_raw_data" into binary snapshot, so next runs on the same
+# workbook load the snapshot instead of parsing the xlsx again
+import hashlib
+import json
+import pathlib
+import shutil
+
+from config import Config
+from definitions import Sheet
+from logger import logger
+
+# change it when the format of the snapshot changes
+SNAPSHOT_FORMAT_VERSION: int = 1
+# size of each chunk read when hashing the xlsx file
+HASH_CHUNK_SIZE: int = 1024 * 1024
+
+
+def file_hash(file_path: pathlib.Path):
+    """
+    :param file_path: path of the file
+    :return: sha256 of the file's content
+    """
+    content_hash = hashlib.sha256()
+    with open(file_path, 'rb') as hashed_file:
+        while True:
+            chunk: bytes = hashed_file.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def workbook_snapshot_dir_path(xlsx_file_path: pathlib.Path):
+    """
+    :param xlsx_file_path: path of the xlsx file
+    :return: directory of the snapshot of the workbook
+    """
+    return pathlib.Path(Config.output_dir_path, "snapshot", pathlib.Path(xlsx_file_path).stem)
+
+
+def load_workbook_snapshot(xlsx_file_path: pathlib.Path, xlsx_hash: str):
+    """
+    :param xlsx_file_path: path of the xlsx file
+    :param xlsx_hash: sha256 of the xlsx file, the snapshot is used only if it was saved from the same content
+    :return: list of "Sheet"(s) identical to the ones read by "xlsx_to_raw_data", None if there is no valid snapshot
+    """
+    import numpy as np
+
+    snapshot_dir_path = workbook_snapshot_dir_path(xlsx_file_path)
+    try:
+        with open(pathlib.Path(snapshot_dir_path, "manifest.json"), 'r', encoding='utf-8') as manifest_file:
+            manifest: dict = json.load(manifest_file)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != SNAPSHOT_FORMAT_VERSION or manifest.get('xlsx_sha256') != xlsx_hash:
+        return None
+
+    sheets: list[Sheet] = []
+    try:
+        for sheet_i, sheet_values in enumerate(manifest['sheets']):
+            # the arrays are memory mapped, only the cells are copied into the sheet's matrix
+            rows = np.load(pathlib.Path(snapshot_dir_path, f"{sheet_i}_rows.npy"), mmap_mode='r')
+            columns = np.load(pathlib.Path(snapshot_dir_path, f"{sheet_i}_columns.npy"), mmap_mode='r')
+            values = np.load(pathlib.Path(snapshot_dir_path, f"{sheet_i}_values.npy"), mmap_mode='r')
+            sheet_raw = np.full(tuple(sheet_values['shape']), 'nan', dtype=sheet_values['dtype'])
+            sheet_raw[rows, columns] = values
+            sheet: Sheet = Sheet(sheet_values['name'])
+            sheet.sheet_raw = sheet_raw
+            sheets.append(sheet)
+    except (OSError, ValueError, KeyError, IndexError) as error:
+        logger.warning(f"The workbook snapshot in {snapshot_dir_path} is damaged, parsing the xlsx file: {error!r}")
+        return None
+    return sheets
+
+
+def save_workbook_snapshot(xlsx_file_path: pathlib.Path, xlsx_hash: str, sheets: list[Sheet]):
+    """
+    save the used cells (which are not 'nan') of each sheet by columns: their rows, their columns and their values,
+    each one in ".npy" file which can be memory mapped. the previous snapshot of the workbook is replaced
+    :param xlsx_file_path: path of the xlsx file
+    :param xlsx_hash: sha256 of the xlsx file
+    :param sheets: the sheets read by "xlsx_to_raw_data"
+    """
+    import numpy as np
+
+    snapshot_dir_path = workbook_snapshot_dir_path(xlsx_file_path)
+    # written into temporary directory first, so a stopped run doesn't leave partial snapshot
+    temp_dir_path = snapshot_dir_path.with_name(f"{snapshot_dir_path.name}.tmp")
+    shutil.rmtree(temp_dir_path, ignore_errors=True)
+    temp_dir_path.mkdir(parents=True)
+
+    manifest: dict = {'version': SNAPSHOT_FORMAT_VERSION, 'xlsx_sha256': xlsx_hash, 'sheets': []}
+    for sheet_i, sheet in enumerate(sheets):
+        # column major order, so the cells of each column are stored together
+        columns, rows = np.nonzero(sheet.sheet_raw.T != 'nan')
+        np.save(pathlib.Path(temp_dir_path, f"{sheet_i}_rows.npy"), rows.astype(np.int32))
+        np.save(pathlib.Path(temp_dir_path, f"{sheet_i}_columns.npy"), columns.astype(np.int32))
+        np.save(pathlib.Path(temp_dir_path, f"{sheet_i}_values.npy"), sheet.sheet_raw[rows, columns])
+        manifest['sheets'].append({'name': sheet.sheet_name, 'shape': list(sheet.sheet_raw.shape),
+                                   'dtype': sheet.sheet_raw.dtype.str})
+    with open(pathlib.Path(temp_dir_path, "manifest.json"), 'w', encoding='utf-8') as manifest_file:
+        json.dump(manifest, manifest_file, indent=4)
+
+    shutil.rmtree(snapshot_dir_path, ignore_errors=True)
+    temp_dir_path.rename(snapshot_dir_path)
+    logger.debug(f"snapshot of {xlsx_file_path} has been written into {snapshot_dir_path}")
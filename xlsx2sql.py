@@ -1,10 +1,15 @@
+# pandas, numpy and openpyxl are imported only in the functions using them, since importing them takes a large part
+# of the runtime for small workbooks (python caches imported modules, so it is done only once)
 import re
-import pandas as pd
-import numpy as np
 
 from config import Config
 from definitions import *
+from dependency_graph import sort_tables_by_dependencies
+from diagnostics import diagnostics
 from logger import logger
+from profiler import profiler
+from queries_writer import QueriesFilesWriter
+from sql_dbms import unescape_quotes
 
 
 def xlsx_to_raw_data(xlsx_file_path):
@@ -12,6 +17,18 @@ def xlsx_to_raw_data(xlsx_file_path):
     :param xlsx_file_path: full path of xlsx file, containing the DB design
     :return: List of Sheets ,to be processed in memory
     """
+    if Config.is_workbook_snapshot:
+        from workbook_snapshot import file_hash, load_workbook_snapshot, save_workbook_snapshot
+        xlsx_hash: str = file_hash(xlsx_file_path)
+        snapshot_sheets = load_workbook_snapshot(xlsx_file_path, xlsx_hash)
+        if snapshot_sheets is not None:
+            logger.debug(f"{xlsx_file_path} didn't change, its sheets have been loaded from its snapshot")
+            return snapshot_sheets
+
+    # imported after loading the snapshot, which doesn't need pandas
+    import numpy as np
+    import pandas as pd
+
     # will contain all the workbook sheets as a list of matrixes
     all_sheets: list[Sheet] = []
 
@@ -31,28 +48,290 @@ def xlsx_to_raw_data(xlsx_file_path):
         sheet.sheet_raw = raw_data
         all_sheets.append(sheet)
 
+    if Config.is_workbook_snapshot:
+        save_workbook_snapshot(xlsx_file_path, xlsx_hash, all_sheets)
     return all_sheets
 
 
-def create_sheet_ddl_tables(sheet_raw):
+# strings that pandas parses as missing values ("STR_NA_VALUES" of the pandas version in requirements.txt), the
+# streaming reader treats them the same to produce identical queries
+PANDAS_NA_STRINGS: frozenset = frozenset(
+    {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA',
+     'NULL', 'NaN', 'n/a', 'nan', 'null'})
+
+
+def cell_to_str(value):
+    """
+    convert a cell value read by openpyxl into the same string "xlsx_to_raw_data" would have in its matrix
+    :param value: cell value as returned by openpyxl
+    :return: the string representation of the cell, 'nan' for an empty cell
+    """
+    if value is None:
+        return 'nan'
+    if isinstance(value, str):
+        return 'nan' if value in PANDAS_NA_STRINGS else value
+    # pandas turns whole floats into int (1.0 --> 1)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def xlsx_to_streamed_sheets(xlsx_file_path):
+    """
+    read-only alternative to "xlsx_to_raw_data", the sheets are not loaded into memory but their rows are read lazily
+    :param xlsx_file_path: full path of xlsx file, containing the DB design
+    :return: generator of Sheets, each one with "sheet_rows" that must be consumed before moving to the next Sheet
+    """
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(xlsx_file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        for worksheet in workbook.worksheets:
+            sheet: Sheet = Sheet(worksheet.title)
+            sheet.sheet_rows = worksheet.iter_rows(values_only=True)
+            yield sheet
+    finally:
+        workbook.close()
+
+
+def xlsx_to_sparse_sheets(xlsx_file_path):
+    """
+    alternative to "xlsx_to_raw_data" holding only the tables of the sheets in memory: the rows are read once (like
+    "xlsx_to_streamed_sheets") and each table is kept as a separate matrix, so the memory depends on the tables and not
+    on the used range of the sheet (for example a formatted cell far away from the tables)
+    :param xlsx_file_path: full path of xlsx file, containing the DB design
+    :return: List of Sheets, each one with "sheet_blocks" of its selected tables
+    """
+    all_sheets: list[Sheet] = []
+    for streamed_sheet in xlsx_to_streamed_sheets(xlsx_file_path):
+        sheet: Sheet = Sheet(streamed_sheet.sheet_name)
+        sheet.sheet_raw = None
+        sheet.sheet_blocks = []
+        for block_type in ('ddl', 'dml'):
+            if sheet.sheet_name.startswith(f"{block_type}_"):
+                sheet.sheet_blocks = [(block_raw, index_block(block_raw, block_type, 1))
+                                      for block_raw in iter_sheet_blocks(streamed_sheet.sheet_rows, block_type)]
+        all_sheets.append(sheet)
+    return all_sheets
+
+
+def xlsx_to_sheets(xlsx_file_path):
+    """
+    :param xlsx_file_path: full path of xlsx file, containing the DB design
+    :return: List of Sheets held in memory, sparse if "sparse_reader" is set in the config file
+    """
+    if Config.is_sparse_reader:
+        return xlsx_to_sparse_sheets(xlsx_file_path)
+    return xlsx_to_raw_data(xlsx_file_path)
+
+
+# number of cells read by "create_ddl_table" in each row of DDL table
+DDL_TABLE_WIDTH: int = 10
+# minimal number of contiguous numeric keys deleted by range instead of listing them
+MIN_DELETE_RANGE_LENGTH: int = 3
+# DDL data types holding only integers, keys of other types (such as NUMBER(10,2)) are never deleted by range
+INTEGER_DATA_TYPE_PATTERN = re.compile(r"(INTEGER|INT|SMALLINT|BIGINT|NUMBER\s*\(\s*\d+\s*(,\s*0\s*)?\))")
+
+
+def is_block_start(cell_value: str, block_type: str):
+    """
+    :param cell_value: the first cell of a row
+    :param block_type: 'ddl' or 'dml'
+    :return: True if a table of this type starts in the row
+    """
+    if block_type == 'ddl':
+        return cell_value.startswith('###_ddl')
+    return cell_value == '###_dml'
+
+
+def is_table_selected(table_name: str):
+    """
+    tables can be included or excluded by their names in the config file ("include_tables"/"exclude_tables")
+    :param table_name: upper case table name
+    :return: True if the table should be converted
+    """
+    if Config.included_tables and table_name not in Config.included_tables:
+        return False
+    return table_name not in Config.excluded_tables
+
+
+def create_block(sheet_raw, block_type: str, marker_row: int, data_end_row: int):
+    """
+    :param sheet_raw: matrix containing the table
+    :param block_type: 'ddl' or 'dml'
+    :param marker_row: the row of "###_ddl"/"###_dml"
+    :param data_end_row: the row ending the table
+    :return: "Block" of the table
+    """
+    import numpy as np
+
+    block: Block = Block()
+    block.block_type = block_type
+    block.table_name = sheet_raw[marker_row + 1, 1].upper().strip()
+    block.marker_row = marker_row
+    block.header_row = marker_row + 2
+    block.data_start_row = marker_row + 3
+    block.data_end_row = data_end_row
+    if block_type == 'dml':
+        # columns names end in the first empty cell, the empty column added at the end of the matrix ensures it exists
+        block.width = int(np.flatnonzero(sheet_raw[block.header_row, 1:] == 'nan')[0])
+    else:
+        block.width = DDL_TABLE_WIDTH
+    return block
+
+
+def find_blocks_starts(first_column, block_type: str):
+    """
+    vectorized "is_block_start"
+    :param first_column: array of cells of the first column
+    :param block_type: 'ddl' or 'dml'
+    :return: array with True for each row in which a table of this type starts
+    """
+    import numpy as np
+
+    if block_type == 'ddl':
+        return np.char.startswith(first_column.astype(str), '###_ddl')
+    return first_column == '###_dml'
+
+
+def index_sheet_blocks(sheet_raw, block_type: str):
+    """
+    scan the first column of the sheet once, and find the location of each table in the sheet.
+    a table ends in the first empty row or next table, the empty row added at the end of the matrix ensures it exists
+    :param sheet_raw: matrix sheet containing tables
+    :param block_type: 'ddl' or 'dml', the type of tables to find
+    :return: list of "Block" of the selected tables (see "is_table_selected"), by their order in the sheet
+    """
+    import numpy as np
+
+    first_column = sheet_raw[:, 1]
+    is_start = find_blocks_starts(first_column, block_type)
+    end_rows = np.flatnonzero(is_start | (first_column == 'nan'))
+
+    blocks: list[Block] = []
+    next_start_row: int = 1
+    for marker_row in np.flatnonzero(is_start).tolist():
+        # table name and columns names rows can't start a new table
+        if marker_row < next_start_row:
+            continue
+        if marker_row + 3 >= sheet_raw.shape[0]:
+            diagnostics.warning('missing_table_header', f"The table in row {marker_row} is missing its name or columns names")
+            break
+        next_start_row = marker_row + 3
+        data_end_row: int = int(end_rows[np.searchsorted(end_rows, marker_row + 3)])
+        block: Block = create_block(sheet_raw, block_type, marker_row, data_end_row)
+        if is_table_selected(block.table_name):
+            blocks.append(block)
+    return blocks
+
+
+def index_block(sheet_raw, block_type: str, marker_row: int):
+    """
+    same as "index_sheet_blocks", for a single table whose location is known
+    :param sheet_raw: matrix containing the table
+    :param block_type: 'ddl' or 'dml'
+    :param marker_row: the row of "###_ddl"/"###_dml"
+    :return: "Block" of the table
+    """
+    import numpy as np
+
+    first_cells = sheet_raw[marker_row + 3:, 1]
+    rows_count: int = int(np.flatnonzero(find_blocks_starts(first_cells, block_type) | (first_cells == 'nan'))[0])
+    return create_block(sheet_raw, block_type, marker_row, marker_row + 3 + rows_count)
+
+
+def rows_to_block_raw(block_rows: list):
+    """
+    build a padded matrix from the rows of a single table, in the same format "xlsx_to_raw_data" builds a whole sheet
+    :param block_rows: rows of cells values, starting with the "###_ddl"/"###_dml" row
+    :return: matrix in which the "###_ddl"/"###_dml" cell is in position [1, 1]
+    """
+    import numpy as np
+
+    width: int = max(len(row) for row in block_rows)
+    block_raw = np.full((len(block_rows) + 2, width + 2), 'nan', dtype=object)
+    for row_i, row in enumerate(block_rows, start=1):
+        for column_i, value in enumerate(row, start=1):
+            block_raw[row_i, column_i] = cell_to_str(value)
+    return block_raw
+
+
+def iter_sheet_blocks(sheet_rows, block_type: str):
+    """
+    split streamed sheet rows into tables, so only one table at a time is held in memory
+    :param sheet_rows: iterator of rows of cells values, as given by "xlsx_to_streamed_sheets"
+    :param block_type: 'ddl' or 'dml', the type of tables to find
+    :return: generator of padded matrixes, one for each selected table in the sheet (see "is_table_selected")
+    """
+    def is_selected(rows: list):
+        # the matrix is not created for tables which are not selected
+        return len(rows) > 1 and is_table_selected(cell_to_str(rows[1][0] if rows[1] else None).upper().strip())
+
+    block_rows: list = []
+    # the rows are padded up to the last used column of the sheet, only the columns of the table are kept
+    columns_count: int = 0
+    for row in sheet_rows:
+        first_cell: str = cell_to_str(row[0]) if row else 'nan'
+        if is_block_start(first_cell, block_type):
+            if is_selected(block_rows):
+                yield rows_to_block_raw(block_rows)
+            block_rows = [row]
+        elif block_rows:
+            # table name and columns names rows are always part of the table, after them an empty cell ends the table
+            if len(block_rows) < 2:
+                block_rows.append(row)
+            elif len(block_rows) == 2:
+                if block_type == 'ddl':
+                    columns_count = DDL_TABLE_WIDTH
+                else:
+                    # the columns names end in the first empty cell, the column after them is kept as well
+                    columns_count = next((column_i for column_i, value in enumerate(row) if cell_to_str(value) == 'nan'),
+                                         len(row)) + 1
+                block_rows = [block_row[:columns_count] for block_row in block_rows + [row]]
+            elif first_cell != 'nan':
+                block_rows.append(row[:columns_count])
+            else:
+                if is_selected(block_rows):
+                    yield rows_to_block_raw(block_rows)
+                block_rows = []
+    if is_selected(block_rows):
+        yield rows_to_block_raw(block_rows)
+
+
+def iter_sheet_indexed_blocks(sheet: Sheet, block_type: str):
+    """
+    :param sheet: "Sheet" either loaded into memory (dense or sparse) or streamed
+    :param block_type: 'ddl' or 'dml', the type of tables to find
+    :return: generator of (matrix, "Block") of each selected table in the sheet
+    """
+    if sheet.sheet_blocks is not None:
+        for block_raw, block in sheet.sheet_blocks:
+            if block.block_type == block_type:
+                yield block_raw, block
+    elif sheet.sheet_rows is not None:
+        for block_raw in iter_sheet_blocks(sheet.sheet_rows, block_type):
+            yield block_raw, index_block(block_raw, block_type, 1)
+    else:
+        for block in index_sheet_blocks(sheet.sheet_raw, block_type):
+            yield sheet.sheet_raw, block
+
+
+def create_sheet_ddl_tables(sheet: Sheet):
     """
     for each table in this sheet, create Table object to be used later
-    :param sheet_raw: get raw data in the format of multiple matrix(es) in each "Sheet" and fill with it "Table"(s) class
+    :param sheet: DDL "Sheet" either loaded into memory (dense or sparse) or streamed
     :return: list of "Table"(s) from which DDL queries can be created.
     """
-    ddl_tables: list[Table] = []
-    # loop through each first cell in each row the sheet
-    row_number: int = 1
-    while row_number < sheet_raw.shape[0]:  # sheet.sheet_raw.shape[0]   --> sheet's max row number
-        cell_value: str = sheet_raw[row_number, 1]
-        if cell_value.startswith('###_ddl'):
-            table: Table() = create_ddl_table(sheet_raw, row_number)
-            # increase row index by number of table column + 3 rows ("###_ddd", table name, columns metadata)
-            row_number += len(table.columns) + 3
-            ddl_tables.append(table)
-        else:
-            row_number += 1
-    return ddl_tables
+    return [create_ddl_table(block_raw, block.marker_row) for block_raw, block in iter_sheet_indexed_blocks(sheet, 'ddl')]
+
+
+def optional_cell(cell_value: str):
+    """
+    :param cell_value: value of a cell in the sheet matrix
+    :return: None for an empty cell, otherwise the value
+    """
+    return None if cell_value == 'nan' else cell_value
+
 
 def create_ddl_table(sheet_raw, row_i: int):
     """
@@ -64,16 +343,16 @@ def create_ddl_table(sheet_raw, row_i: int):
     table: Table = Table()
 
     table.name = sheet_raw[row_i + 1, 1].upper().strip()
+    # fatal problems are reported and the parsing continues, so all of them are found in one run
     if table.name in Config.sql_type_config.reserved_keywords:
-        logger.warning(f"The table name {table.name} cannot be used since it is a reserved word")
-        exit()
+        diagnostics.fatal('reserved_table_name', f"The table name {table.name} cannot be used since it is a reserved word",
+                          table.name)
 
     # handle the comment for table and name of table
-    table.comment = sheet_raw[row_i, 2]
+    table.comment = optional_cell(sheet_raw[row_i, 2])
     # check if comment contains odd number of single quote, which will cause problem in queries
-    if table.comment.count('\'') % 2 != 0:
-        logger.error(f"The table {table.name} contains non-escaped single quote")
-        exit()
+    if table.comment is not None and table.comment.count('\'') % 2 != 0:
+        diagnostics.fatal('unescaped_table_comment', f"The table {table.name} contains non-escaped single quote", table.name)
 
     # handle unique constraint on multiple columns. todo can simplify regex
     multi_unique = re.findall(r"\[(.*)]", sheet_raw[row_i, 3].upper().replace(' ', ''))
@@ -82,20 +361,29 @@ def create_ddl_table(sheet_raw, row_i: int):
     # start to add and parse all columns one by one
     row_i += 3
     while sheet_raw[row_i, 1] != 'nan' and not sheet_raw[row_i, 1].startswith('###_ddl'):
+        (column_name, data_type, nullable, foreign_key, identity, cache, constraint, default_value, indexed,
+         comment) = [optional_cell(cell_value) for cell_value in sheet_raw[row_i, 1:DDL_TABLE_WIDTH + 1].tolist()]
         table_column = TableColumn()
-        table_column.name = sheet_raw[row_i, 1].upper().strip()
+        table_column.name = column_name.upper().strip()
         if table_column.name in Config.sql_type_config.reserved_keywords:
-            logger.warning(f"Error: The column name {table.name}.{table_column.name} cannot be used since it is a reserved word")
-        table_column.data_type = sheet_raw[row_i, 2].upper().strip()
-        table_column.is_nullable = sheet_raw[row_i, 3].lower().strip()
-        table_column.foreign_key = sheet_raw[row_i, 4].upper().strip()
-        table_column.identity = sheet_raw[row_i, 5].lower().strip()
-        table_column.cache = sheet_raw[row_i, 6].strip()
-        table_column.constraint = sheet_raw[row_i, 7]
+            diagnostics.warning('reserved_column_name', f"Error: The column name {table.name}.{table_column.name} "
+                                                        f"cannot be used since it is a reserved word",
+                                table.name, table_column.name)
+        table_column.data_type = data_type.upper().strip() if data_type is not None else None
+        table_column.is_nullable = nullable is None or nullable.lower().strip() != 'no'
+        table_column.foreign_key = foreign_key.upper().strip() if foreign_key is not None else None
+        if identity is not None:
+            try:
+                table_column.identity = Identity(identity.lower().strip())
+            except ValueError:
+                diagnostics.error('wrong_identity', f'Wrong input for identity column in table {table.name}, '
+                                  f'column {table_column.name}', table.name, table_column.name)
+        table_column.cache = cache.strip() if cache is not None else None
+        table_column.constraint = constraint
         # excel have problem with leading apostrophe('), so we using double quote (") and need to replace it here
-        table_column.default_value = sheet_raw[row_i, 8].strip().replace('"', '\'')
-        table_column.is_indexed = sheet_raw[row_i, 9].lower().strip()
-        table_column.comment = sheet_raw[row_i, 10]
+        table_column.default_value = default_value.strip().replace('"', '\'') if default_value is not None else None
+        table_column.is_indexed = indexed is not None and indexed.lower().strip() == 'yes'
+        table_column.comment = comment
 
         table.columns.append(table_column)
         row_i += 1
@@ -103,26 +391,244 @@ def create_ddl_table(sheet_raw, row_i: int):
     return table
 
 
-def create_sheet_dml_queries(sheet_raw):
+def find_table_key(table: Table):
+    """
+    :param table: DDL "Table"
+    :return: list of the columns names identifying a row of the table: the primary key, or else unique constraint
+             (on multiple columns or on one column). empty list if the table has no key
+    """
+    for column in table.columns:
+        if column.constraint is not None and 'primary key' in column.constraint.lower():
+            return [column.name]
+    columns_names: set = {column.name for column in table.columns}
+    for multi_unique_constraint in table.multi_columns_unique:
+        if all(column_name in columns_names for column_name in multi_unique_constraint.split(',')):
+            return multi_unique_constraint.split(',')
+    for column in table.columns:
+        if column.constraint is not None and 'unique' in column.constraint.lower():
+            return [column.name]
+    return []
+
+
+def is_integer_key(table: Table, key_columns: list[str]):
+    """
+    :param table: DDL "Table"
+    :param key_columns: the key of the table, as returned by "find_table_key"
+    :return: True if the key is a single column of integer data type, so its values can be deleted by range
+    """
+    if len(key_columns) != 1:
+        return False
+    data_type: str = next((column.data_type for column in table.columns if column.name == key_columns[0]), None)
+    return data_type is not None and INTEGER_DATA_TYPE_PATTERN.fullmatch(data_type) is not None
+
+
+def create_tables_keys(tables: list[Table]):
+    """
+    :param tables: DDL "Table"(s)
+    :return: dictionary of table name to its key (as returned by "find_table_key") and whether it is integer key
+             (see "is_integer_key"), only for tables with key. set into "Config.tables_keys"
+    """
+    tables_keys: dict = {}
+    for table in tables:
+        table_key: list = find_table_key(table)
+        if table_key:
+            tables_keys[table.name] = (table_key, is_integer_key(table, table_key))
+    return tables_keys
+
+
+def read_tables_keys(sheets):
+    """
+    parse the DDL sheets and find the key of each table, used to delete the inserted rows by their keys
+    :param sheets: iterable of "Sheet", either loaded into memory (dense or sparse) or streamed
+    :return: dictionary of table name to its key, as returned by "create_tables_keys"
+    """
+    tables_keys: dict = {}
+    for sheet in sheets:
+        if sheet.sheet_name.startswith('ddl_'):
+            # the tables are parsed again to create their queries, their problems are reported then
+            with diagnostics.muted():
+                tables: list[Table] = create_sheet_ddl_tables(sheet)
+            tables_keys.update(create_tables_keys(tables))
+    return tables_keys
+
+
+def iter_sheet_dml_queries(sheet: Sheet):
+    """
+    lazily create all DML (insert and drops) queries from the data, represented as matrixes in the sheet in different locations
+    :param sheet: DML "Sheet" either loaded into memory (dense or sparse) or streamed
+    :return: generator of (QueryType, query) of all DML queries created from this sheet
+    """
+    for block_raw, block in iter_sheet_indexed_blocks(sheet, 'dml'):
+        yield from iter_dml_block_queries(block_raw, block)
+
+
+def read_dml_block(sheet_raw, block: Block):
     """
-    creating all DML (insert and drops) queries from the data, represented as matrixes in the sheet in different locations
-    :param sheet_raw: matrix sheet containing matrix(es), while each one represented DML queries of a specific table
-    :return: all DML queries created from this sheet
+    :param sheet_raw: the matrix sheet with tables inside
+    :param block: location of the DML table in the sheet
+    :return: table name, columns names, and the table columns values (as returned by "slice_dml_values")
     """
-    sheet_insert_queries: list[str] = []
-    sheet_drops_queries: list[str] = []
-    row_number: int = 1
-    # loop rows until end of used rows in sheet
-    while row_number < sheet_raw.shape[0]:
-        cell_value: str = sheet_raw[row_number, 1]
-        if cell_value == '###_dml':
-            dml_inserts_queries, dml_drops_queries = create_dml_queries(sheet_raw, row_number)
-            sheet_insert_queries.extend(dml_inserts_queries)
-            sheet_drops_queries.extend(dml_drops_queries)
-            row_number += len(dml_inserts_queries) + 2 # 2-->"###_dml" + table name + columns names - "\n"
+    columns_names: list[str] = [column_name.strip() for column_name in sheet_raw[block.header_row, 1:block.width + 1].tolist()]
+    return block.table_name, columns_names, slice_dml_values(sheet_raw, block)
+
+
+def slice_dml_values(sheet_raw, block: Block):
+    """
+    :param sheet_raw: the matrix sheet with tables inside
+    :param block: location of the DML table in the sheet
+    :return: list of the table columns, each one is a list of its values (stripped strings, empty cell is None).
+             the values are kept by column, and made into rows only while the queries are created
+    """
+    values_block = sheet_raw[block.data_start_row:block.data_end_row, 1:block.width + 1]
+    return [[None if value == 'nan' else value.strip() for value in values_block[:, column_i].tolist()]
+            for column_i in range(block.width)]
+
+
+def is_numeric_column(column_values: list[str]):
+    """
+    decide for a whole column if it is numeric, instead of for each value.
+    a column is numeric if all of its (non-empty) values are numbers without leading zeros, so numeric looking text
+    (such as zip codes) is quoted consistently
+    :param column_values: values of the column, as returned by "slice_dml_values"
+    :return: True if the column is numeric
+    """
+    return all(not value or (value.isdigit() and (value[0] != '0' or len(value) == 1)) for value in column_values)
+
+
+def to_sql_string(value: str):
+    """
+    :param value: value of a cell, as returned by "slice_dml_values"
+    :return: the value as quoted SQL literal. single quotes are escaped, including single quotes which are not escaped
+             in the cell (so "O'Brien" and "O''Brien" are both written as 'O''Brien')
+    """
+    return "'" + unescape_quotes(value).replace("'", "''") + "'"
+
+
+def format_dml_values(columns_values: list[list]):
+    """
+    :param columns_values: the table columns, as returned by "slice_dml_values"
+    :return: iterator of rows, each one is tuple of the row values as SQL literals (see "to_sql_string").
+             values of numeric columns are not quoted (only for aesthetics)
+    """
+    formatted_columns: list[list] = []
+    for column_values in columns_values:
+        if is_numeric_column(column_values):
+            formatted_columns.append([value if value else "''" for value in column_values])
         else:
-            row_number += 1
-    return sheet_insert_queries, sheet_drops_queries
+            formatted_columns.append(["''" if value is None else to_sql_string(value) for value in column_values])
+    return zip(*formatted_columns)
+
+
+def iter_sheet_dml_tables(sheet: Sheet):
+    """
+    :param sheet: DML "Sheet" either loaded into memory (dense or sparse) or streamed
+    :return: generator of the DML tables in the sheet, as returned by "read_dml_block"
+    """
+    for block_raw, block in iter_sheet_indexed_blocks(sheet, 'dml'):
+        yield read_dml_block(block_raw, block)
+
+
+def iter_dml_block_queries(sheet_raw, block: Block):
+    """
+    lazily create insert and drop queries from a table found in the matrix sheet
+    :param sheet_raw: the matrix sheet with tables inside, to be parsed into DML queries
+    :param block: location of the DML table in the sheet
+    :return: generator of (QueryType, query), the queries are either QueryType.INSERT or QueryType.DELETE
+    """
+    table_name, columns_names, columns_values = read_dml_block(sheet_raw, block)
+    profiler.count('dml_tables')
+    profiler.count('rows', len(columns_values[0]) if columns_values else 0)
+
+    # rows with values in all the key columns are deleted by their keys, other rows by all of their values
+    key_columns, is_integer_key = Config.tables_keys.get(table_name, ([], False)) if Config.is_key_based_delete \
+        else ([], False)
+    upper_columns_names: list[str] = [column_name.upper() for column_name in columns_names]
+    if not all(key_column in upper_columns_names for key_column in key_columns):
+        key_columns = []
+    key_indexes: list[int] = [upper_columns_names.index(key_column) for key_column in key_columns]
+    keys_values: list[list] = []
+
+    # large tables are written into data file loaded by the DBMS, instead of insert queries
+    rows_count: int = len(columns_values[0]) if columns_values else 0
+    is_bulk_load: bool = 0 < Config.bulk_load_min_rows <= rows_count
+    if is_bulk_load:
+        from bulk_load import iter_bulk_load_queries
+        with profiler.stage('bulk_load_files'):
+            bulk_load_queries: list[str] = list(iter_bulk_load_queries(table_name, columns_names, columns_values))
+        for bulk_load_query in bulk_load_queries:
+            yield QueryType.INSERT, bulk_load_query
+    # or loaded by a single statement, for DBMS supporting it ("copy" in PostgreSQL, unless "copy_insert" is 'False')
+    is_copy_insert: bool = Config.is_copy_insert and Config.sql_type_config.is_copy_insert and not is_bulk_load \
+        and rows_count > 0
+    if is_copy_insert:
+        yield QueryType.INSERT, Config.sql_type_config.build_copy_query(table_name, columns_names, columns_values)
+
+    # use the columns names and the values to create the actual queries.
+    # rows are grouped into batches, each batch is inserted by a single query
+    batch_values: list[list] = []
+    for column_values in format_dml_values(columns_values):
+        key_values: list = [column_values[key_i] for key_i in key_indexes]
+        if key_values and "''" not in key_values:
+            keys_values.append(key_values)
+        else:
+            yield QueryType.DELETE, Config.sql_type_config.build_delete_query(table_name, columns_names, column_values)
+        if is_bulk_load or is_copy_insert:
+            continue
+        batch_values.append(column_values)
+        if len(batch_values) == Config.insert_batch_size:
+            yield QueryType.INSERT, build_batch_insert_query(table_name, columns_names, batch_values)
+            batch_values = []
+
+    if batch_values:
+        yield QueryType.INSERT, build_batch_insert_query(table_name, columns_names, batch_values)
+    for key_delete_query in iter_key_delete_queries(table_name, key_columns, keys_values, is_integer_key):
+        yield QueryType.DELETE, key_delete_query
+
+    yield QueryType.INSERT, '\n'
+    yield QueryType.DELETE, '\n'
+
+
+def iter_key_delete_queries(table_name: str, key_columns: list[str], keys_values: list[list], is_integer_key: bool):
+    """
+    create set-based delete queries: contiguous numbers of integer key are deleted by range, and the other keys
+    are deleted in chunks of "delete_batch_size" keys
+    :param table_name: the table to delete from
+    :param key_columns: names of the key columns
+    :param keys_values: the keys of the rows to delete, each one is list of SQL literals
+    :param is_integer_key: True if the key is single column of integer data type (see "is_integer_key"), a range of
+                           other types would also delete existing rows between the inserted ones (such as 1.5)
+    :return: generator of delete queries
+    """
+    if is_integer_key and keys_values and all(key_values[0].isdigit() for key_values in keys_values):
+        numbers: list[int] = sorted({int(key_values[0]) for key_values in keys_values})
+        keys_values = []
+        run_start: int = 0
+        for number_i in range(1, len(numbers) + 1):
+            if number_i < len(numbers) and numbers[number_i] == numbers[number_i - 1] + 1:
+                continue
+            # short runs are cheaper in the keys list than as separate range
+            if number_i - run_start >= MIN_DELETE_RANGE_LENGTH:
+                yield Config.sql_type_config.build_range_delete_query(table_name, key_columns[0], str(numbers[run_start]),
+                                                                      str(numbers[number_i - 1]))
+            else:
+                keys_values.extend([str(number)] for number in numbers[run_start:number_i])
+            run_start = number_i
+
+    for chunk_start in range(0, len(keys_values), Config.delete_batch_size):
+        yield Config.sql_type_config.build_key_delete_query(
+            table_name, key_columns, keys_values[chunk_start:chunk_start + Config.delete_batch_size])
+
+
+def build_batch_insert_query(table_name: str, columns_names: list, batch_values: list[list]):
+    """
+    :param table_name: the table to insert into
+    :param columns_names: the columns to insert into
+    :param batch_values: values of one or more rows
+    :return: a single query inserting all rows in the batch
+    """
+    if len(batch_values) == 1:
+        return Config.sql_type_config.build_insert_query(table_name, columns_names, batch_values[0])
+    return Config.sql_type_config.build_batch_insert_query(table_name, columns_names, batch_values)
 
 
 def create_dml_queries(sheet_raw, row_number: int):
@@ -132,49 +638,45 @@ def create_dml_queries(sheet_raw, row_number: int):
     :param row_number: the location row to start parsing the table in the given sheet
     :return: 2 lists of creates queries (insert and drop)
     """
-    table_name: str = sheet_raw[row_number + 1, 1].upper().strip()
-
-    column_number: int = 1
-    row_number += 2
-    # first loop to find the columns names
-    columns_names: list[str] = []
-    while sheet_raw[row_number, column_number] != 'nan':
-        column_name = sheet_raw[row_number, column_number].strip()
-        columns_names.append(column_name)
-        column_number += 1
-
-    row_number += 1
-
-    # second loop to find all the values
-    values_list: list[list] = []
-    while sheet_raw[row_number, 1] != 'nan' and sheet_raw[row_number, 1] != '###_dml':
-        column_values = []
-        for column_i in range(1, column_number):
-            value = sheet_raw[row_number, column_i].strip() if sheet_raw[row_number, column_i] != 'nan' else ''
-
-            # numbers are not quoted, only for aesthetics
-            if value.isdigit():
-                column_values.append(value)
-            else:
-                column_values.append(f"'{value}'")
-        values_list.append(column_values)
+    return split_dml_queries(iter_dml_block_queries(sheet_raw, index_block(sheet_raw, 'dml', row_number)))
 
-        row_number += 1
 
-    # use the columns names and the values to create the actual queries
+def split_dml_queries(dml_queries):
+    """
+    :param dml_queries: iterable of (QueryType, query) of DML queries
+    :return: 2 lists of queries (insert and drop)
+    """
     insert_queries: list[str] = []
     delete_queries: list[str] = []
-    for values in values_list:
-        insert_query: str = Config.sql_type_config.build_insert_query(table_name, columns_names, values)
-        insert_queries.append(insert_query)
-
-        delete_query: str = Config.sql_type_config.build_delete_query(table_name, columns_names, values)
-        delete_queries.append(delete_query)
+    for query_type, query in dml_queries:
+        if query_type == QueryType.INSERT:
+            insert_queries.append(query)
+        else:
+            delete_queries.append(query)
+    return insert_queries, delete_queries
 
-    insert_queries.append('\n')
-    delete_queries.append('\n')
 
-    return insert_queries, delete_queries
+def iter_ddl_queries(tables):
+    """
+    lazily make the actual queries form 'Table' class
+    query included: create table, fk, indexes, comments, sequences, and drops.
+    the tables are ordered by their foreign keys (see "sort_tables_by_dependencies"), so the drops are in correct order
+    :param tables: iterable of "Table" class, containing all the information to create DDl queries
+    :return: generator of (QueryType, query), the queries are either of QueryType.CREATE_TABLE, QueryType.DROP_TABLE,
+             QueryType.FK or QueryType.FK_DROP
+    """
+    for table in sort_tables_by_dependencies(list(tables)):
+        drop_seqs, fks, fk_drops, create_tables, drop_tables = Config.sql_type_config.create_ddl_queries(table)
+        for create_table_query in create_tables:
+            yield QueryType.CREATE_TABLE, create_table_query
+        for drop_query in drop_seqs + drop_tables:
+            yield QueryType.DROP_TABLE, drop_query
+        # some tables have dependencies on other table with foreign key.
+        # So the foreign keys are created in separate part of the file and run at the end
+        for fk_query in fks:
+            yield QueryType.FK, fk_query
+        for fk_drop_query in fk_drops:
+            yield QueryType.FK_DROP, fk_drop_query
 
 
 def create_ddl_queries(tables: list):
@@ -185,22 +687,11 @@ def create_ddl_queries(tables: list):
     :return: lists of created queries, 4 lists including:
                     creation of SQL tables, drop table, creation of foreign keys. drop foreign keys
     """
-    ddl_create_queries: list[str] = []
-    ddl_drops_queries: list[str] = []
-    # some tables have dependencies on other table with foreign key.
-    # So the foreign keys are created in separate list and run at the end
-    fk_queries: list[str] = []
-    fk_drop_queries: list[str] = []
-
-    for table in tables:
-        drop_seqs, fks, fk_drops, create_tables, drop_tables = Config.sql_type_config.create_ddl_queries(table)
-        ddl_create_queries.extend(create_tables)
-        ddl_drops_queries.extend(drop_seqs)
-        ddl_drops_queries.extend(drop_tables)
-        fk_queries.extend(fks)
-        fk_drop_queries.extend(fk_drops)
+    queries: dict[QueryType, list[str]] = {query_type: [] for query_type in QueryType}
+    for query_type, query in iter_ddl_queries(tables):
+        queries[query_type].append(query)
 
-    return ddl_create_queries, ddl_drops_queries, fk_queries, fk_drop_queries
+    return queries[QueryType.CREATE_TABLE], queries[QueryType.DROP_TABLE], queries[QueryType.FK], queries[QueryType.FK_DROP]
 
 
 def generate_queries_files(ddl_queries: list, ddl_drops_queries: list, fk_queries: list,
@@ -215,35 +706,10 @@ def generate_queries_files(ddl_queries: list, ddl_drops_queries: list, fk_querie
     :param delete_queries: list of DML delete queries
     :return: None
     """
-    Config.output_dir_path.mkdir(exist_ok=True)
-
-    # Write all updates into sql file
-    with open(Config.output_queries_file, 'w', encoding='utf-8') as queries_file:
-        queries_file.write(Config.sql_type_config.file_header_extra)
-        # Write the ddl queries created in this python
-        queries_file.write('\n-------------------------- Creating tables with their relevant information --------------------------\n')
-        for ddl_query in ddl_queries:
-            queries_file.write(ddl_query)
-        queries_file.write('\n----------------------------------- Creating Foreign Keys -----------------------------------\n')
-        for fk_query in fk_queries:
-            queries_file.write(fk_query)
-        queries_file.write('\n-------------------------- Inserting data to tables --------------------------\n')
-        for dml_query in insert_queries:
-            queries_file.write(dml_query)
-
-        queries_file.write(f"\ncommit;\n/\n")
-
-    # write all drops into sql drop file
-    with open(Config.output_drops_file, 'w', encoding='utf-8') as drops_file:
-        # Write the ddl drops created in this python, and dml deletes for inserted data
-        drops_file.write('\n\n----------------- Dropping Foreign Keys and other constraints -----------------\n')
-        for fk_drop_query in reversed(constraints_drop_queries):
-            drops_file.write(fk_drop_query)
-        drops_file.write("\n----------------- Deleting data added to existing table from previous version -----------------")
-        for dml_delete_query in reversed(delete_queries):
-            drops_file.write(dml_delete_query)
-        drops_file.write('\n----------------- Dropping Tables and sequences -----------------\n')
-        for ddl_drop_query in reversed(ddl_drops_queries):
-            drops_file.write(ddl_drop_query)
-
-        logger.debug(f"content has been written into {Config.output_dir_path}")
+    with QueriesFilesWriter() as writer:
+        writer.extend(QueryType.CREATE_TABLE, ddl_queries)
+        writer.extend(QueryType.DROP_TABLE, ddl_drops_queries)
+        writer.extend(QueryType.FK, fk_queries)
+        writer.extend(QueryType.FK_DROP, constraints_drop_queries)
+        writer.extend(QueryType.INSERT, insert_queries)
+        writer.extend(QueryType.DELETE, delete_queries)